@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Depends
+from routes import *
+from data.response_constant import *
+from utils.authen.token_handler import get_current_claims, password_pool
+from utils.database.sql_metrics import sql_metrics
+from apis.v1.todos.change_hub import change_hub
+from apis.v1.users.token_schema import Role, TokenDataSchema
+
+router = APIRouter(
+    prefix=METRICS_BASE_ROUTE,
+    tags=["metrics"],
+)
+
+
+def get_admin_claims(
+    claims: TokenDataSchema = Depends(get_current_claims),
+) -> TokenDataSchema:
+    if claims.role != Role.admin:
+        raise HTTPException(
+            status_code=HTTP_FORBIDDEN_403,
+            detail="Only admins can access the metrics",
+        )
+
+    return claims
+
+
+@router.get(GET_PASSWORD_METRICS_ROUTE, status_code=HTTP_OK_200)
+def get_password_metrics(
+    admin: TokenDataSchema = Depends(get_admin_claims),
+) -> dict:
+    return password_pool.Metrics()
+
+
+@router.get(GET_SQL_METRICS_ROUTE, status_code=HTTP_OK_200)
+def get_sql_metrics(
+    admin: TokenDataSchema = Depends(get_admin_claims),
+) -> dict:
+    return sql_metrics.Snapshot()
+
+
+@router.get(GET_STREAM_METRICS_ROUTE, status_code=HTTP_OK_200)
+def get_stream_metrics(
+    admin: TokenDataSchema = Depends(get_admin_claims),
+) -> dict:
+    return change_hub.Metrics()
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
-from utils.database.database import get_db
+from utils.database.database import DbSession, get_db, run_db
 from sqlalchemy.orm import Session
 from utils.authen.token_handler import get_current_user
+from utils.database.sql_metrics import query_budget
 from models import *
 from data.response_constant import *
 
@@ -18,74 +19,86 @@ router = APIRouter(
     GET_PROFILE_ROUTE,
     response_model=ProfileSchema,
     status_code=HTTP_OK_200,
+    dependencies=[query_budget(2)],
 )
-def read_profile(
+async def read_profile(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> ProfileSchema:
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+    def run(db: Session):
+        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
 
-    if profile is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Profile not found",
-        )
+        if profile is None:
+            raise HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Profile not found",
+            )
 
-    return profile
+        return profile
+
+    return await run_db(db, run)
 
 
 @router.put(
     UPDATE_PROFILE_ROUTE,
     response_model=ProfileSchema,
     status_code=HTTP_OK_200,
+    dependencies=[query_budget(3)],
 )
-def update_profile(
+async def update_profile(
     profileInfo: ProfileSchema,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> ProfileSchema:
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+    def run(db: Session):
+        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+
+        if profile is None:
+            raise HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Profile not found",
+            )
 
-    if profile is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Profile not found",
-        )
+        profile.Update(profileInfo)
 
-    profile.Update(profileInfo)
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
+        return profile
 
-    return profile
+    return await run_db(db, run)
 
 
 @router.get(
     VALIDATE_EMAIL_ROUTE,
     response_model=ProfileSchema,
     status_code=HTTP_OK_200,
+    dependencies=[query_budget(3)],
 )
-def validate_email(
+async def validate_email(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> ProfileSchema:
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+    def run(db: Session):
+        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+
+        profile.VerifyEmail()
 
-    profile.VerifyEmail()
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
+        return profile
 
-    return profile
+    return await run_db(db, run)
@@ -0,0 +1,158 @@
+import json
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Set
+from config import get_config
+
+config = get_config()
+
+
+class ChangeHubFullError(Exception):
+    pass
+
+
+class ChangeSubscription:
+    """
+    Events pushed to one stream connection, in a bounded queue filled on
+        the event loop which serves the connection.
+
+    A connection which does not keep up loses its oldest events instead of
+        growing the queue: every event carries the latest change cursor of
+        the user, so the newer ones supersede them.
+    """
+
+    def __init__(self, userId: int, queueSize: int) -> None:
+        self.userId: int = userId
+        self.loop = asyncio.get_running_loop()
+        self.dropped: int = 0
+        self.__queue: asyncio.Queue = asyncio.Queue(max(1, queueSize))
+
+    def Put(self, event: Dict[str, Any]) -> None:
+        if self.__queue.full():
+            self.__queue.get_nowait()
+            self.dropped += 1
+
+        self.__queue.put_nowait(event)
+
+    async def Get(self) -> Dict[str, Any]:
+        return await self.__queue.get()
+
+    def __repr__(self) -> str:
+        return f"<ChangeSubscription user={self.userId} />"
+
+
+class ChangeHub:
+    """
+    In-process fan-out of the change events to the stream connections of
+        each user.
+
+    `Publish` can be called from any thread (the routes commit in the
+        threadpool), the events are handed to the loop of each connection
+        with one `call_soon_threadsafe` per loop. An idle connection only
+        costs its subscription, at most `maxConnections` are accepted,
+        anything beyond that is rejected with `ChangeHubFullError`.
+    """
+
+    def __init__(self, queueSize: int = 16, maxConnections: int = 10000) -> None:
+        self.__queueSize: int = queueSize
+        self.__maxConnections: int = maxConnections
+        self.__subscriptions: Dict[int, Set[ChangeSubscription]] = defaultdict(set)
+        self.__lock = threading.Lock()
+
+        self.__connections: int = 0
+        self.__published: int = 0
+        self.__rejected: int = 0
+        self.__dropped: int = 0
+
+    def Subscribe(self, userId: int) -> ChangeSubscription:
+        subscription = ChangeSubscription(userId, self.__queueSize)
+
+        with self.__lock:
+            if self.__connections >= self.__maxConnections:
+                self.__rejected += 1
+                raise ChangeHubFullError("Too many stream connections")
+
+            self.__subscriptions[userId].add(subscription)
+            self.__connections += 1
+
+        return subscription
+
+    def Unsubscribe(self, subscription: ChangeSubscription) -> None:
+        with self.__lock:
+            subscriptions = self.__subscriptions.get(subscription.userId)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.__subscriptions[subscription.userId]
+            self.__connections -= 1
+            self.__dropped += subscription.dropped
+
+    def Publish(self, userId: int, event: Dict[str, Any]) -> None:
+        with self.__lock:
+            subscriptions = list(self.__subscriptions.get(userId, ()))
+            self.__published += 1
+
+        byLoop: Dict[Any, List[ChangeSubscription]] = defaultdict(list)
+        for subscription in subscriptions:
+            byLoop[subscription.loop].append(subscription)
+
+        for loop, loopSubscriptions in byLoop.items():
+            try:
+                loop.call_soon_threadsafe(self.__Deliver, loopSubscriptions, event)
+            except RuntimeError:
+                # the loop is closed, its connections are gone
+                for subscription in loopSubscriptions:
+                    self.Unsubscribe(subscription)
+
+    def Metrics(self) -> Dict[str, Any]:
+        with self.__lock:
+            subscriptions = [
+                subscription
+                for userSubscriptions in self.__subscriptions.values()
+                for subscription in userSubscriptions
+            ]
+
+            return {
+                "connections": self.__connections,
+                "users": len(self.__subscriptions),
+                "maxConnections": self.__maxConnections,
+                "published": self.__published,
+                "rejected": self.__rejected,
+                "dropped": self.__dropped
+                + sum(subscription.dropped for subscription in subscriptions),
+            }
+
+    @staticmethod
+    def __Deliver(subscriptions: List[ChangeSubscription], event: Dict[str, Any]):
+        for subscription in subscriptions:
+            subscription.Put(event)
+
+    def __repr__(self) -> str:
+        return f"<ChangeHub connections={self.__connections} />"
+
+
+async def sse_events(
+    subscription: ChangeSubscription, keepaliveSeconds: float
+) -> AsyncIterator[str]:
+    """
+    The events of the subscription as server-sent events, with a comment
+        line after `keepaliveSeconds` of silence so that the proxies keep
+        the connection open.
+    """
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.Get(), keepaliveSeconds)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+
+change_hub = ChangeHub(
+    queueSize=config.Get("streamQueueSize", 16),
+    maxConnections=config.Get("maxStreamConnections", 10000),
+)
@@ -0,0 +1,163 @@
+from typing import Iterable, List, Tuple
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.orm import Session
+from models import *
+
+from .todo_changes_schema import *
+from .change_hub import change_hub
+
+TODO_KIND = "todo"
+PLANNED_TODO_KIND = "plannedTodo"
+
+# the rows which the clients sync, stamped with the change sequence
+SYNCED_MODELS = (Todo, PlannedTodo)
+TOMBSTONE_KINDS = {Todo: TODO_KIND, PlannedTodo: PLANNED_TODO_KIND}
+
+
+def next_change_seq(db: Session, user_id: int) -> int:
+    """
+    The change sequence of the user's writes in the current transaction.
+
+    The first write of the transaction increments the counter of the
+        user, the next ones reuse its value. The row of the user stays
+        locked until the commit, so the sequences of a user follow the
+        order in which their transactions commit.
+    """
+    seqs = db.info.setdefault("change_seqs", {})
+
+    if user_id not in seqs:
+        users = User.__table__
+        seqs[user_id] = (
+            db.connection()
+            .execute(
+                update(users)
+                .where(users.c.id == user_id)
+                .values(change_seq=users.c.change_seq + 1)
+                .returning(users.c.change_seq)
+            )
+            .scalar()
+        ) or 0  # rows without an existing owner are never synced
+
+    return seqs[user_id]
+
+
+def record_tombstones(
+    db: Session, kind: str, deleted: Iterable[Tuple[int, int]]
+) -> None:
+    """
+    Record the deletion of the `(entity_id, user_id)` rows, the caller
+        commits.
+    """
+    tombstones = [
+        {
+            "user_id": user_id,
+            "kind": kind,
+            "entity_id": entity_id,
+            "change_seq": next_change_seq(db, user_id),
+        }
+        for entity_id, user_id in deleted
+    ]
+
+    if tombstones:
+        db.execute(insert(Tombstone), tombstones)
+
+
+def delete_todos(db: Session, *criteria) -> List[int]:
+    """
+    Set-based delete of the todos matching the criteria which leaves a
+        tombstone behind each of them, the caller commits.
+
+    Returns:
+        The ids of the deleted todos.
+    """
+    deleted = db.execute(
+        delete(Todo)
+        .where(*criteria)
+        .returning(Todo.id, Todo.user_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    record_tombstones(db, TODO_KIND, deleted)
+
+    return [id for id, _ in deleted]
+
+
+def changes_since(db: Session, user_id: int, since: int) -> dict:
+    """
+    Everything the user changed after the `since` sequence: the current
+        state of the created or updated todos (their rank included) and
+        planned todos, and a tombstone for each deleted row. Deletions are
+        meant to be applied before the other changes, ids can be reused.
+
+    The cursor is read first and bounds the changes, so a change committed
+        meanwhile is returned by the next sync instead of being skipped.
+    """
+    cursor = db.scalar(select(User.change_seq).where(User.id == user_id)) or 0
+
+    def changed(model):
+        return (
+            db.query(model)
+            .filter(
+                model.user_id == user_id, model.change_seq.between(since + 1, cursor)
+            )
+            .order_by(model.change_seq, model.id)
+            .all()
+        )
+
+    if cursor <= since:
+        return {"cursor": cursor}
+
+    return {
+        "cursor": cursor,
+        "todos": changed(Todo),
+        "plannedTodos": changed(PlannedTodo),
+        "deleted": [
+            TombstoneSchema(kind=tombstone.kind, id=tombstone.entity_id)
+            for tombstone in changed(Tombstone)
+        ],
+    }
+
+
+def _owner_id(instance) -> int:
+    # a row built with the user relationship only gets its user_id at flush
+    return instance.user_id if instance.user_id is not None else instance.user.id
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changes(session: Session, flush_context, instances) -> None:
+    # the bulk statements bypass the flush, they stamp their rows themselves
+    # (see insert_occurrences and delete_todos)
+    for instance in list(session.new):
+        if isinstance(instance, SYNCED_MODELS):
+            instance.change_seq = next_change_seq(session, _owner_id(instance))
+
+    for instance in list(session.dirty):
+        if isinstance(instance, SYNCED_MODELS) and session.is_modified(instance):
+            instance.change_seq = next_change_seq(session, _owner_id(instance))
+
+    for instance in list(session.deleted):
+        kind = TOMBSTONE_KINDS.get(type(instance))
+        if kind is not None:
+            userId = _owner_id(instance)
+            session.add(
+                Tombstone(
+                    user_id=userId,
+                    kind=kind,
+                    entity_id=instance.id,
+                    change_seq=next_change_seq(session, userId),
+                )
+            )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_change_seqs(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("change_seqs", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    # the stream connections of the user pull the changes since their cursor
+    for user_id, seq in session.info.get("change_seqs", {}).items():
+        if seq:
+            change_hub.Publish(user_id, {"event": "changes", "cursor": seq})
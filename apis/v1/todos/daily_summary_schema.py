@@ -0,0 +1,8 @@
+import datetime
+from pydantic import BaseModel
+
+
+class DailySummarySchema(BaseModel):
+    date: datetime.date
+    total: int  # stored todos of the day, planned todos not created yet excluded
+    completed: int
@@ -0,0 +1,69 @@
+import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models import *
+
+
+def _aggregate(model, *criteria) -> tuple:
+    return (
+        select(func.count(model.id)).where(*criteria),
+        select(func.max(model.last_updated)).where(*criteria),
+    )
+
+
+def _created_slots_aggregate(user_id: int, date: datetime.date) -> tuple:
+    # slots claimed without a todo (a deleted virtual todo) hide occurrences
+    slots = (
+        PlannedTodoCreated.planned_todo_id == PlannedTodo.id,
+        PlannedTodo.user_id == user_id,
+        PlannedTodoCreated.date == date,
+    )
+    return (
+        select(func.count(PlannedTodoCreated.id)).where(*slots),
+        select(func.max(PlannedTodoCreated.id)).where(*slots),
+    )
+
+
+def fingerprint(db: Session, *aggregates) -> tuple:
+    """
+    Value of every single column aggregate, read in one statement without
+        loading any row.
+    """
+    return tuple(
+        db.execute(
+            select(*[aggregate.scalar_subquery() for aggregate in aggregates])
+        ).one()
+    )
+
+
+def todos_by_date_fingerprint(db: Session, user_id: int, date: datetime.date) -> tuple:
+    # the planned todos decide what is materialized or projected at the date
+    return (
+        date > datetime.date.today(),
+        *fingerprint(
+            db,
+            *_aggregate(Todo, Todo.user_id == user_id, Todo.date == date),
+            *_aggregate(PlannedTodo, PlannedTodo.user_id == user_id),
+            *_created_slots_aggregate(user_id, date),
+        ),
+    )
+
+
+def remain_todos_fingerprint(db: Session, user_id: int) -> tuple:
+    today = datetime.date.today()
+    return (
+        today,
+        *fingerprint(
+            db,
+            *_aggregate(
+                Todo,
+                Todo.completed == False,
+                Todo.user_id == user_id,
+                Todo.date <= today,
+            ),
+        ),
+    )
+
+
+def planned_todos_fingerprint(db: Session, user_id: int) -> tuple:
+    return fingerprint(db, *_aggregate(PlannedTodo, PlannedTodo.user_id == user_id))
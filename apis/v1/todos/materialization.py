@@ -0,0 +1,377 @@
+import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+from models import *
+from utils.database.database import insert_ignore
+
+from .todo_schema import TodoSchema
+from .planned_todo_schema import VIRTUAL_ID_DATE_FACTOR
+from .changes import delete_todos, next_change_seq
+from .ranking import append_ranks
+
+# virtual todo ids are negative: -(planned_todo_id * 10^8 + date ordinal * 100 + slot)
+# the slot stays below 100 as numTodos is bounded by the planned todo schema
+VIRTUAL_ID_PLANNED_FACTOR = 10**8
+
+Occurrence = Tuple[PlannedTodo, datetime.date, int]
+
+
+def created_slots(
+    db: Session,
+    planned_todo_ids: List[int],
+    first: datetime.date,
+    last: Optional[datetime.date] = None,
+) -> Dict[Tuple[int, datetime.date], Set[int]]:
+    """
+    Slots already created from each planned todo at each date of
+        [first, last] (only `first` by default), read in a single query
+        over the unique (planned_todo_id, date, slot) index. The keys are
+        `(planned_todo_id, date)`, pairs without any todo are missing.
+    """
+    if not planned_todo_ids:
+        return {}
+
+    rows = db.execute(
+        select(
+            PlannedTodoCreated.planned_todo_id,
+            PlannedTodoCreated.date,
+            PlannedTodoCreated.slot,
+        ).where(
+            PlannedTodoCreated.planned_todo_id.in_(planned_todo_ids),
+            PlannedTodoCreated.date.between(first, last or first),
+        )
+    )
+
+    slots: Dict[Tuple[int, datetime.date], Set[int]] = {}
+    for planned_todo_id, date, slot in rows:
+        slots.setdefault((planned_todo_id, date), set()).add(slot)
+
+    return slots
+
+
+def owed_occurrences(
+    db: Session,
+    planned_todos: Sequence[PlannedTodo],
+    first: datetime.date,
+    last: datetime.date,
+) -> List[Occurrence]:
+    """
+    The `(planned_todo, date, slot)` which the planned todos still owe in
+        [first, last], the dates come from the recurrence rules and the
+        existing slots from `created_slots`.
+    """
+    dates = [
+        (planned_todo, date)
+        for planned_todo in planned_todos
+        for date in planned_todo.Recurrence().Occurrences(first, last)
+    ]
+    if not dates:
+        return []
+
+    created = created_slots(
+        db,
+        list({planned_todo.id for planned_todo, _ in dates}),
+        first,
+        last,
+    )
+
+    return [
+        (planned_todo, date, slot)
+        for planned_todo, date in dates
+        for slot in planned_todo.NeedCreated(
+            date, created.get((planned_todo.id, date), set())
+        )
+    ]
+
+
+def insert_occurrences(db: Session, occurrences: List[Occurrence]) -> Dict[int, int]:
+    """
+    Create the todos of the occurrences, safe against concurrent callers.
+
+    Each slot is claimed first by inserting its `PlannedTodoCreated` row
+        with insert-or-ignore on the unique (planned_todo_id, date, slot)
+        index, only the claims which were inserted get a todo, the others
+        belong to whoever inserted them first. The todos go at the end of
+        their day. A handful of statements whatever the number of
+        occurrences.
+
+    Returns:
+        The created todo ids keyed by the id of their claim.
+    """
+    if not occurrences:
+        return {}
+
+    plannedTodos = {planned_todo.id: planned_todo for planned_todo, _, _ in occurrences}
+    claims = db.execute(
+        insert_ignore(
+            db.get_bind(),
+            PlannedTodoCreated,
+            ["planned_todo_id", "date", "slot"],
+        )
+        .values(
+            [
+                {"planned_todo_id": planned_todo.id, "date": date, "slot": slot}
+                for planned_todo, date, slot in occurrences
+            ]
+        )
+        .returning(
+            PlannedTodoCreated.id,
+            PlannedTodoCreated.planned_todo_id,
+            PlannedTodoCreated.date,
+        )
+    ).all()
+
+    if not claims:
+        return {}
+
+    ranks = append_ranks(
+        db,
+        [
+            (plannedTodos[planned_todo_id].user_id, date)
+            for _, planned_todo_id, date in claims
+        ],
+    )
+    # the ranks of a day are distinct, they match the todos to their claims
+    # without sort_by_parameter_order, which sqlite runs one row at a time
+    rows = db.execute(
+        insert(Todo).returning(Todo.id, Todo.user_id, Todo.date, Todo.rank),
+        [
+            {
+                "user_id": plannedTodos[planned_todo_id].user_id,
+                "title": plannedTodos[planned_todo_id].title,
+                "description": plannedTodos[planned_todo_id].description,
+                "date": date,
+                "completed": False,
+                "rank": rank,
+                "change_seq": next_change_seq(
+                    db, plannedTodos[planned_todo_id].user_id
+                ),
+            }
+            for (_, planned_todo_id, date), rank in zip(claims, ranks)
+        ],
+    ).all()
+    todo_ids = {(user_id, date, rank): id for id, user_id, date, rank in rows}
+
+    created = {
+        claim_id: todo_ids[(plannedTodos[planned_todo_id].user_id, date, rank)]
+        for (claim_id, planned_todo_id, date), rank in zip(claims, ranks)
+    }
+    db.execute(
+        update(PlannedTodoCreated),
+        [{"id": claim_id, "todo_id": todo_id} for claim_id, todo_id in created.items()],
+    )
+
+    return created
+
+
+def materialize(
+    db: Session,
+    planned_todos: Sequence[PlannedTodo],
+    first: datetime.date,
+    last: datetime.date,
+) -> int:
+    """
+    Create the todos which the planned todos still owe in [first, last],
+        see `owed_occurrences` and `insert_occurrences`.
+
+    Returns:
+        The number of created todos, the caller commits when it is not `0`.
+    """
+    return len(insert_occurrences(db, owed_occurrences(db, planned_todos, first, last)))
+
+
+def materialize_planned_todos(
+    db: Session,
+    user_id: int,
+    first: datetime.date,
+    last: Optional[datetime.date] = None,
+) -> int:
+    """
+    `materialize` every planned todo of the user over [first, last], only
+        `first` by default.
+    """
+    planned_todos: List[PlannedTodo] = (
+        db.execute(select(PlannedTodo).where(PlannedTodo.user_id == user_id))
+        .scalars()
+        .all()
+    )
+
+    return materialize(db, planned_todos, first, last or first)
+
+
+def unlink_occurrences(db: Session, *criteria) -> None:
+    """
+    Detach the todos matching the criteria from their slots before a
+        set-based delete, the slots stay claimed so the deleted todos are
+        not created again. The caller commits.
+    """
+    db.execute(
+        update(PlannedTodoCreated)
+        .where(PlannedTodoCreated.todo_id.in_(select(Todo.id).where(*criteria)))
+        .values(todo_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_occurrences(
+    db: Session,
+    planned_todo_id: int,
+    after: Optional[datetime.date] = None,
+) -> None:
+    """
+    Delete the todos created from the planned todo after the date (all of
+        them by default) together with their slots, with set-based
+        statements whatever the length of the history. The caller commits.
+    """
+    claims = PlannedTodoCreated.planned_todo_id == planned_todo_id
+    if after is not None:
+        claims = claims & (PlannedTodoCreated.date > after)
+
+    delete_todos(db, Todo.id.in_(select(PlannedTodoCreated.todo_id).where(claims)))
+    db.execute(delete(PlannedTodoCreated).where(claims))
+
+
+def virtual_todo_id(planned_todo_id: int, date: datetime.date, slot: int) -> int:
+    return -(
+        planned_todo_id * VIRTUAL_ID_PLANNED_FACTOR
+        + date.toordinal() * VIRTUAL_ID_DATE_FACTOR
+        + slot
+    )
+
+
+def is_virtual_todo_id(id: int) -> bool:
+    return id < 0
+
+
+def project_planned_todos(
+    db: Session,
+    user_id: int,
+    first: datetime.date,
+    last: Optional[datetime.date] = None,
+) -> List[TodoSchema]:
+    """
+    The todos which the planned todos of the user still owe in
+        [first, last], built from the recurrence rules as virtual todos
+        without writing anything, by planned todo, date and slot.
+    """
+    planned_todos: List[PlannedTodo] = (
+        db.execute(
+            select(PlannedTodo)
+            .where(PlannedTodo.user_id == user_id)
+            .order_by(PlannedTodo.id)
+        )
+        .scalars()
+        .all()
+    )
+
+    return [
+        TodoSchema(
+            id=virtual_todo_id(planned_todo.id, date, slot),
+            title=planned_todo.title,
+            description=planned_todo.description,
+            date=date,
+            virtual=True,
+        )
+        for planned_todo, date, slot in owed_occurrences(
+            db, planned_todos, first, last or first
+        )
+    ]
+
+
+def find_virtual_todos(db: Session, ids: Iterable[int]) -> Dict[int, Occurrence]:
+    """
+    The planned todo, date and slot encoded in each virtual todo id, with
+        the planned todos read in a single query. Ids whose planned todo
+        does not exist or does not owe that slot are missing.
+    """
+    decoded = {}
+    for id in set(ids):
+        planned_todo_id, rest = divmod(-id, VIRTUAL_ID_PLANNED_FACTOR)
+        ordinal, slot = divmod(rest, VIRTUAL_ID_DATE_FACTOR)
+
+        if ordinal >= 1:
+            decoded[id] = (planned_todo_id, datetime.date.fromordinal(ordinal), slot)
+
+    if not decoded:
+        return {}
+
+    planned_todos = {
+        planned_todo.id: planned_todo
+        for planned_todo in db.scalars(
+            select(PlannedTodo).where(
+                PlannedTodo.id.in_({key[0] for key in decoded.values()})
+            )
+        )
+    }
+
+    occurrences = {}
+    for id, (planned_todo_id, date, slot) in decoded.items():
+        planned_todo = planned_todos.get(planned_todo_id)
+
+        if planned_todo is None or slot >= planned_todo.numTodos:
+            continue
+
+        if planned_todo.Occurs(date):
+            occurrences[id] = (planned_todo, date, slot)
+
+    return occurrences
+
+
+def find_virtual_todo(db: Session, id: int) -> Optional[Occurrence]:
+    """
+    The planned todo, date and slot encoded in a virtual todo id, `None`
+        when the planned todo does not exist or does not owe that slot.
+    """
+    return find_virtual_todos(db, [id]).get(id)
+
+
+def created_todos(
+    db: Session, occurrences: Sequence[Occurrence]
+) -> Dict[int, Optional[Todo]]:
+    """
+    The todos created for the slots of the occurrences keyed by their
+        virtual todo id, read with the claims in a single query. A slot
+        still virtual is missing, a claimed slot whose todo was deleted
+        maps to `None`.
+    """
+    if not occurrences:
+        return {}
+
+    claims = tuple_(
+        PlannedTodoCreated.planned_todo_id,
+        PlannedTodoCreated.date,
+        PlannedTodoCreated.slot,
+    )
+    keys = [(planned_todo.id, date, slot) for planned_todo, date, slot in occurrences]
+
+    rows = db.execute(
+        select(
+            PlannedTodoCreated.planned_todo_id,
+            PlannedTodoCreated.date,
+            PlannedTodoCreated.slot,
+            Todo,
+        )
+        .outerjoin(Todo, Todo.id == PlannedTodoCreated.todo_id)
+        .where(claims == keys[0] if len(keys) == 1 else claims.in_(keys))
+    )
+
+    return {
+        virtual_todo_id(planned_todo_id, date, slot): todo
+        for planned_todo_id, date, slot, todo in rows
+    }
+
+
+def materialize_virtual_todos(
+    db: Session, occurrences: Sequence[Occurrence]
+) -> Dict[int, Optional[Todo]]:
+    """
+    Create the todos of virtual todos when they are completed or edited,
+        the caller commits. The slots are claimed together by
+        `insert_occurrences` and read back by `created_todos`, whose
+        result is returned: an already materialized slot gives its todo,
+        `None` once that todo was deleted.
+    """
+    insert_occurrences(db, occurrences)
+
+    return created_todos(db, occurrences)
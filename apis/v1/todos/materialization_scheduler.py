@@ -0,0 +1,115 @@
+import logging
+import datetime
+import threading
+from typing import Callable, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models import *
+
+from utils.date.recurrence import masks_with_weekdays, weekdays_between
+
+from .materialization import materialize
+
+logger = logging.getLogger(__name__)
+
+
+class MaterializationScheduler:
+    """
+    Background thread which creates the todos of every planned todo for
+        today and the next `horizonDays` days, so reading a day seldom has
+        anything left to write.
+
+    The planned todos firing on a weekday of the horizon are walked by id
+        in batches of `batchSize`, each batch in its own short transaction,
+        every `intervalSeconds`.
+    """
+
+    def __init__(
+        self,
+        sessionFactory: Callable[[], Session],
+        horizonDays: int = 7,
+        intervalSeconds: float = 3600,
+        batchSize: int = 200,
+    ) -> None:
+        self.__sessionFactory = sessionFactory
+        self.__horizonDays: int = max(0, horizonDays)
+        self.__intervalSeconds: float = intervalSeconds
+        self.__batchSize: int = max(1, batchSize)
+        self.__stopped = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def Start(self) -> None:
+        if self.__thread is not None:
+            return
+
+        self.__stopped.clear()
+        self.__thread = threading.Thread(
+            target=self.__Loop,
+            name="materialization",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def Stop(self) -> None:
+        self.__stopped.set()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def RunOnce(self, today: Optional[datetime.date] = None) -> int:
+        """
+        One pass over every planned todo, returns the number of created todos.
+        """
+        first = today or datetime.date.today()
+        last = first + datetime.timedelta(days=self.__horizonDays)
+        lastId = 0
+        numCreated = 0
+        # only the planned todos which fire on a weekday of the horizon
+        weekdayMasks = masks_with_weekdays(weekdays_between(first, last))
+
+        while not self.__stopped.is_set():
+            db = self.__sessionFactory()
+            try:
+                planned_todos = (
+                    db.execute(
+                        select(PlannedTodo)
+                        .where(
+                            PlannedTodo.id > lastId,
+                            PlannedTodo.weekdayMask.in_(weekdayMasks),
+                        )
+                        .order_by(PlannedTodo.id)
+                        .limit(self.__batchSize)
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not planned_todos:
+                    break
+
+                numCreated += materialize(db, planned_todos, first, last)
+                db.commit()
+                lastId = planned_todos[-1].id
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        return numCreated
+
+    def __Loop(self) -> None:
+        while not self.__stopped.is_set():
+            try:
+                numCreated = self.RunOnce()
+                logger.info("materialized %d planned todos", numCreated)
+            except Exception:
+                logger.exception("planned todos materialization failed")
+
+            self.__stopped.wait(self.__intervalSeconds)
+
+    def __repr__(self) -> str:
+        return (
+            f"<MaterializationScheduler horizon={self.__horizonDays} days "
+            f"every {self.__intervalSeconds}s />"
+        )
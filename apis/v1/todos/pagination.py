@@ -0,0 +1,22 @@
+import base64
+import datetime
+from typing import Tuple
+
+
+def encode_cursor(date: datetime.date, id: int) -> str:
+    """
+    Opaque keyset cursor pointing after the todo `(date, id)`.
+    """
+    return base64.urlsafe_b64encode(f"{date.isoformat()}:{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.date, int]:
+    """
+    The `(date, id)` of `encode_cursor`, raises `ValueError` on a cursor
+        which it did not produce.
+    """
+    try:
+        date, id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return datetime.date.fromisoformat(date), int(id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor {cursor!r}") from e
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# the slot of a virtual todo id takes the last two digits (see
+# materialization.py), so a planned todo creates at most 99 todos a day
+VIRTUAL_ID_DATE_FACTOR = 100
 
 
 class PlannedTodoSchema(BaseModel):
@@ -7,4 +11,4 @@ class PlannedTodoSchema(BaseModel):
     description: str
     weekdays: str = "Mon"
     gapWeek: int = 1
-    numTodos: int = 1
+    numTodos: int = Field(1, ge=1, lt=VIRTUAL_ID_DATE_FACTOR)
@@ -0,0 +1,169 @@
+import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, func, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from models import *
+
+from .changes import next_change_seq
+
+# room left between two consecutive todos of a day, a todo moved between
+# them takes the middle rank, the day is rebalanced once there is none
+RANK_GAP = 1024
+
+Day = Tuple[int, datetime.date]
+
+
+def last_ranks(db: Session, days: Iterable[Day]) -> Dict[Day, int]:
+    """
+    Highest rank of each `(user_id, date)`, read in a single query over the
+        (user_id, date, rank) index. Days without any todo are missing.
+    """
+    days = list(set(days))
+    if not days:
+        return {}
+
+    if len(days) == 1:
+        ((user_id, date),) = days
+        match = and_(Todo.user_id == user_id, Todo.date == date)
+    else:
+        match = tuple_(Todo.user_id, Todo.date).in_(days)
+
+    rows = db.execute(
+        select(Todo.user_id, Todo.date, func.max(Todo.rank))
+        .where(match)
+        .group_by(Todo.user_id, Todo.date)
+    )
+
+    return {(user_id, date): rank for user_id, date, rank in rows}
+
+
+def append_ranks(db: Session, days: List[Day]) -> List[int]:
+    """
+    Ranks which put new todos at the end of their day, one for each entry
+        of `days` and in that order.
+    """
+    ranks = last_ranks(db, days)
+    appended = []
+
+    for day in days:
+        ranks[day] = ranks.get(day, 0) + RANK_GAP
+        appended.append(ranks[day])
+
+    return appended
+
+
+def append_todos(db: Session, todos: List[Todo]) -> None:
+    """
+    Put the todos at the end of their day, the caller commits.
+    """
+    for todo, rank in zip(
+        todos, append_ranks(db, [(todo.user_id, todo.date) for todo in todos])
+    ):
+        todo.rank = rank
+
+
+def day_order(db: Session, user_id: int, date: datetime.date) -> List[int]:
+    return (
+        db.execute(
+            select(Todo.id)
+            .where(Todo.user_id == user_id, Todo.date == date)
+            .order_by(Todo.rank, Todo.id)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def rank_day(
+    db: Session, user_id: int, date: datetime.date, order: List[int]
+) -> Dict[int, int]:
+    """
+    Spread the ranks of the todos of the day evenly, in the order of the
+        ids of `order` which are todos of the user at that date, the other
+        todos of the day follow in their current order. The todos already
+        loaded in the session are kept up to date, the caller commits.
+
+    Returns:
+        The new rank of each todo of the day.
+    """
+    current = day_order(db, user_id, date)
+    owned = set(current)
+    listed = [id for id in dict.fromkeys(order) if id in owned]
+    unlisted = owned.difference(listed)
+
+    return _spread_ranks(db, user_id, listed + [id for id in current if id in unlisted])
+
+
+def _spread_ranks(db: Session, user_id: int, ordered: List[int]) -> Dict[int, int]:
+    ranks = {id: (index + 1) * RANK_GAP for index, id in enumerate(ordered)}
+    if not ranks:
+        return ranks
+
+    now = datetime.datetime.now()
+    seq = next_change_seq(db, user_id)
+    db.execute(
+        update(Todo),
+        [
+            {"id": id, "rank": rank, "last_updated": now, "change_seq": seq}
+            for id, rank in ranks.items()
+        ],
+    )
+
+    for instance in list(db.identity_map.values()):
+        if isinstance(instance, Todo) and instance.id in ranks:
+            set_committed_value(instance, "rank", ranks[instance.id])
+            set_committed_value(instance, "last_updated", now)
+            set_committed_value(instance, "change_seq", seq)
+
+    return ranks
+
+
+def move_todo(db: Session, todo: Todo, after: Optional[Todo]) -> None:
+    """
+    Put the todo right after `after` in its day, first of the day when
+        `after` is `None`.
+
+    Only the moved todo is written, it takes the middle of the ranks around
+        its new place. When they are too close the whole day is rebalanced
+        by `rank_day`. The caller commits.
+    """
+    others = (
+        Todo.user_id == todo.user_id,
+        Todo.date == todo.date,
+        Todo.id != todo.id,
+    )
+
+    if after is None:
+        lower = None
+        upper = db.scalar(select(func.min(Todo.rank)).where(*others))
+    else:
+        lower = after.rank
+        upper = db.scalar(
+            select(Todo.rank)
+            .where(
+                *others,
+                or_(
+                    Todo.rank > after.rank,
+                    and_(Todo.rank == after.rank, Todo.id > after.id),
+                ),
+            )
+            .order_by(Todo.rank, Todo.id)
+            .limit(1)
+        )
+
+    if upper is None:
+        rank = (lower or 0) + RANK_GAP
+    elif lower is None:
+        rank = upper - RANK_GAP
+    elif upper - lower > 1:
+        rank = (lower + upper) // 2
+    else:
+        # the whole day was just read, spread it without reading it again
+        order = [id for id in day_order(db, todo.user_id, todo.date) if id != todo.id]
+        order.insert(order.index(after.id) + 1, todo.id)
+        _spread_ranks(db, todo.user_id, order)
+        return
+
+    todo.rank = rank
+    todo.last_updated = datetime.datetime.now()
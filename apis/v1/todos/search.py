@@ -0,0 +1,158 @@
+import re
+import html
+from typing import List, Optional
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .changes import PLANNED_TODO_KIND, TODO_KIND
+
+# FTS5 index over the titles and descriptions of the todos and the planned
+# todos, kept in sync by triggers so that the bulk statements (batch,
+# materialization, delete_todos) are covered as well as the ORM. A todo is
+# the row `2 * id`, a planned todo the row `2 * id + 1`, and `owner` holds
+# the token `u<user_id>` so that the user filter is part of the match.
+SEARCH_TABLE = "todo_search"
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+# FTS5 wraps the matches in these control characters, the text is escaped
+# as HTML before they become SNIPPET_OPEN and SNIPPET_CLOSE
+_MATCH_OPEN = "\x02"
+_MATCH_CLOSE = "\x03"
+SNIPPET_TOKENS = 12
+
+# weights of title, description and owner in the bm25 score
+SEARCH_WEIGHTS = (10.0, 1.0, 0.0)
+
+_TERM = re.compile(r"\w+\*?")
+
+_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "title, description, owner, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    # todos
+    "CREATE TRIGGER IF NOT EXISTS todos_search_insert AFTER INSERT ON todos BEGIN "
+    f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, owner) VALUES "
+    "(2 * new.id, new.title, new.description, 'u' || new.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS todos_search_update "
+    "AFTER UPDATE OF title, description, user_id ON todos BEGIN "
+    f"UPDATE {SEARCH_TABLE} SET title = new.title, "
+    "description = new.description, owner = 'u' || new.user_id "
+    "WHERE rowid = 2 * old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS todos_search_delete AFTER DELETE ON todos BEGIN "
+    f"DELETE FROM {SEARCH_TABLE} WHERE rowid = 2 * old.id; END",
+    # planned todos
+    "CREATE TRIGGER IF NOT EXISTS plannedTodos_search_insert "
+    'AFTER INSERT ON "plannedTodos" BEGIN '
+    f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, owner) VALUES "
+    "(2 * new.id + 1, new.title, new.description, 'u' || new.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS plannedTodos_search_update "
+    'AFTER UPDATE OF title, description, user_id ON "plannedTodos" BEGIN '
+    f"UPDATE {SEARCH_TABLE} SET title = new.title, "
+    "description = new.description, owner = 'u' || new.user_id "
+    "WHERE rowid = 2 * old.id + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS plannedTodos_search_delete "
+    'AFTER DELETE ON "plannedTodos" BEGIN '
+    f"DELETE FROM {SEARCH_TABLE} WHERE rowid = 2 * old.id + 1; END",
+]
+
+_SEARCH_BACKFILL = [
+    f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, owner) "
+    "SELECT 2 * id, title, description, 'u' || user_id FROM todos",
+    f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, owner) "
+    "SELECT 2 * id + 1, title, description, 'u' || user_id FROM \"plannedTodos\"",
+]
+
+
+def search_available(connection) -> bool:
+    return connection.dialect.name == "sqlite"
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Create the search table and its triggers, the table is filled with the
+        existing todos and planned todos when it is created. Only sqlite has
+        FTS5, nothing is done on the other databases.
+    """
+    if not search_available(connection):
+        return
+
+    created = not inspect(connection).has_table(SEARCH_TABLE)
+
+    for statement in _SEARCH_DDL:
+        connection.execute(text(statement))
+
+    if created:
+        for statement in _SEARCH_BACKFILL:
+            connection.execute(text(statement))
+
+
+def match_expression(user_id: int, q: str) -> Optional[str]:
+    """
+    The FTS5 query of the words of `q` among the rows of the user, every
+        word has to match, a word ending with `*` is a prefix. The words are
+        quoted so that the FTS5 syntax of `q` is never interpreted.
+
+    Returns:
+        `None` when `q` has no word.
+    """
+    terms = [
+        f'"{term.rstrip("*")}"' + ("*" if term.endswith("*") else "")
+        for term in _TERM.findall(q)
+    ]
+    if not terms:
+        return None
+
+    return f"owner : u{user_id} AND {{title description}} : ({' '.join(terms)})"
+
+
+def _mark(fragment: str) -> str:
+    # a stored control character can at worst add a stray <mark>, the rest
+    # of the text is escaped
+    return (
+        html.escape(fragment)
+        .replace(_MATCH_OPEN, SNIPPET_OPEN)
+        .replace(_MATCH_CLOSE, SNIPPET_CLOSE)
+    )
+
+
+def search_todos(db: Session, user_id: int, q: str, limit: int) -> List[dict]:
+    """
+    The todos and planned todos of the user matching `q`, best first, with
+        their title highlighted and a snippet of their description, both
+        escaped as HTML.
+    """
+    match = match_expression(user_id, q)
+    if match is None:
+        return []
+
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    rows = db.execute(
+        text(
+            f"SELECT rowid, "
+            f"highlight({SEARCH_TABLE}, 0, :open, :close), "
+            f"snippet({SEARCH_TABLE}, 1, :open, :close, '…', :tokens), "
+            f"bm25({SEARCH_TABLE}, {weights}) AS score "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match "
+            "ORDER BY score LIMIT :limit"
+        ),
+        {
+            "open": _MATCH_OPEN,
+            "close": _MATCH_CLOSE,
+            "tokens": SNIPPET_TOKENS,
+            "match": match,
+            "limit": limit,
+        },
+    )
+
+    return [
+        {
+            "kind": PLANNED_TODO_KIND if rowid % 2 else TODO_KIND,
+            "id": rowid // 2,
+            "title": _mark(title),
+            "snippet": _mark(snippet or ""),
+            "score": -score,
+        }
+        for rowid, title, snippet, score in rows
+    ]
@@ -0,0 +1,106 @@
+import datetime
+from typing import List, Optional, Union
+from sqlalchemy import case, delete, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from models import *
+
+# the daily_summary rows follow every insert, delete and change of user,
+# date or completion of a todo, including the bulk statements, through
+# triggers. A day whose last todo goes away loses its row.
+_SUMMARY_ADD = (
+    "INSERT INTO daily_summary (user_id, date, total, completed) "
+    "VALUES (new.user_id, new.date, 1, coalesce(new.completed, 0)) "
+    "ON CONFLICT (user_id, date) DO UPDATE SET total = total + 1, "
+    "completed = completed + excluded.completed;"
+)
+_SUMMARY_REMOVE = (
+    "UPDATE daily_summary SET total = total - 1, "
+    "completed = completed - coalesce(old.completed, 0) "
+    "WHERE user_id = old.user_id AND date = old.date; "
+    "DELETE FROM daily_summary "
+    "WHERE user_id = old.user_id AND date = old.date AND total <= 0;"
+)
+
+_SUMMARY_TRIGGERS = {
+    "todos_summary_insert": f"AFTER INSERT ON todos BEGIN {_SUMMARY_ADD} END",
+    "todos_summary_delete": f"AFTER DELETE ON todos BEGIN {_SUMMARY_REMOVE} END",
+    "todos_summary_update": "AFTER UPDATE OF user_id, date, completed ON todos "
+    "WHEN old.user_id IS NOT new.user_id OR old.date IS NOT new.date "
+    "OR old.completed IS NOT new.completed "
+    f"BEGIN {_SUMMARY_REMOVE} {_SUMMARY_ADD} END",
+}
+
+
+def summary_available(connection) -> bool:
+    return connection.dialect.name == "sqlite"
+
+
+def create_summary_triggers(connection: Connection) -> None:
+    """
+    Create the triggers which maintain daily_summary, the summary is
+        recomputed from the todos when they are created. Only done on
+        sqlite, like the search index.
+    """
+    if not summary_available(connection):
+        return
+
+    existing = set(
+        connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        ).scalars()
+    )
+
+    for name, trigger in _SUMMARY_TRIGGERS.items():
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {trigger}"))
+
+    if not existing.issuperset(_SUMMARY_TRIGGERS):
+        recompute_daily_summary(connection)
+
+
+def recompute_daily_summary(
+    db: Union[Session, Connection], user_id: Optional[int] = None
+) -> None:
+    """
+    Rebuild the summary of the user, of every user when `user_id` is
+        `None`, from the todos, to fix any drift. The caller commits.
+    """
+    todos = select(
+        Todo.user_id,
+        Todo.date,
+        func.count(),
+        func.sum(case((Todo.completed, 1), else_=0)),
+    ).group_by(Todo.user_id, Todo.date)
+    stale = delete(DailySummary)
+
+    if user_id is not None:
+        todos = todos.where(Todo.user_id == user_id)
+        stale = stale.where(DailySummary.user_id == user_id)
+
+    db.execute(stale)
+    db.execute(
+        insert(DailySummary).from_select(
+            ["user_id", "date", "total", "completed"], todos
+        )
+    )
+
+
+def daily_summaries(
+    db: Session, user_id: int, start: datetime.date, end: datetime.date
+) -> List[DailySummary]:
+    """
+    The summaries of the days of the user between `start` and `end` (both
+        included) which have todos, by date.
+    """
+    return (
+        db.execute(
+            select(DailySummary)
+            .where(
+                DailySummary.user_id == user_id,
+                DailySummary.date.between(start, end),
+            )
+            .order_by(DailySummary.date)
+        )
+        .scalars()
+        .all()
+    )
@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+from .todo_schema import TodoSchema
+
+
+class BatchOperation(str, Enum):
+    create = "create"
+    update = "update"
+    complete = "complete"
+    uncomplete = "uncomplete"
+    delete = "delete"
+
+
+class TodoBatchItemSchema(BaseModel):
+    op: BatchOperation
+    id: Optional[int] = None  # every operation but create
+    todo: Optional[TodoSchema] = None  # create and update
+
+
+class TodoBatchSchema(BaseModel):
+    operations: List[TodoBatchItemSchema]
+
+
+class TodoBatchResultSchema(BaseModel):
+    op: BatchOperation
+    status: int
+    todo: Optional[TodoSchema] = None
+    detail: Optional[str] = None
+
+
+class TodoBatchResponseSchema(BaseModel):
+    results: List[TodoBatchResultSchema]
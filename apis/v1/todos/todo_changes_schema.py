@@ -0,0 +1,17 @@
+from typing import List
+from pydantic import BaseModel
+
+from .todo_schema import TodoSchema
+from .planned_todo_schema import PlannedTodoSchema
+
+
+class TombstoneSchema(BaseModel):
+    kind: str  # "todo" or "plannedTodo"
+    id: int
+
+
+class TodoChangesSchema(BaseModel):
+    cursor: int  # the `since` of the next sync
+    todos: List[TodoSchema] = []
+    plannedTodos: List[PlannedTodoSchema] = []
+    deleted: List[TombstoneSchema] = []
@@ -8,3 +8,5 @@ class TodoSchema(BaseModel):
     description: str
     date: datetime.date
     completed: bool = False
+    rank: int = 0  # position in the day, set by the server
+    virtual: bool = False  # projected from a planned todo, not stored yet
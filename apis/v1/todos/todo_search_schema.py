@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class TodoSearchResultSchema(BaseModel):
+    kind: str  # "todo" or "plannedTodo"
+    id: int
+    title: str  # escaped as HTML, the matches between <mark> tags
+    snippet: str  # of the description, escaped as HTML like the title
+    score: float  # higher is better
@@ -1,17 +1,46 @@
+import asyncio
 from datetime import date
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from routes import *
 from models import *
 from utils.database.database import *
 from sqlalchemy.orm import Session
-from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, tuple_
 from utils.authen.token_handler import get_current_user
+from utils.database.sql_metrics import query_budget
+from utils.date.date_utils import MonthRange
 from data.response_constant import *
+from config import get_config, Configure
 
 from .todo_schema import *
 from .planned_todo_schema import *
 from .todo_order_schema import *
+from .todo_batch_schema import *
+from .todo_changes_schema import *
+from .todo_search_schema import *
+from .daily_summary_schema import *
+from .pagination import decode_cursor, encode_cursor
+from .fingerprints import *
+from utils.http.etag import is_not_modified, make_etag, not_modified
+from .materialization import *
+from .changes import *
+from .ranking import *
+from .search import search_available, search_todos
+from .summary import daily_summaries, recompute_daily_summary, summary_available
+from .change_hub import ChangeHubFullError, ChangeSubscription, change_hub, sse_events
 
 router = APIRouter(
     prefix=TODO_BASE_ROUTE,
@@ -19,429 +48,1064 @@ router = APIRouter(
 )
 
 
-@router.get(GET_REMAIN_TODOS_ROUTE, response_model=List[TodoSchema])
-def get_remain_todos(
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> List[TodoSchema]:
-    today = datetime.datetime.today().date()
+def _batch_error(item: TodoBatchItemSchema, status: int, detail: str) -> dict:
+    return {"op": item.op, "status": status, "detail": detail}
+
+
+def _find_todos(
+    db: Session, user: User, ids: Iterable[int]
+) -> Dict[int, Union[Todo, HTTPException]]:
+    """
+    The todo of each id for the user, or the error to report for it. The
+        stored todos are read in one query and the virtual ones are
+        materialized together whatever their number (the caller commits).
+    """
+    ids = set(ids)
+    stored = [id for id in ids if not is_virtual_todo_id(id)]
+
+    todos: Dict[int, Optional[Todo]] = {}
+    if stored:
+        todos = {todo.id: todo for todo in db.query(Todo).filter(Todo.id.in_(stored))}
+
+    occurrences = find_virtual_todos(db, ids.difference(stored))
+    forbidden = {
+        id
+        for id, (planned_todo, _, _) in occurrences.items()
+        if planned_todo.user_id != user.id
+    }
+    todos.update(
+        materialize_virtual_todos(
+            db, [occurrences[id] for id in occurrences if id not in forbidden]
+        )
+    )
+
+    found = {}
+    for id in ids:
+        todo = todos.get(id)
+
+        if id in forbidden or (todo is not None and todo.user_id != user.id):
+            found[id] = HTTPException(
+                status_code=HTTP_FORBIDDEN_403,
+                detail="You are not authorized to access this todo",
+            )
+        elif todo is None:
+            found[id] = HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Todo not found",
+            )
+        else:
+            found[id] = todo
 
-    todos = (
-        db.query(Todo)
-        .filter(
+    return found
+
+
+def _find_todo(db: Session, user: User, id: int) -> Todo:
+    """
+    The todo `id` of the user, a virtual todo is materialized first
+        (the caller commits).
+    """
+    todo = _find_todos(db, user, [id])[id]
+
+    if isinstance(todo, HTTPException):
+        raise todo
+
+    return todo
+
+
+def _remain_todos_query(user_id: int, after: Optional[Tuple[date, int]] = None):
+    query = (
+        select(Todo)
+        .where(
             Todo.completed == False,
-            Todo.user_id == user.id,
-            Todo.date <= today,
+            Todo.user_id == user_id,
+            Todo.date <= datetime.date.today(),
         )
-        .all()
+        .order_by(Todo.date, Todo.id)
     )
 
-    return todos
+    if after is not None:
+        query = query.where(tuple_(Todo.date, Todo.id) > tuple_(*after))
 
+    return query
 
-@router.get(GET_ALL_PLANNED_TODOS_ROUTE, response_model=List[PlannedTodoSchema])
-def get_all_planned_todos(
-    user: User = Depends(get_current_user),
-) -> List[TodoSchema]:
-    return user.plannedTodos
 
+def _to_ndjson(todo: Todo) -> str:
+    return (
+        TodoSchema.model_validate(todo, from_attributes=True).model_dump_json() + "\n"
+    )
 
-@router.post(ADD_PLANNED_TODO_ROUTE, response_model=PlannedTodoSchema)
-def add_planned_todo(
-    planned_todo_info: PlannedTodoSchema,
+
+def _stream_remain_todos(bind, user_id: int) -> Iterator[str]:
+    # the request session is closed before the body is sent, stream from our own
+    with Session(bind=bind) as db:
+        query = _remain_todos_query(user_id).execution_options(yield_per=200)
+        for todo in db.scalars(query):
+            yield _to_ndjson(todo)
+
+
+async def _stream_remain_todos_async(bind, user_id: int) -> AsyncIterator[str]:
+    async with AsyncSession(bind=bind) as db:
+        query = _remain_todos_query(user_id).execution_options(yield_per=200)
+        async for todo in await db.stream_scalars(query):
+            yield _to_ndjson(todo)
+
+
+@router.get(
+    GET_TODO_CHANGES_ROUTE,
+    response_model=TodoChangesSchema,
+    dependencies=[query_budget(6)],
+)
+async def get_todo_changes(
+    since: int = Query(default=0, ge=0),
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> TodoSchema:
-    planned_todo = PlannedTodo.Create(user.id, planned_todo_info)
-    db.add(planned_todo)
+    db: DbSession = Depends(get_db),
+):
+    def run(db: Session):
+        return changes_since(db, user.id, since)
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
-    return planned_todo
+    return await run_db(db, run)
 
 
-@router.get(GET_PLANNED_TODO_ROUTE, response_model=PlannedTodoSchema)
-def get_planned_todo(
-    id: int,
+@router.get(
+    SEARCH_TODOS_ROUTE,
+    response_model=List[TodoSearchResultSchema],
+    dependencies=[query_budget(2)],
+)
+async def search_user_todos(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1),
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> PlannedTodoSchema:
-    planned_todo = db.query(PlannedTodo).filter(PlannedTodo.id == id).first()
+    db: DbSession = Depends(get_db),
+    config: Configure = Depends(get_config),
+) -> List[TodoSearchResultSchema]:
+    """
+    Todos and planned todos of the user whose title or description has
+        every word of `q`, best first. A word ending with `*` matches the
+        words it starts.
+    """
+    limit = min(limit, config.Get("maxPageSize", 500))
+
+    def run(db: Session):
+        if not search_available(db.get_bind()):
+            raise HTTPException(
+                status_code=HTTP_NOT_IMPLEMENTED_501,
+                detail="Search needs a sqlite database",
+            )
+
+        return search_todos(db, user.id, q, limit)
+
+    return await run_db(db, run)
+
 
-    if planned_todo is None:
+def _check_summary_available(db: Session) -> None:
+    if not summary_available(db.get_bind()):
         raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Planned todo not found",
+            status_code=HTTP_NOT_IMPLEMENTED_501,
+            detail="The summary needs a sqlite database",
         )
 
-    if planned_todo.user_id != user.id:
+
+@router.get(
+    GET_TODOS_SUMMARY_ROUTE,
+    response_model=List[DailySummarySchema],
+    dependencies=[query_budget(9)],
+)
+async def get_todos_summary(
+    month: str,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> List[DailySummarySchema]:
+    """
+    Number of todos and of completed todos of each day of the month which
+        has todos, read from the daily summary. The planned todos of the
+        past days are created first, like by the other day views.
+    """
+    try:
+        start, end = MonthRange(month)
+    except ValueError:
         raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this planned todo",
+            status_code=HTTP_BAD_REQUEST_400,
+            detail="The month must be formatted as YYYY-MM",
         )
 
-    return planned_todo
+    def run(db: Session):
+        _check_summary_available(db)
+        today = datetime.date.today()
 
+        if start <= today and materialize_planned_todos(
+            db, user.id, start, min(end, today)
+        ):
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                raise HTTPException(
+                    status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                    detail=str(e),
+                )
 
-@router.put(UPDATE_PLANNED_TODO_ROUTE, response_model=PlannedTodoSchema)
-def update_planned_todo(
-    id: int,
-    planned_todo_info: PlannedTodoSchema,
+        return daily_summaries(db, user.id, start, end)
+
+    return await run_db(db, run)
+
+
+@router.post(
+    RECOMPUTE_TODOS_SUMMARY_ROUTE,
+    status_code=HTTP_OK_200,
+    dependencies=[query_budget(3)],
+)
+async def recompute_todos_summary(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    planned_todo = db.query(PlannedTodo).filter(PlannedTodo.id == id).first()
+    def run(db: Session):
+        _check_summary_available(db)
+
+        try:
+            recompute_daily_summary(db, user.id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    if planned_todo is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Planned todo not found",
-        )
+        return {"message": "The summary has been recomputed"}
+
+    return await run_db(db, run)
 
-    if planned_todo.user_id != user.id:
+
+def _subscribe(user_id: int) -> ChangeSubscription:
+    try:
+        return change_hub.Subscribe(user_id)
+    except ChangeHubFullError as e:
         raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this planned todo",
+            status_code=HTTP_SERVICE_UNAVAILABLE_503,
+            detail=str(e),
         )
 
-    planned_todo.Update(planned_todo_info)
 
-    # delete all planned todo created which the date is not today
-    for todo_created in planned_todo.todo_created:
-        if todo_created.date > datetime.datetime.today().date():
-            db.delete(todo_created.todo)
-            db.delete(todo_created)
+async def _send_changes(websocket: WebSocket, subscription: ChangeSubscription):
+    while True:
+        await websocket.send_json(await subscription.Get())
+
+
+@router.websocket(STREAM_TODO_CHANGES_ROUTE)
+async def stream_todo_changes(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    db: DbSession = Depends(get_db),
+):
+    """
+    Push `{"event": "changes", "cursor": ...}` after every commit which
+        changed the todos of the user, the client then pulls the changes
+        since its cursor. Browsers cannot set headers on a WebSocket, the
+        token can be passed as a query parameter instead.
+    """
+    authorization = websocket.headers.get("authorization", "")
+    if token is None and authorization.lower().startswith("bearer "):
+        token = authorization[len("bearer ") :]
 
     try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
+        user = await get_current_user(db, token)
+        subscription = _subscribe(user.id)
+    except HTTPException as e:
+        await websocket.close(
+            code=(
+                status.WS_1013_TRY_AGAIN_LATER
+                if e.status_code == HTTP_SERVICE_UNAVAILABLE_503
+                else status.WS_1008_POLICY_VIOLATION
+            )
         )
+        return
 
-    return planned_todo
+    await websocket.accept()
+    sender = asyncio.create_task(_send_changes(websocket, subscription))
 
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        change_hub.Unsubscribe(subscription)
 
-@router.delete(DELETE_PLANNED_TODO_ROUTE)
-def delete_planned_todo(
-    id: int,
+
+@router.get(STREAM_TODO_CHANGES_ROUTE, dependencies=[query_budget(1)])
+async def stream_todo_changes_sse(
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    config: Configure = Depends(get_config),
 ):
-    planned_todo = db.query(PlannedTodo).filter(PlannedTodo.id == id).first()
+    """
+    Server-sent events fallback of the WebSocket stream, same events.
+    """
+    subscription = _subscribe(user.id)
+
+    return StreamingResponse(
+        sse_events(subscription, config.Get("streamKeepaliveSeconds", 25)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(change_hub.Unsubscribe, subscription),
+    )
 
-    if planned_todo is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Planned todo not found",
-        )
 
-    if planned_todo.user_id != user.id:
-        raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this planned todo",
-        )
+@router.get(
+    GET_REMAIN_TODOS_ROUTE,
+    response_model=List[TodoSchema],
+    dependencies=[query_budget(3)],
+)
+async def get_remain_todos(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    config: Configure = Depends(get_config),
+) -> List[TodoSchema]:
+    """
+    Every incomplete todo up to today ordered by (date, id).
+
+    With `limit` one page is returned, the `X-Next-Cursor` header holds
+        the `cursor` of the next page while there is one. With `stream`
+        the todos are sent as NDJSON while they are read, it cannot be
+        combined with `limit` or `cursor`.
+    """
+    if stream:
+        if limit is not None or cursor is not None:
+            raise HTTPException(
+                status_code=HTTP_UNPROCESSABLE_ENTITY_422,
+                detail="A streamed list cannot be paginated",
+            )
 
-    db.delete(planned_todo)
+        if isinstance(db, AsyncSession):
+            body = _stream_remain_todos_async(db.bind, user.id)
+        else:
+            body = _stream_remain_todos(db.get_bind(), user.id)
+        return StreamingResponse(body, media_type="application/x-ndjson")
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=HTTP_BAD_REQUEST_400, detail=str(e))
+
+    if limit is not None:
+        limit = min(limit, config.Get("maxPageSize", 500))
+
+    def run(db: Session):
+        etag = make_etag("remain", remain_todos_fingerprint(db, user.id), limit, cursor)
+        if is_not_modified(request, etag):
+            return None, etag
+
+        query = _remain_todos_query(user.id, after)
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        return db.scalars(query).all(), etag
+
+    todos, etag = await run_db(db, run)
+    if todos is None:
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+
+    if limit is not None and len(todos) > limit:
+        todos = todos[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            todos[-1].date, todos[-1].id
         )
 
-    return {"message": "Planned todo deleted successfully"}
+    return todos
 
 
-@router.get(GET_TODO_INFO_ROUTE, response_model=TodoSchema)
-def get_todo_info(
-    id: int,
+@router.get(
+    GET_TODOS_BY_RANGE_ROUTE,
+    response_model=Dict[date, List[TodoSchema]],
+    dependencies=[query_budget(11)],
+)
+async def get_todos_by_range(
+    start: date,
+    end: date,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> TodoSchema:
-    todo = db.query(Todo).filter(Todo.id == id).first()
-
-    if todo is None:
+    db: DbSession = Depends(get_db),
+    config: Configure = Depends(get_config),
+) -> Dict[date, List[TodoSchema]]:
+    if end < start:
         raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Todo not found",
+            status_code=HTTP_BAD_REQUEST_400,
+            detail="The end of the range is before its start",
         )
 
-    if todo.user_id != user.id:
+    maxDays = config.Get("maxTodoRangeDays", 62)
+    if (end - start).days + 1 > maxDays:
         raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this todo",
+            status_code=HTTP_BAD_REQUEST_400,
+            detail=f"The range cannot be longer than {maxDays} days",
         )
 
-    return todo
+    def run(db: Session):
+        today = datetime.date.today()
+
+        if start <= today and materialize_planned_todos(
+            db, user.id, start, min(end, today)
+        ):
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                raise HTTPException(
+                    status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                    detail=str(e),
+                )
+
+        todos = (
+            db.query(Todo)
+            .filter(Todo.user_id == user.id, Todo.date.between(start, end))
+            .order_by(Todo.date, Todo.id)
+            .all()
+        )
 
+        if end > today:
+            todos += project_planned_todos(
+                db, user.id, max(start, today + datetime.timedelta(days=1)), end
+            )
 
-@router.post(ADD_TODO_ROUTE, response_model=TodoSchema)
-def add_todo(
-    todo_info: TodoSchema,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> TodoSchema:
-    todo = Todo.Create(user.id, todo_info)
-    db.add(todo)
+        todosByDate = {
+            start + datetime.timedelta(days=day): []
+            for day in range((end - start).days + 1)
+        }
+        for todo in todos:
+            todosByDate[todo.date].append(todo)
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
-    return todo
+        return todosByDate
 
+    return await run_db(db, run)
 
-@router.get(GET_TODOS_BY_DATE_ROUTE, response_model=List[TodoSchema])
-def get_todo_by_date(
-    date: date,
+
+@router.get(
+    GET_ALL_PLANNED_TODOS_ROUTE,
+    response_model=List[PlannedTodoSchema],
+    dependencies=[query_budget(3)],
+)
+async def get_all_planned_todos(
+    request: Request,
+    response: Response,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> List[TodoSchema]:
-    planned_tods: List[PlannedTodo] = user.plannedTodos
+    def run(db: Session):
+        etag = make_etag("planned", planned_todos_fingerprint(db, user.id))
+        if is_not_modified(request, etag):
+            return None, etag
+
+        return list(user.plannedTodos), etag
 
-    for planned_todo in planned_tods:
-        numCreated = planned_todo.NeedCreated(date)
+    planned_todos, etag = await run_db(db, run)
+    if planned_todos is None:
+        return not_modified(etag)
 
-        if numCreated == -1:
-            continue
+    response.headers["ETag"] = etag
+    return planned_todos
 
-        for _ in range(numCreated):
-            todoInfo = TodoSchema(
-                id=0,
-                title=planned_todo.title,
-                description=planned_todo.description,
-                date=date,
+
+@router.post(
+    ADD_PLANNED_TODO_ROUTE,
+    response_model=PlannedTodoSchema,
+    dependencies=[query_budget(3)],
+)
+async def add_planned_todo(
+    planned_todo_info: PlannedTodoSchema,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> TodoSchema:
+    def run(db: Session):
+        planned_todo = PlannedTodo.Create(user.id, planned_todo_info)
+        db.add(planned_todo)
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
             )
-            todo = Todo.Create(user.id, todoInfo)
-            db.add(todo)
-            todoCreated = PlannedTodoCreated.Create(planned_todo, todo, date)
-            db.add(todoCreated)
+        return planned_todo
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
+    return await run_db(db, run)
 
-    todos = db.query(Todo).filter(Todo.date == date, Todo.user_id == user.id).all()
 
-    return todos
+@router.get(
+    GET_PLANNED_TODO_ROUTE,
+    response_model=PlannedTodoSchema,
+    dependencies=[query_budget(2)],
+)
+async def get_planned_todo(
+    id: int,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> PlannedTodoSchema:
+    def run(db: Session):
+        planned_todo = db.query(PlannedTodo).filter(PlannedTodo.id == id).first()
+
+        if planned_todo is None:
+            raise HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Planned todo not found",
+            )
+
+        if planned_todo.user_id != user.id:
+            raise HTTPException(
+                status_code=HTTP_FORBIDDEN_403,
+                detail="You are not authorized to access this planned todo",
+            )
+
+        return planned_todo
 
+    return await run_db(db, run)
 
-@router.put(UPDATE_TODO_ROUTE, response_model=TodoSchema)
-def update_todo(
+
+@router.put(
+    UPDATE_PLANNED_TODO_ROUTE,
+    response_model=PlannedTodoSchema,
+    dependencies=[query_budget(6)],
+)
+async def update_planned_todo(
     id: int,
-    todo_info: TodoSchema,
+    planned_todo_info: PlannedTodoSchema,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    todo = db.query(Todo).filter(Todo.id == id).first()
+    def run(db: Session):
+        planned_todo = db.query(PlannedTodo).filter(PlannedTodo.id == id).first()
 
-    if todo is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Todo not found",
-        )
+        if planned_todo is None:
+            raise HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Planned todo not found",
+            )
 
-    if todo.user_id != user.id:
-        raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this todo",
-        )
+        if planned_todo.user_id != user.id:
+            raise HTTPException(
+                status_code=HTTP_FORBIDDEN_403,
+                detail="You are not authorized to access this planned todo",
+            )
 
-    todo.Update(todo_info)
+        planned_todo.Update(planned_todo_info)
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
+        # delete all planned todo created which the date is not today
+        delete_occurrences(db, planned_todo.id, after=datetime.date.today())
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
+
+        return planned_todo
+
+    return await run_db(db, run)
+
+
+@router.delete(DELETE_PLANNED_TODO_ROUTE, dependencies=[query_budget(8)])
+async def delete_planned_todo(
+    id: int,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    def run(db: Session):
+        planned_todo = db.query(PlannedTodo).filter(PlannedTodo.id == id).first()
+
+        if planned_todo is None:
+            raise HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Planned todo not found",
+            )
+
+        if planned_todo.user_id != user.id:
+            raise HTTPException(
+                status_code=HTTP_FORBIDDEN_403,
+                detail="You are not authorized to access this planned todo",
+            )
+
+        # the past todos are kept as history, the upcoming ones go with it
+        delete_occurrences(db, planned_todo.id, after=datetime.date.today())
+        db.execute(
+            delete(PlannedTodoCreated).where(
+                PlannedTodoCreated.planned_todo_id == planned_todo.id
+            )
         )
+        db.execute(delete(PlannedTodo).where(PlannedTodo.id == planned_todo.id))
+        record_tombstones(db, PLANNED_TODO_KIND, [(planned_todo.id, user.id)])
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    return todo
+        return {"message": "Planned todo deleted successfully"}
+
+    return await run_db(db, run)
 
 
-@router.put(COMPLETE_TODO_ROUTE, response_model=TodoSchema)
-def complete_todo(
+@router.get(
+    GET_TODO_INFO_ROUTE, response_model=TodoSchema, dependencies=[query_budget(4)]
+)
+async def get_todo_info(
     id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> TodoSchema:
-    todo = db.query(Todo).filter(Todo.id == id).first()
+    def run(db: Session):
+        todo = None
+
+        if is_virtual_todo_id(id):
+            occurrence = find_virtual_todo(db, id)
+
+            if occurrence is not None:
+                planned_todo, date, slot = occurrence
+                if planned_todo.user_id != user.id:
+                    raise HTTPException(
+                        status_code=HTTP_FORBIDDEN_403,
+                        detail="You are not authorized to access this todo",
+                    )
+
+                # a claimed slot without a todo was deleted, it stays gone
+                todos = created_todos(db, [occurrence])
+                if id not in todos:
+                    return TodoSchema(
+                        id=id,
+                        title=planned_todo.title,
+                        description=planned_todo.description,
+                        date=date,
+                        virtual=True,
+                    )
+                todo = todos[id]
+        else:
+            todo = db.query(Todo).filter(Todo.id == id).first()
+
+        if todo is None:
+            raise HTTPException(
+                status_code=HTTP_NOT_FOUND_404,
+                detail="Todo not found",
+            )
 
-    if todo is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Todo not found",
-        )
+        if todo.user_id != user.id:
+            raise HTTPException(
+                status_code=HTTP_FORBIDDEN_403,
+                detail="You are not authorized to access this todo",
+            )
 
-    if todo.user_id != user.id:
-        raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this todo",
-        )
+        return todo
 
-    todo.Complete()
+    return await run_db(db, run)
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
 
-    return todo
+@router.post(ADD_TODO_ROUTE, response_model=TodoSchema, dependencies=[query_budget(4)])
+async def add_todo(
+    todo_info: TodoSchema,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> TodoSchema:
+    def run(db: Session):
+        todo = Todo.Create(user.id, todo_info)
+        append_todos(db, [todo])
+        db.add(todo)
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
+        return todo
+
+    return await run_db(db, run)
+
+
+@router.get(
+    GET_TODOS_BY_DATE_ROUTE,
+    response_model=List[TodoSchema],
+    dependencies=[query_budget(11)],
+)
+async def get_todo_by_date(
+    date: date,
+    request: Request,
+    response: Response,
+    ordered: bool = False,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> List[TodoSchema]:
+    def todos_query(db: Session):
+        query = db.query(Todo).filter(Todo.date == date, Todo.user_id == user.id)
+        if ordered:
+            # the stored todos in the order of the day, the projected ones
+            # are appended after them, by planned todo and slot
+            query = query.order_by(Todo.rank, Todo.id)
+        return query
+
+    def run(db: Session):
+        etag = make_etag("date", ordered, todos_by_date_fingerprint(db, user.id, date))
+        if is_not_modified(request, etag):
+            return None, etag
+
+        # future days are projected, only today and the past are stored
+        if date > datetime.date.today():
+            todos = todos_query(db).all()
+            return todos + project_planned_todos(db, user.id, date), etag
+
+        if materialize_planned_todos(db, user.id, date):
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                raise HTTPException(
+                    status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                    detail=str(e),
+                )
+            etag = make_etag(
+                "date", ordered, todos_by_date_fingerprint(db, user.id, date)
+            )
+
+        return todos_query(db).all(), etag
+
+    todos, etag = await run_db(db, run)
+    if todos is None:
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    return todos
+
+
+@router.put(
+    UPDATE_TODO_ROUTE, response_model=TodoSchema, dependencies=[query_budget(10)]
+)
+async def update_todo(
+    id: int,
+    todo_info: TodoSchema,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    def run(db: Session):
+        todo = _find_todo(db, user, id)
+        moved = todo.date != todo_info.date
+
+        todo.Update(todo_info)
+        if moved:
+            append_todos(db, [todo])
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
+
+        return todo
 
+    return await run_db(db, run)
 
-@router.put(UNCOMPLETE_TODO_ROUTE, response_model=TodoSchema)
-def uncomplete_todo(
+
+@router.put(
+    COMPLETE_TODO_ROUTE, response_model=TodoSchema, dependencies=[query_budget(9)]
+)
+async def complete_todo(
     id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> TodoSchema:
-    todo = db.query(Todo).filter(Todo.id == id).first()
+    def run(db: Session):
+        todo = _find_todo(db, user, id)
+
+        todo.Complete()
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    if todo is None:
-        raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Todo not found",
-        )
+        return todo
 
-    if todo.user_id != user.id:
-        raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this todo",
-        )
+    return await run_db(db, run)
 
-    todo.Uncomplete()
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
+@router.put(
+    UNCOMPLETE_TODO_ROUTE, response_model=TodoSchema, dependencies=[query_budget(9)]
+)
+async def uncomplete_todo(
+    id: int,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> TodoSchema:
+    def run(db: Session):
+        todo = _find_todo(db, user, id)
+
+        todo.Uncomplete()
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
+
+        return todo
+
+    return await run_db(db, run)
+
+
+@router.put(MOVE_TODO_ROUTE, response_model=TodoSchema, dependencies=[query_budget(12)])
+async def move_todo_after(
+    id: int,
+    after: Optional[int] = None,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    if after == id:
         raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
+            status_code=HTTP_BAD_REQUEST_400,
+            detail="A todo cannot be moved after itself",
         )
 
-    return todo
+    def run(db: Session):
+        # the todo and the one it goes after are resolved together
+        found = _find_todos(db, user, [id] if after is None else [id, after])
+        for error in (found[id], found.get(after)):
+            if isinstance(error, HTTPException):
+                raise error
+        todo, previous = found[id], found.get(after)
+
+        if previous is not None and previous.date != todo.date:
+            raise HTTPException(
+                status_code=HTTP_BAD_REQUEST_400,
+                detail="Todos can only be moved within their day",
+            )
+
+        move_todo(db, todo, previous)
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
+
+        return todo
 
+    return await run_db(db, run)
 
-@router.delete(DELETE_TODO_ROUTE)
-def delete_todo(
+
+@router.delete(DELETE_TODO_ROUTE, dependencies=[query_budget(12)])
+async def delete_todo(
     id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    todo = db.query(Todo).filter(Todo.id == id).first()
+    def run(db: Session):
+        todo = _find_todo(db, user, id)
+
+        db.delete(todo)
+        db.commit()
+
+        return {"message": "Todo deleted successfully"}
+
+    return await run_db(db, run)
+
 
-    if todo is None:
+@router.post(
+    BATCH_TODOS_ROUTE,
+    response_model=TodoBatchResponseSchema,
+    dependencies=[query_budget(12)],
+)
+async def batch_todos(
+    batch: TodoBatchSchema,
+    user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    config: Configure = Depends(get_config),
+) -> TodoBatchResponseSchema:
+    maxOperations = config.Get("maxBatchOperations", 100)
+    if len(batch.operations) > maxOperations:
         raise HTTPException(
-            status_code=HTTP_NOT_FOUND_404,
-            detail="Todo not found",
+            status_code=HTTP_BAD_REQUEST_400,
+            detail=f"A batch cannot have more than {maxOperations} operations",
         )
 
-    if todo.user_id != user.id:
-        raise HTTPException(
-            status_code=HTTP_FORBIDDEN_403,
-            detail="You are not authorized to access this todo",
+    def run(db: Session):
+        # one ownership query for every stored todo of the batch, the
+        # virtual ones are materialized together
+        todos = _find_todos(
+            db, user, [item.id for item in batch.operations if item.id is not None]
         )
 
-    db.delete(todo)
-    db.commit()
+        results = []
+        deleted = set()
+        appended = []
+
+        for item in batch.operations:
+            if item.op == BatchOperation.create:
+                if item.todo is None:
+                    results.append(_batch_error(item, HTTP_BAD_REQUEST_400, "No todo"))
+                    continue
+
+                todo = Todo.Create(user.id, item.todo)
+                appended.append(todo)
+                db.add(todo)
+                results.append(
+                    {"op": item.op, "status": HTTP_CREATED_201, "todo": todo}
+                )
+                continue
+
+            if item.id is None:
+                results.append(_batch_error(item, HTTP_BAD_REQUEST_400, "No todo id"))
+                continue
+
+            todo = todos[item.id]
+            if isinstance(todo, HTTPException):
+                results.append(_batch_error(item, todo.status_code, todo.detail))
+                continue
+
+            if todo.id in deleted:
+                results.append(_batch_error(item, HTTP_NOT_FOUND_404, "Todo not found"))
+                continue
+
+            if item.op == BatchOperation.update:
+                if item.todo is None:
+                    results.append(_batch_error(item, HTTP_BAD_REQUEST_400, "No todo"))
+                    continue
+                if todo.date != item.todo.date:
+                    appended.append(todo)
+                todo.Update(item.todo)
+            elif item.op == BatchOperation.complete:
+                todo.Complete()
+            elif item.op == BatchOperation.uncomplete:
+                todo.Uncomplete()
+            else:
+                deleted.add(todo.id)
+                db.expunge(todo)
+                results.append({"op": item.op, "status": HTTP_OK_200})
+                continue
+
+            results.append({"op": item.op, "status": HTTP_OK_200, "todo": todo})
+
+        try:
+            append_todos(db, [todo for todo in appended if todo.id not in deleted])
+            db.flush()
+            if deleted:
+                unlink_occurrences(db, Todo.id.in_(deleted))
+                delete_todos(db, Todo.id.in_(deleted))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
+
+        return {"results": results}
 
-    return {"message": "Todo deleted successfully"}
+    return await run_db(db, run)
 
 
-@router.delete(CLEAN_TODOS_BY_DATE_ROUTE)
-def clean_todos_by_date(
+@router.delete(CLEAN_TODOS_BY_DATE_ROUTE, dependencies=[query_budget(4)])
+async def clean_todos_by_date(
     date: date,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    stmt = delete(Todo).where(Todo.date == date, Todo.user_id == user.id)
+    def run(db: Session):
+        try:
+            unlink_occurrences(db, Todo.date == date, Todo.user_id == user.id)
+            delete_todos(db, Todo.date == date, Todo.user_id == user.id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    try:
-        db.execute(stmt)
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
+        return {}
 
-    return {}
+    return await run_db(db, run)
 
 
-@router.get(GET_TODOS_ORDER_ROUTE_BY_DATE, response_model=TodoOrderSchema)
-def get_todo_orders(
+@router.get(
+    GET_TODOS_ORDER_ROUTE_BY_DATE,
+    response_model=TodoOrderSchema,
+    dependencies=[query_budget(6)],
+)
+async def get_todo_orders(
     date: date,
+    request: Request,
+    response: Response,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    todo_order = (
-        db.query(TodoOrder)
-        .filter(TodoOrder.date == date, TodoOrder.user_id == user.id)
-        .first()
-    )
+    def run(db: Session):
+        etag = make_etag("order", todos_by_date_fingerprint(db, user.id, date))
+        if is_not_modified(request, etag):
+            return None, etag
+
+        orders = day_order(db, user.id, date)
+        if date > datetime.date.today():
+            orders += [todo.id for todo in project_planned_todos(db, user.id, date)]
+        return TodoOrderSchema(orders=orders), etag
 
-    if todo_order is None:
-        todos = db.query(Todo).filter(Todo.date == date, Todo.user_id == user.id).all()
-        return TodoOrderSchema(orders=[todo.id for todo in todos])
-    else:
-        return TodoOrderSchema(orders=[int(id) for id in todo_order.order.split(",")])
+    orders, etag = await run_db(db, run)
+    if orders is None:
+        return not_modified(etag)
 
+    response.headers["ETag"] = etag
+    return orders
 
-@router.put(UPDATE_TODOS_ORDER_ROUTE, response_model=TodoOrderSchema)
-def update_todo_orders(
+
+@router.put(
+    UPDATE_TODOS_ORDER_ROUTE,
+    response_model=TodoOrderSchema,
+    dependencies=[query_budget(4)],
+)
+async def update_todo_orders(
     date: date,
     orderSchema: TodoOrderSchema,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    todo_order = (
-        db.query(TodoOrder)
-        .filter(TodoOrder.date == date, TodoOrder.user_id == user.id)
-        .first()
-    )
-
-    if todo_order is None:
-        todo_order = TodoOrder.Create(user, date, orderSchema.orders)
-        db.add(todo_order)
-    else:
-        todo_order.Update(orderSchema.orders)
+    def run(db: Session):
+        # only the todos of the user at that date are ranked, the ones
+        # missing from the order keep their relative order at the end
+        rank_day(db, user.id, date, orderSchema.orders)
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_INTERNAL_SERVER_ERROR_500,
+                detail=str(e),
+            )
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_INTERNAL_SERVER_ERROR_500,
-            detail=str(e),
-        )
+        return orderSchema
 
-    return orderSchema
+    return await run_db(db, run)
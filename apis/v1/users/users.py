@@ -2,7 +2,7 @@ from fastapi import Depends, HTTPException, APIRouter
 from sqlalchemy.orm import Session
 from data.response_constant import *
 from models import *
-from utils.database.database import get_db
+from utils.database.database import DbSession, get_db, run_db
 from config import get_config, Configure
 
 from .token_schema import Role
@@ -34,11 +34,14 @@ def get_user(
     response_model=UserInfoSchema,
     status_code=HTTP_CREATED_201,
 )
-def register_user(
+async def register_user(
     user_info: RegisterUserSchema,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> UserInfoSchema:
-    existedUser = db.query(User).filter(User.username == user_info.username).first()
+    def find(db: Session):
+        return db.query(User).filter(User.username == user_info.username).first()
+
+    existedUser = await run_db(db, find)
 
     if existedUser is not None:
         raise HTTPException(
@@ -46,26 +49,31 @@ def register_user(
             detail={"message": "Username is already taken"},
         )
 
-    returned_user = User(
-        username=user_info.username,
-        hashed_password=get_password_hash(user_info.password),
-    )
+    hashed_password = await get_password_hash_async(user_info.password)
+
+    def create(db: Session):
+        returned_user = User(
+            username=user_info.username,
+            hashed_password=hashed_password,
+        )
 
-    profile = Profile(user=returned_user)
+        profile = Profile(user=returned_user)
 
-    db.add(returned_user)
-    db.add(profile)
+        db.add(returned_user)
+        db.add(profile)
 
-    try:
-        db.commit()
-        db.refresh(returned_user)
-        return returned_user
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_BAD_REQUEST_400,
-            detail={"message": e},
-        )
+        try:
+            db.commit()
+            db.refresh(returned_user)
+            return returned_user
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_BAD_REQUEST_400,
+                detail={"message": e},
+            )
+
+    return await run_db(db, create)
 
 
 @router.get(
@@ -73,11 +81,14 @@ def register_user(
     response_model=UserInfoSchema,
     status_code=HTTP_OK_200,
 )
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> UserInfoSchema:
-    user = db.query(User).filter(User.id == user_id).first()
+    def run(db: Session):
+        return db.query(User).filter(User.id == user_id).first()
+
+    user = await run_db(db, run)
 
     if user is None:
         raise HTTPException(
@@ -92,12 +103,15 @@ def get_user(
     response_model=TokenSchema,
     status_code=HTTP_OK_200,
 )
-def login(
+async def login(
     userInfo: RegisterUserSchema,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     config: Configure = Depends(get_config),
 ):
-    user = db.query(User).where(User.username == userInfo.username).first()
+    def find(db: Session):
+        return db.query(User).where(User.username == userInfo.username).first()
+
+    user = await run_db(db, find)
 
     if user is None:
         raise HTTPException(
@@ -105,15 +119,32 @@ def login(
             detail={"message": "User not found"},
         )
 
-    if not verify_password(userInfo.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(
+        userInfo.password, user.hashed_password
+    )
+
+    if not valid:
         raise HTTPException(
             status_code=HTTP_UNAUTHORIZED_401,
             detail={"message": "Incorrect password"},
         )
 
+    # the hash is below the current policy, upgrade it while we have the password
+    if new_hash is not None:
+
+        def upgrade(db: Session):
+            user.hashed_password = new_hash
+
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+
+        await run_db(db, upgrade)
+
     access_token_expires = timedelta(minutes=config.Get("expiresMinutes", 15))
     access_token = create_access_token(
-        data={"username": user.username, "role": user.role},
+        data={"sub": str(user.id), "username": user.username, "role": user.role},
         expires_delta=access_token_expires,
     )
 
@@ -144,9 +175,9 @@ def get_expires_token(userInfo: RegisterUserSchema):
     response_model=UserInfoSchema,
     status_code=HTTP_CREATED_201,
 )
-def register_admin_user(
+async def register_admin_user(
     userInfo: RegisterUserSchema,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     config: Configure = Depends(get_config),
 ):
     if not config.IsOverriden():
@@ -155,21 +186,26 @@ def register_admin_user(
             detail={"message": "Cannot use this route in production mode"},
         )
 
-    returned_user = User(
-        username=userInfo.username,
-        hashed_password=get_password_hash(userInfo.password),
-        role=Role.admin,
-    )
+    hashed_password = await get_password_hash_async(userInfo.password)
 
-    db.add(returned_user)
-
-    try:
-        db.commit()
-        db.refresh(returned_user)
-        return returned_user
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=HTTP_BAD_REQUEST_400,
-            detail={"message": e},
+    def create(db: Session):
+        returned_user = User(
+            username=userInfo.username,
+            hashed_password=hashed_password,
+            role=Role.admin,
         )
+
+        db.add(returned_user)
+
+        try:
+            db.commit()
+            db.refresh(returned_user)
+            return returned_user
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=HTTP_BAD_REQUEST_400,
+                detail={"message": e},
+            )
+
+    return await run_db(db, create)
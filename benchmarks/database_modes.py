@@ -0,0 +1,152 @@
+"""
+Compare the sync (threadpool) and async (aiosqlite) database modes.
+
+Usage:
+    python -m benchmarks.database_modes --clients 500 --requests 4
+
+Every client reads its todos of the day and its remaining
+todos `--requests` times. Both modes run against the same throwaway sqlite
+file, in process through httpx's ASGI transport, so the numbers show the
+cost of the 40-thread limiter against event-loop bound concurrency.
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import datetime
+import tempfile
+
+from config import initialize_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--dev",
+    "-D",
+    action="store_true",
+    help="Run in development mode",
+)
+parser.add_argument("--clients", "-c", type=int, default=500)
+parser.add_argument("--requests", "-n", type=int, default=4)
+parser.add_argument("--users", "-u", type=int, default=20)
+args = parser.parse_args()
+initialize_config(args.dev)
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models import *
+from routes import *
+from utils.database.database import Base, get_db, to_async_url
+from utils.authen.token_handler import create_access_token, token_cache
+import apis.v1.todos.todos as todos
+
+dbFile = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+dbURL = f"sqlite:///{dbFile}"
+
+engine = create_engine(dbURL)
+SyncSession = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+async_engine = create_async_engine(to_async_url(dbURL))
+AsyncSession = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_benchmark_sync_db():
+    db = SyncSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_benchmark_async_db():
+    async with AsyncSession() as db:
+        yield db
+
+
+tokens: list = []
+
+
+def seed() -> None:
+    Base.metadata.create_all(bind=engine)
+    today = datetime.date.today()
+
+    db = SyncSession()
+    for index in range(args.users):
+        user = User(username=f"user{index}", hashed_password="")
+        db.add(user)
+        db.flush()
+        tokens.append(
+            create_access_token(
+                data={"sub": str(user.id), "username": user.username},
+                expires_delta=datetime.timedelta(hours=1),
+            )
+        )
+
+        for day in range(-3, 4):
+            for number in range(5):
+                db.add(
+                    Todo(
+                        user_id=user.id,
+                        title=f"todo {number}",
+                        description="benchmark",
+                        date=today + datetime.timedelta(days=day),
+                    )
+                )
+    db.commit()
+    db.close()
+
+
+async def client(http: httpx.AsyncClient, index: int, latencies: list) -> None:
+    headers = {"Authorization": f"Bearer {tokens[index % args.users]}"}
+    today = datetime.date.today()
+
+    for _ in range(args.requests):
+        for route in (
+            GET_TODOS_BY_DATE_ROUTE.format(date=today),
+            GET_REMAIN_TODOS_ROUTE,
+        ):
+            startedAt = time.perf_counter()
+            response = await http.get(f"{TODO_BASE_ROUTE}{route}", headers=headers)
+            latencies.append(time.perf_counter() - startedAt)
+            assert response.status_code == 200, response.text
+
+
+async def run(mode: str, dependency) -> None:
+    app = FastAPI()
+    app.include_router(todos.router)
+    app.dependency_overrides[get_db] = dependency
+
+    latencies: list = []
+    token_cache.Clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", timeout=None
+    ) as http:
+        startedAt = time.perf_counter()
+        await asyncio.gather(
+            *(client(http, index, latencies) for index in range(args.clients))
+        )
+        elapsed = time.perf_counter() - startedAt
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(
+        f"{mode:>6} {len(latencies):>9} {elapsed:>8.2f}s "
+        f"{len(latencies) / elapsed:>9.1f} {p50:>9.1f} {p99:>9.1f}"
+    )
+
+
+if __name__ == "__main__":
+    seed()
+    print(
+        f"{'mode':>6} {'requests':>9} {'elapsed':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}"
+    )
+    asyncio.run(run("sync", get_benchmark_sync_db))
+    asyncio.run(run("async", get_benchmark_async_db))
+    os.remove(dbFile)
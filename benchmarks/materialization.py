@@ -0,0 +1,137 @@
+"""
+Cost of counting the already created todos of the planned todos of a user
+for one date, against the length of their history.
+
+Usage:
+    python -m benchmarks.materialization --planned 10 --repeat 50
+
+For 1 and 3 years of daily history, `legacy` loads the whole
+`todo_created` relationship of every planned todo and counts in Python
+(what `NeedCreated` used to do), `aggregate` is the single indexed query of
+`created_slots`. Each repetition uses a fresh session so nothing is
+served from the identity map.
+"""
+
+import os
+import time
+import argparse
+import datetime
+import tempfile
+
+from config import initialize_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--dev",
+    "-D",
+    action="store_true",
+    help="Run in development mode",
+)
+parser.add_argument("--planned", "-p", type=int, default=10)
+parser.add_argument("--repeat", "-n", type=int, default=50)
+args = parser.parse_args()
+initialize_config(args.dev)
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from models import *
+from utils.database.database import Base
+from apis.v1.todos.materialization import created_slots
+
+
+def seed(Session, years: int) -> int:
+    today = datetime.date.today()
+    days = 365 * years
+    startedAt = datetime.datetime.combine(
+        today - datetime.timedelta(days=days), datetime.time()
+    )
+
+    db = Session()
+    user = User(username="benchmark", hashed_password="")
+    db.add(user)
+    db.flush()
+
+    for number in range(args.planned):
+        planned_todo = PlannedTodo(
+            user_id=user.id,
+            title=f"planned {number}",
+            weekdays="Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+            gapWeek=1,
+            numTodos=1,
+            created_at=startedAt,
+        )
+        db.add(planned_todo)
+        db.flush()
+
+        dates = [today - datetime.timedelta(days=day) for day in range(1, days + 1)]
+        todo_ids = db.scalars(
+            insert(Todo).returning(Todo.id, sort_by_parameter_order=True),
+            [
+                {"user_id": user.id, "title": planned_todo.title, "date": date}
+                for date in dates
+            ],
+        ).all()
+        db.execute(
+            insert(PlannedTodoCreated),
+            [
+                {"todo_id": todo_id, "planned_todo_id": planned_todo.id, "date": date}
+                for todo_id, date in zip(todo_ids, dates)
+            ],
+        )
+
+    db.commit()
+    db.close()
+    return user.id
+
+
+def legacy(db, user_id: int, date: datetime.date) -> dict:
+    planned_todos = db.scalars(
+        select(PlannedTodo).where(PlannedTodo.user_id == user_id)
+    ).all()
+    return {
+        planned_todo.id: len(
+            [created for created in planned_todo.todo_created if created.date == date]
+        )
+        for planned_todo in planned_todos
+    }
+
+
+def aggregate(db, user_id: int, date: datetime.date) -> dict:
+    planned_todo_ids = db.scalars(
+        select(PlannedTodo.id).where(PlannedTodo.user_id == user_id)
+    ).all()
+    created = created_slots(db, planned_todo_ids, date)
+    return {
+        planned_todo_id: len(slots) for (planned_todo_id, _), slots in created.items()
+    }
+
+
+def measure(Session, fn, user_id: int) -> float:
+    today = datetime.date.today()
+    startedAt = time.perf_counter()
+    for _ in range(args.repeat):
+        db = Session()
+        fn(db, user_id, today)
+        db.close()
+    return (time.perf_counter() - startedAt) / args.repeat * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'history':>8} {'rows':>8} {'legacy ms':>10} {'aggregate ms':>13}")
+
+    for years in (1, 3):
+        dbFile = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+        engine = create_engine(f"sqlite:///{dbFile}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        user_id = seed(Session, years)
+        print(
+            f"{years:>7}y {365 * years * args.planned:>8} "
+            f"{measure(Session, legacy, user_id):>10.2f} "
+            f"{measure(Session, aggregate, user_id):>13.2f}"
+        )
+
+        engine.dispose()
+        os.remove(dbFile)
@@ -0,0 +1,68 @@
+"""
+Measure the bcrypt throughput of this machine for a set of work factors.
+
+Usage:
+    python -m benchmarks.password_hashing --rounds 10 11 12 13 --seconds 3
+
+Each cost is hashed on a single thread, so the reported rate is the number
+of hashes (or login verifications) one core can do per second. Multiply it
+by the `passwordWorkers` setting to get the login capacity of a worker.
+"""
+
+import os
+import time
+import argparse
+
+from config import initialize_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--dev",
+    "-D",
+    action="store_true",
+    help="Run in development mode",
+)
+parser.add_argument(
+    "--rounds",
+    "-r",
+    type=int,
+    nargs="+",
+    default=[10, 11, 12, 13, 14],
+    help="bcrypt work factors to measure",
+)
+parser.add_argument(
+    "--seconds",
+    "-s",
+    type=float,
+    default=2.0,
+    help="Minimum measuring time per work factor",
+)
+args = parser.parse_args()
+initialize_config(args.dev)
+
+from utils.authen.token_handler import build_password_context
+
+
+def measure(rounds: int, seconds: float) -> float:
+    context = build_password_context(["bcrypt"], rounds)
+    context.hash("warm-up")
+
+    count = 0
+    startedAt = time.perf_counter()
+    while True:
+        context.hash("benchmark-password")
+        count += 1
+        elapsed = time.perf_counter() - startedAt
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    print(
+        f"{'rounds':>6} {'ms/hash':>10} {'hashes/s/core':>14} {f'hashes/s x{cores}':>14}"
+    )
+
+    for rounds in args.rounds:
+        rate = measure(rounds, args.seconds)
+        print(f"{rounds:>6} {1000 / rate:>10.1f} {rate:>14.2f} {rate * cores:>14.2f}")
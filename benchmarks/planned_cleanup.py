@@ -0,0 +1,117 @@
+"""
+Cost of deleting the upcoming todos of a planned todo when it is updated.
+
+Usage:
+    python -m benchmarks.planned_cleanup --occurrences 1000
+
+`legacy` walks `todo_created` and deletes every todo and slot through the
+ORM (what update_planned_todo used to do), `bulk` is `delete_occurrences`.
+Both start from the same freshly seeded database.
+"""
+
+import os
+import time
+import argparse
+import datetime
+import tempfile
+
+from config import initialize_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--dev",
+    "-D",
+    action="store_true",
+    help="Run in development mode",
+)
+parser.add_argument("--occurrences", "-o", type=int, default=1000)
+args = parser.parse_args()
+initialize_config(args.dev)
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from models import *
+from utils.database.database import Base
+from apis.v1.todos.materialization import delete_occurrences
+
+
+def seed(Session) -> int:
+    today = datetime.date.today()
+    dates = [today + datetime.timedelta(days=day) for day in range(args.occurrences)]
+
+    db = Session()
+    planned_todo = PlannedTodo(
+        user_id=1,
+        title="planned",
+        weekdays="Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+        gapWeek=1,
+        numTodos=1,
+    )
+    db.add(planned_todo)
+    db.flush()
+
+    todo_ids = db.scalars(
+        insert(Todo).returning(Todo.id, sort_by_parameter_order=True),
+        [{"user_id": 1, "title": "planned", "date": date} for date in dates],
+    ).all()
+    db.execute(
+        insert(PlannedTodoCreated),
+        [
+            {"todo_id": todo_id, "planned_todo_id": planned_todo.id, "date": date}
+            for todo_id, date in zip(todo_ids, dates)
+        ],
+    )
+    db.commit()
+    db.close()
+    return planned_todo.id
+
+
+def legacy(db, planned_todo_id: int) -> None:
+    planned_todo = db.get(PlannedTodo, planned_todo_id)
+    for todo_created in planned_todo.todo_created:
+        if todo_created.date >= datetime.date.today():
+            db.delete(todo_created.todo)
+            db.delete(todo_created)
+
+
+def bulk(db, planned_todo_id: int) -> None:
+    delete_occurrences(
+        db, planned_todo_id, after=datetime.date.today() - datetime.timedelta(days=1)
+    )
+
+
+def measure(fn) -> tuple:
+    dbFile = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    engine = create_engine(f"sqlite:///{dbFile}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    planned_todo_id = seed(Session)
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *rest: statements.append(statement),
+    )
+
+    db = Session()
+    startedAt = time.perf_counter()
+    fn(db, planned_todo_id)
+    db.commit()
+    elapsed = time.perf_counter() - startedAt
+    numStatements = len(statements)
+    remaining = db.query(Todo).count()
+    db.close()
+
+    engine.dispose()
+    os.remove(dbFile)
+    return elapsed * 1000, numStatements, remaining
+
+
+if __name__ == "__main__":
+    print(f"{'mode':>7} {'ms':>9} {'statements':>11} {'remaining':>10}")
+
+    for name, fn in (("legacy", legacy), ("bulk", bulk)):
+        elapsed, statements, remaining = measure(fn)
+        print(f"{name:>7} {elapsed:>9.1f} {statements:>11} {remaining:>10}")
@@ -0,0 +1,85 @@
+"""
+Footprint of idle change stream connections and cost of a fan-out.
+
+Usage:
+    python -m benchmarks.stream_connections --connections 10000
+
+Every connection is what the stream route keeps alive: a subscription of
+the hub and a task waiting on its queue (the socket buffers of the server
+come on top). The connections are spread over `--users` users, then one
+event is published to every user from another thread, as the routes do
+after their commits.
+"""
+
+import time
+import asyncio
+import argparse
+import threading
+import tracemalloc
+
+from config import initialize_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--dev",
+    "-D",
+    action="store_true",
+    help="Run in development mode",
+)
+parser.add_argument("--connections", "-c", type=int, default=10000)
+parser.add_argument("--users", "-u", type=int, default=5000)
+args = parser.parse_args()
+initialize_config(args.dev)
+
+from apis.v1.todos.change_hub import ChangeHub
+
+
+async def main() -> None:
+    hub = ChangeHub(maxConnections=args.connections)
+    received = 0
+    done = asyncio.Event()
+
+    async def connection(subscription) -> None:
+        nonlocal received
+        await subscription.Get()
+        received += 1
+        if received == args.connections:
+            done.set()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    tasks = [
+        asyncio.create_task(connection(hub.Subscribe(connection_id % args.users)))
+        for connection_id in range(args.connections)
+    ]
+    await asyncio.sleep(0)
+
+    idle = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    startedAt = time.perf_counter()
+    publisher = threading.Thread(
+        target=lambda: [
+            hub.Publish(user_id, {"event": "changes", "cursor": 1})
+            for user_id in range(args.users)
+        ]
+    )
+    publisher.start()
+    await done.wait()
+    elapsed = time.perf_counter() - startedAt
+    publisher.join()
+
+    await asyncio.gather(*tasks)
+
+    print(
+        f"{args.connections} idle connections: {idle / 1024 / 1024:.1f} MiB "
+        f"({idle / args.connections:.0f} B each)"
+    )
+    print(
+        f"fan-out to {args.users} users: {elapsed * 1000:.1f} ms "
+        f"({hub.Metrics()['published']} events published)"
+    )
+
+
+asyncio.run(main())
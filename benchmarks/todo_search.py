@@ -0,0 +1,138 @@
+"""
+Latency of searching the todos of one user among many.
+
+Usage:
+    python -m benchmarks.todo_search --todos 1000000 --users 100
+
+`like` is a LIKE scan of the titles and descriptions of the user, `fts` is
+`search_todos` over the FTS5 table kept by the triggers. Each query runs
+`--repeat` times against the same seeded database, the median is printed.
+"""
+
+import os
+import time
+import random
+import itertools
+import argparse
+import datetime
+import tempfile
+import statistics
+
+from config import initialize_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--dev",
+    "-D",
+    action="store_true",
+    help="Run in development mode",
+)
+parser.add_argument("--todos", "-t", type=int, default=1000000)
+parser.add_argument("--users", "-u", type=int, default=100)
+parser.add_argument("--repeat", "-r", type=int, default=20)
+args = parser.parse_args()
+initialize_config(args.dev)
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+from models import *
+from utils.database.migrations import upgrade_schema
+from apis.v1.todos.search import search_todos
+
+WORDS = (
+    "buy milk bread coffee call dentist mom report review email meeting "
+    "laundry gym run read book pay rent bills plan trip clean kitchen fix "
+    "bike water plants write notes prepare slides book flight renew passport"
+).split()
+
+# the words of the todos follow a zipf-like law over WORDS then generated
+# words, so that a query can match many rows ("milk") or a few ("zy*")
+QUERIES = ("milk", "dentist report", "passport", "zy*", "bike zy*")
+
+
+def vocabulary(rng: random.Random) -> tuple:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    generated = {
+        "".join(rng.choices(letters, k=rng.randrange(4, 9))) for _ in range(20000)
+    }
+    words = WORDS + sorted(generated)
+    weights = itertools.accumulate(1 / (rank + 1) for rank in range(len(words)))
+    return words, list(weights)
+
+
+def seed(Session) -> None:
+    rng = random.Random(0)
+    today = datetime.date.today()
+    words, weights = vocabulary(rng)
+
+    db = Session()
+    for start in range(0, args.todos, 50000):
+        db.execute(
+            insert(Todo),
+            [
+                {
+                    "user_id": rng.randrange(args.users) + 1,
+                    "title": " ".join(rng.choices(words, cum_weights=weights, k=3)),
+                    "description": " ".join(
+                        rng.choices(words, cum_weights=weights, k=12)
+                    ),
+                    "date": today - datetime.timedelta(days=rng.randrange(365)),
+                }
+                for _ in range(start, min(start + 50000, args.todos))
+            ],
+        )
+    db.commit()
+    db.close()
+
+
+def like(db, user_id: int, q: str) -> list:
+    words = [word.rstrip("*") for word in q.split()]
+    return (
+        db.query(Todo.id)
+        .filter(
+            Todo.user_id == user_id,
+            *[
+                or_(Todo.title.like(f"%{word}%"), Todo.description.like(f"%{word}%"))
+                for word in words
+            ],
+        )
+        .limit(20)
+        .all()
+    )
+
+
+def fts(db, user_id: int, q: str) -> list:
+    return search_todos(db, user_id, q, 20)
+
+
+def measure(Session, fn, q: str) -> float:
+    db = Session()
+    elapsed = []
+    for index in range(args.repeat):
+        startedAt = time.perf_counter()
+        fn(db, index % args.users + 1, q)
+        elapsed.append(time.perf_counter() - startedAt)
+    db.close()
+    return statistics.median(elapsed) * 1000
+
+
+if __name__ == "__main__":
+    dbFile = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    engine = create_engine(f"sqlite:///{dbFile}")
+    upgrade_schema(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    startedAt = time.perf_counter()
+    seed(Session)
+    print(f"seeded {args.todos} todos in {time.perf_counter() - startedAt:.1f} s")
+
+    print(f"{'query':>16} {'like ms':>9} {'fts ms':>9}")
+    for q in QUERIES:
+        print(
+            f"{q:>16} {measure(Session, like, q):>9.2f} "
+            f"{measure(Session, fts, q):>9.2f}"
+        )
+
+    engine.dispose()
+    os.remove(dbFile)
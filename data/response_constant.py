@@ -7,5 +7,8 @@ HTTP_UNAUTHORIZED_401 = 401
 HTTP_FORBIDDEN_403 = 403
 HTTP_NOT_FOUND_404 = 404
 HTTP_CONFLICT_409 = 409
+HTTP_UNPROCESSABLE_ENTITY_422 = 422
 
 HTTP_INTERNAL_SERVER_ERROR_500 = 500
+HTTP_NOT_IMPLEMENTED_501 = 501
+HTTP_SERVICE_UNAVAILABLE_503 = 503
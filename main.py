@@ -14,14 +14,39 @@ parser.add_argument(
 args = parser.parse_args()
 initialize_config(args.dev)
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
+from utils.database.database import SessionLocal, engine
+from utils.database.migrations import upgrade_schema
+from utils.database.sql_metrics import SqlMetricsMiddleware
+from apis.v1.todos.materialization_scheduler import MaterializationScheduler
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    upgrade_schema(engine)
+
+    scheduler = MaterializationScheduler(
+        SessionLocal,
+        horizonDays=config.Get("materializeHorizonDays", 0),
+        intervalSeconds=config.Get("materializeIntervalSeconds", 3600),
+        batchSize=config.Get("materializeBatchSize", 200),
+    )
+    if config.Get("materializeInBackground", True):
+        scheduler.Start()
+
+    yield
+
+    scheduler.Stop()
+
+
+app = FastAPI(lifespan=lifespan)
 # app.mount("/", StaticFiles(directory="publics"), name="static")
 # app.mount("/static", StaticFiles(directory="publics/statics"), name="static")
 
+app.add_middleware(SqlMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=config.Get("allow_origins", []),
@@ -45,10 +70,12 @@ app.add_middleware(
 import apis.v1.users.users as auth
 import apis.v1.profile.profile as profile
 import apis.v1.todos.todos as todos
+import apis.v1.metrics.metrics as metrics
 
 app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(todos.router)
+app.include_router(metrics.router)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
 from .profile_model import *
 from .user_model import *
 from .todo_model import *
+from .tombstone_model import *
+from .daily_summary_model import *
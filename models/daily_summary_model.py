@@ -0,0 +1,21 @@
+from utils.database.database import Base
+from sqlalchemy import Column, Date, Integer
+
+
+class DailySummary(Base):
+    """
+    Number of todos and of completed todos of a user at a date, kept up to
+        date by triggers on the todos (see summary.py).
+    """
+
+    __tablename__ = "daily_summary"
+
+    user_id = Column(Integer, primary_key=True)
+    date = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<DailySummary {self.user_id} {self.date} {self.completed}/{self.total} />"
+        )
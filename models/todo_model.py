@@ -1,21 +1,34 @@
 import datetime
-from typing import List, Optional
+from typing import List, Optional, Set
 from utils.database.database import Base
-from sqlalchemy import Column, ForeignKey, Integer, String, Boolean, Date, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Boolean,
+    Date,
+    DateTime,
+)
+from sqlalchemy.orm import relationship, validates
 from apis.v1.todos.todo_schema import TodoSchema
 from apis.v1.todos.planned_todo_schema import PlannedTodoSchema
 
 from utils.date.date_utils import *
+from utils.date.recurrence import RecurrenceRule, parse_weekdays
 
 from .user_model import User
 
 
 class PlannedTodo(Base):
     __tablename__ = "plannedTodos"
+    __table_args__ = (
+        Index("ix_plannedTodos_user_id_change_seq", "user_id", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     title = Column(String(100))
     description = Column(String(1000), nullable=True)
     weekdays = Column(
@@ -23,12 +36,16 @@ class PlannedTodo(Base):
     )  # "Mon,Wed,Fri,Sat,Sun" means every Mon, Wed, Fri, Sat, Sun,
     # "Mon,Wed" means every Mon, Wed. Only "Mon", "Tue", "Wed",
     # #"Thu", "Fri", "Sat", "Sun" are valid.
+    weekdayMask = Column(
+        Integer, nullable=False, default=0, index=True
+    )  # bit i is set when weekday i (0 is Monday) is in weekdays, kept in sync
     gapWeek = Column(
         Integer, default=1
     )  # gapWeek = 1 means every week; gapWeek = 2 means every 2 weeks
     numTodos = Column(Integer, default=1)
     created_at = Column(DateTime, default=datetime.datetime.now)
     last_updated = Column(DateTime, default=datetime.datetime.now)
+    change_seq = Column(Integer, nullable=False, default=0)  # see changes.py
 
     user = relationship("User", back_populates="plannedTodos", uselist=False)
     todo_created = relationship(
@@ -56,26 +73,43 @@ class PlannedTodo(Base):
         self.numTodos = planned_todo.numTodos
         self.last_updated = datetime.datetime.now()
 
-    def NeedCreated(self, date: datetime.date) -> int:
-        checkGapWeek = CheckNumberGapWeek(self.created_at.date(), date)
-
-        if checkGapWeek < 0:
-            return 0
-
-        if checkGapWeek % self.gapWeek != 0:
-            return 0
-
-        if date.strftime("%a") not in self.weekdays:
-            return 0
-
-        num_date_created_todos = len(
-            [todo for todo in self.todo_created if todo.date == date]
-        )
-
-        if num_date_created_todos >= self.numTodos:
-            return 0
-
-        return self.numTodos - num_date_created_todos
+    @validates("weekdays")
+    def _SyncWeekdayMask(self, key: str, weekdays: Optional[str]) -> Optional[str]:
+        self.weekdayMask = parse_weekdays(weekdays)
+        return weekdays
+
+    def Recurrence(self) -> RecurrenceRule:
+        """
+        The compiled schedule of this planned todo, rebuilt only when its
+            start, weekdays or gap week change.
+        """
+        start = self.created_at.date()
+        rule: Optional[RecurrenceRule] = getattr(self, "_recurrence", None)
+
+        if (
+            rule is None
+            or rule.start != start
+            or rule.gapWeek != max(1, self.gapWeek or 1)
+            or rule.weekdayMask != self.weekdayMask
+        ):
+            rule = RecurrenceRule(start, self.weekdayMask, self.gapWeek)
+            self._recurrence = rule
+
+        return rule
+
+    def Occurs(self, date: datetime.date) -> bool:
+        return self.Recurrence().FiresOn(date)
+
+    def NeedCreated(self, date: datetime.date, createdSlots: Set[int]) -> List[int]:
+        """
+        Slots which still have to be created at the date, given the slots
+            already created from this planned todo at that date (see
+            `created_slots`).
+        """
+        if not self.Occurs(date):
+            return []
+
+        return [slot for slot in range(self.numTodos) if slot not in createdSlots]
 
     def __repr__(self):
         return f"<PlannedTodo {self.title} />"
@@ -83,11 +117,23 @@ class PlannedTodo(Base):
 
 class PlannedTodoCreated(Base):
     __tablename__ = "plannedTodo_created"
+    __table_args__ = (
+        Index(
+            "ux_plannedTodo_created_planned_todo_id_date_slot",
+            "planned_todo_id",
+            "date",
+            "slot",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    todo_id = Column(Integer, ForeignKey("todos.id"))
+    todo_id = Column(
+        Integer, ForeignKey("todos.id"), index=True
+    )  # None once the todo is deleted, see unlink_occurrences
     planned_todo_id = Column(Integer, ForeignKey("plannedTodos.id"))
     date = Column(Date, default=datetime.datetime.now)
+    slot = Column(Integer, nullable=False, default=0)  # n-th todo of the date
 
     plannedTodo = relationship(
         "PlannedTodo",
@@ -98,20 +144,26 @@ class PlannedTodoCreated(Base):
 
     @staticmethod
     def Create(
-        plannedTodo: PlannedTodo, todo: "Todo", date: datetime.date
+        plannedTodo: PlannedTodo, todo: "Todo", date: datetime.date, slot: int = 0
     ) -> "PlannedTodoCreated":
         return PlannedTodoCreated(
             date=date,
+            slot=slot,
             todo=todo,
             plannedTodo=plannedTodo,
         )
 
     def __repr__(self):
-        return f"<PlannedTodoCreated {self.planned_todo_id} date={self.date} />"
+        return f"<PlannedTodoCreated {self.planned_todo_id} date={self.date} slot={self.slot} />"
 
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_user_id_date_rank", "user_id", "date", "rank"),
+        Index("ix_todos_user_id_completed_date", "user_id", "completed", "date"),
+        Index("ix_todos_user_id_change_seq", "user_id", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -122,6 +174,10 @@ class Todo(Base):
     created_at = Column(DateTime, default=datetime.datetime.now)
     last_updated = Column(DateTime, default=datetime.datetime.now)
     completed_at = Column(DateTime, nullable=True)
+    rank = Column(
+        Integer, nullable=False, default=0
+    )  # position in the day, lowest first, see ranking.py
+    change_seq = Column(Integer, nullable=False, default=0)  # see changes.py
 
     user = relationship("User", back_populates="todos", uselist=False)
     created_todo = relationship(
@@ -152,32 +208,12 @@ class Todo(Base):
     def Complete(self):
         self.completed = True
         self.completed_at = datetime.datetime.now()
+        self.last_updated = self.completed_at
 
     def Uncomplete(self):
         self.completed = False
         self.completed_at = None
+        self.last_updated = datetime.datetime.now()
 
     def __repr__(self):
         return f"<Todo {self.title} due={self.date} />"
-
-
-class TodoOrder(Base):
-    __tablename__ = "todo_orders"
-
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    date = Column(Date, default=datetime.datetime.now)
-    order = Column(String(1000), nullable=False)
-
-    user = relationship("User", back_populates="todo_orders", uselist=False)
-
-    @staticmethod
-    def Create(user: User, date: datetime.date, order: List[int]) -> "TodoOrder":
-        orderStr = ",".join([str(id) for id in order])
-        return TodoOrder(date=date, order=orderStr, user=user)
-
-    def Update(self, order: List[int]):
-        self.order = ",".join([str(id) for id in order])
-
-    def __repr__(self):
-        return f"<TodoOrder {self.date} order={self.order} />"
@@ -0,0 +1,25 @@
+import datetime
+from utils.database.database import Base
+from sqlalchemy import Column, Index, Integer, String, DateTime
+
+
+class Tombstone(Base):
+    """
+    Record of a deleted todo or planned todo, read back by the clients
+        which sync through the changes route (see changes.py).
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_id_change_seq", "user_id", "change_seq"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    kind = Column(String(20), nullable=False)  # "todo" or "plannedTodo"
+    entity_id = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.datetime.now)
+
+    def __repr__(self):
+        return f"<Tombstone {self.kind} {self.entity_id} seq={self.change_seq} />"
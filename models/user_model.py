@@ -15,8 +15,10 @@ class User(Base):
 
     created_at = Column(DateTime, default=datetime.datetime.now)
     last_updated = Column(DateTime, default=datetime.datetime.now)
+    change_seq = Column(
+        Integer, nullable=False, default=0
+    )  # latest change sequence of the user's todos, see changes.py
 
     profile = relationship("Profile", back_populates="user", uselist=False)
     todos = relationship("Todo", back_populates="user")
     plannedTodos = relationship("PlannedTodo", back_populates="user", uselist=True)
-    todo_orders = relationship("TodoOrder", back_populates="user", uselist=True)
@@ -2,3 +2,4 @@ from .routes import *
 from .user_routes import *
 from .profile_routes import *
 from .todo_routes import *
+from .metrics_routes import *
@@ -0,0 +1,7 @@
+from .routes import *
+
+METRICS_BASE_ROUTE = f"{BASE_ROUTE}/metrics"
+
+GET_PASSWORD_METRICS_ROUTE = "/password"
+GET_SQL_METRICS_ROUTE = "/sql"
+GET_STREAM_METRICS_ROUTE = "/stream"
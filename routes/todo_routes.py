@@ -3,8 +3,14 @@ from .routes import *
 TODO_BASE_ROUTE = f"{BASE_ROUTE}/todos"
 
 # todo retrieval (both instance of the regular todo is included)
-GET_TODOS_BY_DATE_ROUTE = "/date/{date}"
-GET_REMAIN_TODOS_ROUTE = "/remain"
+GET_TODOS_BY_DATE_ROUTE = "/date/{date}"  # param: ordered, in the order of the day
+GET_REMAIN_TODOS_ROUTE = "/remain"  # params: limit, cursor, stream
+GET_TODOS_BY_RANGE_ROUTE = "/range"  # params: start, end (both included)
+GET_TODO_CHANGES_ROUTE = "/changes"  # param: since, the cursor of the last sync
+STREAM_TODO_CHANGES_ROUTE = "/stream"  # WebSocket (param: token) or SSE
+SEARCH_TODOS_ROUTE = "/search"  # params: q (word* for a prefix), limit
+GET_TODOS_SUMMARY_ROUTE = "/summary"  # param: month, "YYYY-MM"
+RECOMPUTE_TODOS_SUMMARY_ROUTE = "/summary/recompute"  # rebuild from the todos
 
 # todo crud
 GET_TODO_INFO_ROUTE = "/{id}"
@@ -12,7 +18,9 @@ ADD_TODO_ROUTE = "/"
 UPDATE_TODO_ROUTE = "/{id}"  # change the information only, not complete status
 COMPLETE_TODO_ROUTE = "/{id}/complete"
 UNCOMPLETE_TODO_ROUTE = "/{id}/uncomplete"
+MOVE_TODO_ROUTE = "/{id}/move"  # param: after, the todo to follow (first if missing)
 DELETE_TODO_ROUTE = "/{id}"
+BATCH_TODOS_ROUTE = "/batch"  # create, update, complete, uncomplete, delete at once
 
 # planned todos crud, which is automatically created each day
 GET_ALL_PLANNED_TODOS_ROUTE = "/planned"
@@ -29,3 +37,6 @@ CLEAN_TODOS_BY_DATE_ROUTE = "/clean/{date}"
 GET_TODOS_ORDER_ROUTE_BY_DATE = "/order/{date}"  # return ids of todos in order
 
 UPDATE_TODOS_ORDER_ROUTE = "/order/{date}"  # param: order: [id1, id2, ...]
+
+# header holding the cursor of the next page of a paginated list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
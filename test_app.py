@@ -1,5 +1,10 @@
 from utils.database.t_database import override_get_db, engine
 from utils.database.database import get_db
+from utils.database.migrations import upgrade_schema
+from utils.database.sql_metrics import sql_metrics
 from main import app
 
+upgrade_schema(engine)
+sql_metrics.enforceBudgets = True
+
 app.dependency_overrides[get_db] = override_get_db
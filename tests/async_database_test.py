@@ -0,0 +1,99 @@
+import unittest
+import datetime
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from test_app import app
+from utils.database.database import get_db
+from utils.database.t_database import (
+    TessingSessionLocal as SessionLocal,
+    override_get_db,
+    override_get_async_db,
+)
+from models import *
+from routes import *
+from data import *
+
+
+class AsyncDatabaseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app.dependency_overrides[get_db] = override_get_async_db
+        cls.client = TestClient(app, base_url=f"http://test")
+        cls.userInfo = {"username": "test", "password": "test"}
+
+        cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ROUTE}", json=cls.userInfo)
+        cls.token = cls.client.post(
+            f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+            json=cls.userInfo,
+        ).json()["access_token"]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        app.dependency_overrides[get_db] = override_get_db
+
+        db = SessionLocal()
+        db.query(User).delete()
+        db.query(Profile).delete()
+        db.query(Todo).delete()
+        db.query(PlannedTodo).delete()
+        db.query(PlannedTodoCreated).delete()
+        db.commit()
+        db.close()
+
+    def _Headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def test_GivenTheAsyncSession_WhenReadTheProfile_ThenReturnsIt(self):
+        # Act
+        response = self.client.get(
+            f"{PROFLIE_BASE_ROUTE}{GET_PROFILE_ROUTE}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertIsNone(response.json()["email"])
+
+    def test_GivenTheAsyncSession_WhenManageTodos_ThenTheyArePersisted(self):
+        # Arrange
+        today = datetime.datetime.now().date()
+        self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": today.strftime("%a"),
+            },
+            headers=self._Headers(),
+        )
+
+        # Act
+        todo = self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_TODO_ROUTE}",
+            json={"id": 0, "title": "test", "description": "test", "date": f"{today}"},
+            headers=self._Headers(),
+        ).json()
+        completed = self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=todo['id'])}",
+            headers=self._Headers(),
+        )
+        todos = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=today)}",
+            headers=self._Headers(),
+        ).json()
+
+        # Assert
+        self.assertEqual(completed.status_code, HTTP_OK_200)
+        self.assertTrue(completed.json()["completed"])
+        self.assertEqual(
+            sorted(todo["title"] for todo in todos),
+            ["planned", "test"],
+        )
+        self.assertEqual(
+            self.client.get(
+                f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=today + timedelta(days=1))}",
+                headers=self._Headers(),
+            ).json(),
+            [],
+        )
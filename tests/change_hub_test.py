@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import unittest
+from apis.v1.todos.change_hub import *
+
+
+class ChangeHubTest(unittest.IsolatedAsyncioTestCase):
+    async def test_GivenSubscriptionsOfTwoUsers_WhenPublish_ThenOnlyTheUserGetsTheEvent(
+        self,
+    ):
+        # Arrange
+        hub = ChangeHub()
+        first = hub.Subscribe(1)
+        second = hub.Subscribe(1)
+        other = hub.Subscribe(2)
+
+        # Act
+        hub.Publish(1, {"event": "changes", "cursor": 3})
+
+        # Assert
+        self.assertEqual((await first.Get())["cursor"], 3)
+        self.assertEqual((await second.Get())["cursor"], 3)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(other.Get(), 0.05)
+
+    async def test_GivenASlowConnection_WhenItsQueueIsFull_ThenTheOldestEventsAreDropped(
+        self,
+    ):
+        # Arrange
+        hub = ChangeHub(queueSize=2)
+        subscription = hub.Subscribe(1)
+
+        # Act
+        for cursor in range(1, 6):
+            hub.Publish(1, {"event": "changes", "cursor": cursor})
+        await asyncio.sleep(0)
+
+        # Assert
+        self.assertEqual((await subscription.Get())["cursor"], 4)
+        self.assertEqual((await subscription.Get())["cursor"], 5)
+        self.assertEqual(hub.Metrics()["dropped"], 3)
+
+    async def test_GivenAnotherThread_WhenPublish_ThenTheEventReachesTheLoop(self):
+        # Arrange
+        hub = ChangeHub()
+        subscription = hub.Subscribe(1)
+
+        # Act
+        thread = threading.Thread(
+            target=hub.Publish, args=(1, {"event": "changes", "cursor": 1})
+        )
+        thread.start()
+        thread.join()
+
+        # Assert
+        self.assertEqual((await asyncio.wait_for(subscription.Get(), 1))["cursor"], 1)
+
+    async def test_GivenAFullHub_WhenSubscribe_ThenItIsRejected(self):
+        # Arrange
+        hub = ChangeHub(maxConnections=1)
+        subscription = hub.Subscribe(1)
+
+        # Act / Assert
+        with self.assertRaises(ChangeHubFullError):
+            hub.Subscribe(2)
+
+        hub.Unsubscribe(subscription)
+        hub.Subscribe(2)
+        self.assertEqual(hub.Metrics()["rejected"], 1)
+
+    async def test_GivenASubscription_WhenSseEvents_ThenEventsAndKeepalivesAreFormatted(
+        self,
+    ):
+        # Arrange
+        hub = ChangeHub()
+        subscription = hub.Subscribe(1)
+        events = sse_events(subscription, 0.01)
+
+        # Act
+        keepalive = await events.__anext__()
+        hub.Publish(1, {"event": "changes", "cursor": 2})
+        event = await events.__anext__()
+
+        # Assert
+        self.assertEqual(keepalive, ": keepalive\n\n")
+        self.assertEqual(
+            event, 'event: changes\ndata: {"event": "changes", "cursor": 2}\n\n'
+        )
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from todo_test_case import TodoTestCase
+from models import *
+from routes import *
+from data import *
+
+
+class EtagTest(TodoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tomorrow = self.today + timedelta(days=1)
+        self.todo = self._AddTodo("first")
+
+    def _Get(self, route: str, etag: str = None):
+        headers = self._Headers()
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        return self.client.get(f"{TODO_BASE_ROUTE}{route}", headers=headers)
+
+    def _AssertConditional(self, route: str, change) -> None:
+        # Arrange
+        etag = self._Get(route).headers["ETag"]
+
+        # Act
+        unchanged = self._Get(route, etag)
+        change()
+        changed = self._Get(route, etag)
+
+        # Assert
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.content, b"")
+        self.assertEqual(unchanged.headers["ETag"], etag)
+        self.assertEqual(changed.status_code, HTTP_OK_200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    def _Complete(self) -> None:
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=self.todo['id'])}",
+            headers=self._Headers(),
+        )
+
+    def test_GivenAnUnchangedDay_WhenGetItConditionally_ThenNotModifiedUntilATodoIsCompleted(
+        self,
+    ):
+        self._AssertConditional(
+            GET_TODOS_BY_DATE_ROUTE.format(date=self.today), self._Complete
+        )
+
+    def test_GivenAFutureDay_WhenAPlannedTodoIsAdded_ThenItIsModified(self):
+        self._AssertConditional(
+            GET_TODOS_BY_DATE_ROUTE.format(date=self.tomorrow),
+            lambda: self._AddPlannedTodo(self.tomorrow),
+        )
+
+    def test_GivenAFutureDay_WhenAVirtualTodoIsDeleted_ThenItIsModified(self):
+        route = GET_TODOS_BY_DATE_ROUTE.format(date=self.tomorrow)
+        self._AddPlannedTodo(self.tomorrow)
+        (virtual,) = self._Get(route).json()
+
+        self._AssertConditional(
+            route,
+            lambda: self.client.delete(
+                f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=virtual['id'])}",
+                headers=self._Headers(),
+            ),
+        )
+        self.assertEqual(self._Get(route).json(), [])
+
+    def test_GivenUnchangedRemainTodos_WhenGetThemConditionally_ThenNotModifiedUntilATodoIsAdded(
+        self,
+    ):
+        self._AssertConditional(GET_REMAIN_TODOS_ROUTE, lambda: self._AddTodo("second"))
+
+    def test_GivenUnchangedPlannedTodos_WhenGetThemConditionally_ThenNotModifiedUntilOneIsAdded(
+        self,
+    ):
+        self._AssertConditional(
+            GET_ALL_PLANNED_TODOS_ROUTE, lambda: self._AddPlannedTodo(self.tomorrow)
+        )
+
+    def test_GivenAnUnchangedOrder_WhenGetItConditionally_ThenNotModifiedUntilItIsUpdated(
+        self,
+    ):
+        second = self._AddTodo("second")
+
+        self._AssertConditional(
+            GET_TODOS_ORDER_ROUTE_BY_DATE.format(date=self.today),
+            lambda: self.client.put(
+                f"{TODO_BASE_ROUTE}{UPDATE_TODOS_ORDER_ROUTE.format(date=self.today)}",
+                json={"orders": [second["id"], self.todo["id"]]},
+                headers=self._Headers(),
+            ),
+        )
@@ -0,0 +1,220 @@
+import re
+import datetime
+import unittest
+from typing import List
+from sqlalchemy import event, select
+from fastapi.testclient import TestClient
+from test_app import app
+from utils.database.t_database import TessingSessionLocal as SessionLocal, engine
+from models import *
+from utils.date.recurrence import masks_with_weekdays
+from apis.v1.todos.pagination import encode_cursor
+from routes import *
+from data import *
+
+HOT_TABLES = (
+    "todos",
+    "plannedTodo_created",
+    "plannedTodos",
+    "tombstones",
+)
+TABLE_SCAN = re.compile(rf"^SCAN (TABLE )?({'|'.join(HOT_TABLES)})\b")
+
+
+class IndexesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(app, base_url=f"http://test")
+        cls.userInfo = {"username": "test", "password": "test"}
+
+        cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ROUTE}", json=cls.userInfo)
+        cls.token = cls.client.post(
+            f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+            json=cls.userInfo,
+        ).json()["access_token"]
+
+        cls.today = datetime.datetime.now().date()
+        cls.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": cls.today.strftime("%a"),
+            },
+            headers=cls._Headers(),
+        )
+        cls.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "test",
+                "description": "test",
+                "date": f"{cls.today}",
+            },
+            headers=cls._Headers(),
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        db = SessionLocal()
+        db.query(User).delete()
+        db.query(Profile).delete()
+        db.query(Todo).delete()
+        db.query(PlannedTodo).delete()
+        db.query(PlannedTodoCreated).delete()
+        db.query(Tombstone).delete()
+        db.commit()
+        db.close()
+
+    @classmethod
+    def _Headers(cls) -> dict:
+        return {"Authorization": f"Bearer {cls.token}"}
+
+    def _CaptureStatements(self, method: str, route: str, **kwargs) -> List[tuple]:
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany:
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = self.client.request(
+                method,
+                f"{TODO_BASE_ROUTE}{route}",
+                headers=self._Headers(),
+                **kwargs,
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        return statements
+
+    def _AssertUsesIndexes(self, method: str, route: str, **kwargs) -> None:
+        statements = self._CaptureStatements(method, route, **kwargs)
+        checked = 0
+
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                if (
+                    not statement.lstrip()
+                    .upper()
+                    .startswith(("SELECT", "UPDATE", "DELETE"))
+                ):
+                    continue
+
+                plan = connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).all()
+
+                for row in plan:
+                    self.assertIsNone(
+                        TABLE_SCAN.match(row[-1]),
+                        f"{row[-1]} in the plan of {statement}",
+                    )
+                checked += 1
+
+        self.assertGreater(checked, 0)
+
+    def test_GetTodosByDate_UsesIndexes(self):
+        self._AssertUsesIndexes(
+            "GET",
+            GET_TODOS_BY_DATE_ROUTE.format(date=self.today),
+        )
+
+    def test_GetTodosByDateOrdered_UsesIndexes(self):
+        self._AssertUsesIndexes(
+            "GET",
+            GET_TODOS_BY_DATE_ROUTE.format(date=self.today),
+            params={"ordered": True},
+        )
+
+    def test_GetRemainTodos_UsesIndexes(self):
+        self._AssertUsesIndexes("GET", GET_REMAIN_TODOS_ROUTE)
+
+    def test_GetRemainTodosPage_UsesIndexes(self):
+        self._AssertUsesIndexes(
+            "GET",
+            GET_REMAIN_TODOS_ROUTE,
+            params={"limit": 1, "cursor": encode_cursor(self.today, 0)},
+        )
+
+    def test_GetTodoChanges_UsesIndexes(self):
+        self._AssertUsesIndexes("GET", GET_TODO_CHANGES_ROUTE, params={"since": 0})
+
+    def test_GetTodosSummary_UsesIndexes(self):
+        self._AssertUsesIndexes(
+            "GET", GET_TODOS_SUMMARY_ROUTE, params={"month": f"{self.today:%Y-%m}"}
+        )
+
+    def test_GetAllPlannedTodos_UsesIndexes(self):
+        self._AssertUsesIndexes("GET", GET_ALL_PLANNED_TODOS_ROUTE)
+
+    def test_TodoOrders_UseIndexes(self):
+        route = GET_TODOS_ORDER_ROUTE_BY_DATE.format(date=self.today)
+        self._AssertUsesIndexes("GET", route)
+
+        orders = self.client.get(
+            f"{TODO_BASE_ROUTE}{route}",
+            headers=self._Headers(),
+        ).json()["orders"]
+
+        self._AssertUsesIndexes(
+            "PUT",
+            UPDATE_TODOS_ORDER_ROUTE.format(date=self.today),
+            json={"orders": orders[::-1]},
+        )
+        self._AssertUsesIndexes("GET", route)
+
+    def test_MoveTodo_UsesIndexes(self):
+        orders = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_ORDER_ROUTE_BY_DATE.format(date=self.today)}",
+            headers=self._Headers(),
+        ).json()["orders"]
+
+        self._AssertUsesIndexes(
+            "PUT",
+            MOVE_TODO_ROUTE.format(id=orders[0]),
+            params={"after": orders[-1]},
+        )
+
+    def test_CleanTodosByDate_UsesIndexes(self):
+        self._AssertUsesIndexes(
+            "DELETE",
+            CLEAN_TODOS_BY_DATE_ROUTE.format(
+                date=self.today - datetime.timedelta(days=30)
+            ),
+        )
+
+    def test_GetTodosByRange_UsesIndexes(self):
+        self._AssertUsesIndexes(
+            "GET",
+            GET_TODOS_BY_RANGE_ROUTE,
+            params={
+                "start": f"{self.today - datetime.timedelta(days=3)}",
+                "end": f"{self.today + datetime.timedelta(days=3)}",
+            },
+        )
+
+    def test_PlannedTodosByWeekday_UsesIndexes(self):
+        # the batch query of the materialization scheduler
+        statement = (
+            select(PlannedTodo)
+            .where(
+                PlannedTodo.id > 0,
+                PlannedTodo.weekdayMask.in_(masks_with_weekdays(0b0000010)),
+            )
+            .order_by(PlannedTodo.id)
+            .limit(200)
+        )
+
+        with engine.connect() as connection:
+            plan = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN "
+                + str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            ).all()
+
+        details = [row[-1] for row in plan]
+        self.assertTrue(any("weekdayMask" in detail for detail in details), details)
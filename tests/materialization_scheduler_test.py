@@ -0,0 +1,106 @@
+import datetime
+from datetime import timedelta
+from todo_test_case import TodoTestCase
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from apis.v1.todos.materialization_scheduler import MaterializationScheduler
+from models import *
+from routes import *
+from data import *
+
+
+class MaterializationSchedulerTest(TodoTestCase):
+    def _AddRecurringTodo(
+        self,
+        title: str,
+        numTodos: int = 1,
+        weekdays: str = "Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+    ) -> dict:
+        return self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": title,
+                "description": title,
+                "weekdays": weekdays,
+                "gapWeek": 1,
+                "numTodos": numTodos,
+            },
+            headers=self._Headers(),
+        ).json()
+
+    def test_GivenPlannedTodos_WhenRunOnce_ThenTheHorizonIsMaterializedInBatches(
+        self,
+    ):
+        # Arrange
+        for number in range(3):
+            self._AddRecurringTodo(f"planned {number}", numTodos=2)
+        scheduler = MaterializationScheduler(SessionLocal, horizonDays=3, batchSize=2)
+        today = datetime.datetime.now().date()
+
+        # Act
+        numCreated = scheduler.RunOnce(today)
+
+        # Assert
+        self.assertEqual(numCreated, 3 * 2 * 4)
+        db = SessionLocal()
+        self.assertEqual(db.query(Todo).count(), 3 * 2 * 4)
+        self.assertEqual(
+            db.query(Todo).filter(Todo.date > today + timedelta(days=3)).count(), 0
+        )
+        db.close()
+
+    def test_GivenAMaterializedHorizon_WhenRunOnceAgain_ThenNothingIsCreated(self):
+        # Arrange
+        self._AddRecurringTodo("planned")
+        scheduler = MaterializationScheduler(SessionLocal, horizonDays=2)
+        today = datetime.datetime.now().date()
+        scheduler.RunOnce(today)
+
+        # Act
+        numCreated = scheduler.RunOnce(today)
+
+        # Assert
+        self.assertEqual(numCreated, 0)
+
+    def test_GivenAMaterializedDay_WhenGetTheTodosOfThatDay_ThenNothingIsWritten(
+        self,
+    ):
+        # Arrange
+        self._AddRecurringTodo("planned")
+        today = datetime.datetime.now().date()
+        MaterializationScheduler(SessionLocal, horizonDays=1).RunOnce(today)
+
+        # Act
+        response = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=today + timedelta(days=1))}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(len(response.json()), 1)
+        db = SessionLocal()
+        self.assertEqual(db.query(Todo).count(), 2)
+        db.close()
+
+    def test_GivenAPlannedTodoOnAnotherWeekday_WhenRunOnce_ThenItIsSkippedUntilItsWeekdaysChange(
+        self,
+    ):
+        # Arrange
+        today = datetime.datetime.now().date()
+        tomorrow = (today + timedelta(days=1)).strftime("%a")
+        plannedTodo = self._AddRecurringTodo("planned", weekdays=tomorrow)
+        scheduler = MaterializationScheduler(SessionLocal, horizonDays=0)
+
+        # Act
+        skipped = scheduler.RunOnce(today)
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_PLANNED_TODO_ROUTE.format(id=plannedTodo['id'])}",
+            json={**plannedTodo, "weekdays": f"{tomorrow},{today.strftime('%a')}"},
+            headers=self._Headers(),
+        )
+        created = scheduler.RunOnce(today)
+
+        # Assert
+        self.assertEqual(skipped, 0)
+        self.assertEqual(created, 1)
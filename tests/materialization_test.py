@@ -0,0 +1,184 @@
+import datetime
+import threading
+from todo_test_case import TodoTestCase
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from apis.v1.todos.materialization import *
+from models import *
+from routes import *
+from data import *
+
+
+class MaterializationTest(TodoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        response = self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": "Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+                "numTodos": 3,
+            },
+            headers=self._Headers(),
+        )
+        self.plannedTodoId = response.json()["id"]
+
+    def _NumStoredTodos(self) -> int:
+        db = SessionLocal()
+        count = db.query(Todo).count()
+        db.close()
+        return count
+
+    def test_GivenAlreadyClaimedSlots_WhenInsertThemAgain_ThenTheyAreIgnored(self):
+        # Arrange
+        db = SessionLocal()
+        planned_todo = db.get(PlannedTodo, self.plannedTodoId)
+        materialize_planned_todos(db, planned_todo.user_id, self.today)
+        db.commit()
+
+        # Act, a caller which read the slots before the first commit
+        created = insert_occurrences(
+            db, [(planned_todo, self.today, slot) for slot in range(3)]
+        )
+        db.commit()
+        db.close()
+
+        # Assert
+        self.assertEqual(created, {})
+        self.assertEqual(self._NumStoredTodos(), 3)
+
+    def test_GivenConcurrentCallers_WhenMaterializeTheSameDay_ThenTheQuotaIsCreatedOnce(
+        self,
+    ):
+        # Arrange
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def materializeToday():
+            db = SessionLocal()
+            try:
+                planned_todo = db.get(PlannedTodo, self.plannedTodoId)
+                occurrences = owed_occurrences(
+                    db, [planned_todo], self.today, self.today
+                )
+                barrier.wait()
+                insert_occurrences(db, occurrences)
+                db.commit()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=materializeToday) for _ in range(4)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(errors, [])
+        self.assertEqual(self._NumStoredTodos(), 3)
+
+    def _MaterializeFourDays(self) -> None:
+        db = SessionLocal()
+        planned_todo = db.get(PlannedTodo, self.plannedTodoId)
+        materialize_planned_todos(
+            db,
+            planned_todo.user_id,
+            self.today,
+            self.today + datetime.timedelta(days=3),
+        )
+        db.commit()
+        db.close()
+
+    def _NumClaims(self) -> int:
+        db = SessionLocal()
+        count = db.query(PlannedTodoCreated).count()
+        db.close()
+        return count
+
+    def test_GivenUpcomingTodos_WhenUpdateThePlannedTodo_ThenOnlyTheUpcomingAreDeleted(
+        self,
+    ):
+        # Arrange
+        self._MaterializeFourDays()
+
+        # Act
+        response = self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_PLANNED_TODO_ROUTE.format(id=self.plannedTodoId)}",
+            json={
+                "id": self.plannedTodoId,
+                "title": "updated",
+                "description": "updated",
+                "weekdays": "Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+                "numTodos": 3,
+            },
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._NumStoredTodos(), 3)
+        self.assertEqual(self._NumClaims(), 3)
+
+    def test_GivenUpcomingTodos_WhenDeleteThePlannedTodo_ThenItsSlotsAndUpcomingTodosAreDeleted(
+        self,
+    ):
+        # Arrange
+        self._MaterializeFourDays()
+
+        # Act
+        response = self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_PLANNED_TODO_ROUTE.format(id=self.plannedTodoId)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._NumStoredTodos(), 3)
+        self.assertEqual(self._NumClaims(), 0)
+
+    def _ClaimedTodoIds(self) -> list:
+        db = SessionLocal()
+        todoIds = [claim.todo_id for claim in db.query(PlannedTodoCreated)]
+        db.close()
+        return todoIds
+
+    def test_GivenMaterializedTodos_WhenDeleteOne_ThenItsSlotStaysClaimedWithoutIt(
+        self,
+    ):
+        # Arrange
+        self._MaterializeFourDays()
+        todoId = self._ClaimedTodoIds()[0]
+
+        # Act
+        response = self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=todoId)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._NumClaims(), 12)
+        self.assertNotIn(todoId, self._ClaimedTodoIds())
+        self.assertIn(None, self._ClaimedTodoIds())
+
+    def test_GivenMaterializedTodos_WhenCleanTheDay_ThenItsSlotsStayClaimedWithoutThem(
+        self,
+    ):
+        # Arrange
+        self._MaterializeFourDays()
+
+        # Act
+        response = self.client.delete(
+            f"{TODO_BASE_ROUTE}{CLEAN_TODOS_BY_DATE_ROUTE.format(date=self.today)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._NumClaims(), 12)
+        self.assertEqual(self._ClaimedTodoIds().count(None), 3)
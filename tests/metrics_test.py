@@ -0,0 +1,96 @@
+import unittest
+from fastapi.testclient import TestClient
+from test_app import app
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data.response_constant import *
+
+
+class MetricsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(app, base_url=f"http://test")
+        adminInfo = {"username": "admin", "password": "admin"}
+        userInfo = {"username": "test", "password": "test"}
+
+        cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ADMIN_ROUTE}", json=adminInfo)
+        cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ROUTE}", json=userInfo)
+
+        cls.adminToken = cls.client.post(
+            f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+            json=adminInfo,
+        ).json()["access_token"]
+        cls.token = cls.client.post(
+            f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+            json=userInfo,
+        ).json()["access_token"]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        db = SessionLocal()
+        db.query(Profile).delete()
+        db.query(User).delete()
+        db.commit()
+        db.close()
+
+    def _Get(self, route: str, token: str):
+        return self.client.get(route, headers={"Authorization": f"Bearer {token}"})
+
+    def test_GivenAnAdmin_WhenGetPasswordMetrics_ThenReturnsThePoolCounters(self):
+        # Act
+        response = self._Get(
+            f"{METRICS_BASE_ROUTE}{GET_PASSWORD_METRICS_ROUTE}",
+            self.adminToken,
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        metrics = response.json()
+        self.assertGreaterEqual(metrics["completed"], 4)
+        self.assertIn("queueDepth", metrics)
+        self.assertIn("avgHashMs", metrics)
+
+    def test_GivenANormalUser_WhenGetPasswordMetrics_ThenReturnsForbidden(self):
+        # Act
+        response = self._Get(
+            f"{METRICS_BASE_ROUTE}{GET_PASSWORD_METRICS_ROUTE}",
+            self.token,
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_FORBIDDEN_403)
+
+    def test_GivenARequest_WhenItQueriesTheDatabase_ThenItIsReportedAndAggregated(
+        self,
+    ):
+        # Act
+        response = self._Get(f"{PROFLIE_BASE_ROUTE}{GET_PROFILE_ROUTE}", self.token)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertRegex(
+            response.headers["server-timing"],
+            r'^db;dur=[0-9.]+;desc="[1-9][0-9]* queries"$',
+        )
+
+        metrics = self._Get(
+            f"{METRICS_BASE_ROUTE}{GET_SQL_METRICS_ROUTE}",
+            self.adminToken,
+        ).json()
+        route = metrics[f"GET {PROFLIE_BASE_ROUTE}{GET_PROFILE_ROUTE}"]
+        self.assertGreaterEqual(route["requests"], 1)
+        self.assertEqual(route["budget"], 2)
+
+    def test_GivenAnAdmin_WhenGetStreamMetrics_ThenReturnsTheHubCounters(self):
+        # Act
+        response = self._Get(
+            f"{METRICS_BASE_ROUTE}{GET_STREAM_METRICS_ROUTE}",
+            self.adminToken,
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        metrics = response.json()
+        self.assertIn("connections", metrics)
+        self.assertIn("dropped", metrics)
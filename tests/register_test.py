@@ -6,6 +6,7 @@ from utils.database.t_database import TessingSessionLocal as SessionLocal
 from models import User
 from routes import *
 from data.response_constant import *
+from utils.authen.token_handler import build_password_context, pwd_context
 
 
 class RegisterTest(unittest.TestCase):
@@ -56,3 +57,48 @@ class RegisterTest(unittest.TestCase):
 
         admin = adminInfo.json()
         self.assertEqual(admin["role"], Role.admin.value)
+
+    def test_GivenAnAuthorizedUser_WhenTheUserIsDeleted_ThenTheTokenIsRejected(self):
+        # Arrange
+        self.client.post(REGISTER_ROUTE, json=self.testUserJson)
+        token = self.client.post(LOGIN_ROUTE, json=self.testUserJson).json()[
+            "access_token"
+        ]
+        headers = self._GetAuthorizationHeader(token)
+        self.assertEqual(
+            self.client.get(GET_USER_INFO_ROUTE, headers=headers).status_code,
+            HTTP_OK_200,
+        )
+
+        # Act
+        db = SessionLocal()
+        db.query(User).delete()
+        db.commit()
+        db.close()
+
+        # Assert
+        response = self.client.get(GET_USER_INFO_ROUTE, headers=headers)
+        self.assertEqual(response.status_code, HTTP_UNAUTHORIZED_401)
+
+    def test_GivenAHashBelowThePolicy_WhenLogin_ThenTheHashIsUpgraded(self):
+        # Arrange
+        weakHash = build_password_context(["bcrypt"], 4).hash("test")
+        db = SessionLocal()
+        db.add(User(username="test", hashed_password=weakHash))
+        db.commit()
+        db.close()
+
+        # Act
+        response = self.client.post(LOGIN_ROUTE, json=self.testUserJson)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        db = SessionLocal()
+        user = db.query(User).filter(User.username == "test").first()
+        db.close()
+        self.assertNotEqual(user.hashed_password, weakHash)
+        self.assertFalse(pwd_context.needs_update(user.hashed_password))
+        self.assertEqual(
+            self.client.post(LOGIN_ROUTE, json=self.testUserJson).status_code,
+            HTTP_OK_200,
+        )
@@ -0,0 +1,133 @@
+import json
+import unittest
+import datetime
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from test_app import app
+from utils.database.database import get_db
+from utils.database.t_database import (
+    TessingSessionLocal as SessionLocal,
+    override_get_db,
+    override_get_async_db,
+)
+from models import *
+from routes import *
+from data import *
+
+
+class RemainTodosTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(app, base_url=f"http://test")
+        cls.userInfo = {"username": "test", "password": "test"}
+
+        cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ROUTE}", json=cls.userInfo)
+        cls.token = cls.client.post(
+            f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+            json=cls.userInfo,
+        ).json()["access_token"]
+
+        today = datetime.datetime.now().date()
+        cls.ids = []
+        for day in (4, 3, 3, 1, 0):
+            cls.ids.append(
+                cls.client.post(
+                    f"{TODO_BASE_ROUTE}{ADD_TODO_ROUTE}",
+                    json={
+                        "id": 0,
+                        "title": f"todo {day}",
+                        "description": "remain",
+                        "date": f"{today - timedelta(days=day)}",
+                    },
+                    headers=cls._Headers(),
+                ).json()["id"]
+            )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        app.dependency_overrides[get_db] = override_get_db
+
+        db = SessionLocal()
+        db.query(User).delete()
+        db.query(Profile).delete()
+        db.query(Todo).delete()
+        db.commit()
+        db.close()
+
+    @classmethod
+    def _Headers(cls) -> dict:
+        return {"Authorization": f"Bearer {cls.token}"}
+
+    def _Get(self, **params):
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_REMAIN_TODOS_ROUTE}",
+            params=params,
+            headers=self._Headers(),
+        )
+
+    def test_GivenALimit_WhenFollowTheCursors_ThenEveryTodoIsReturnedOnceInOrder(
+        self,
+    ):
+        # Arrange
+        pages = []
+        params = {"limit": 2}
+
+        # Act
+        while True:
+            response = self._Get(**params)
+            self.assertEqual(response.status_code, HTTP_OK_200)
+            pages.append([todo["id"] for todo in response.json()])
+
+            if NEXT_CURSOR_HEADER not in response.headers:
+                break
+            params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+        # Assert
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), self.ids)
+
+    def test_GivenNoLimit_WhenGet_ThenEveryTodoIsReturned(self):
+        # Act
+        response = self._Get()
+
+        # Assert
+        self.assertEqual([todo["id"] for todo in response.json()], self.ids)
+        self.assertNotIn(NEXT_CURSOR_HEADER, response.headers)
+
+    def test_GivenAnInvalidCursor_WhenGet_ThenBadRequest(self):
+        # Act
+        response = self._Get(limit=2, cursor="invalid")
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_BAD_REQUEST_400)
+
+    def test_GivenStream_WhenGet_ThenTheTodosAreSentAsNdjson(self):
+        for override in (override_get_db, override_get_async_db):
+            app.dependency_overrides[get_db] = override
+
+            # Act
+            response = self._Get(stream=True)
+
+            # Assert
+            self.assertEqual(response.status_code, HTTP_OK_200)
+            self.assertTrue(
+                response.headers["content-type"].startswith("application/x-ndjson")
+            )
+            todos = [json.loads(line) for line in response.text.splitlines()]
+            self.assertEqual([todo["id"] for todo in todos], self.ids)
+
+        app.dependency_overrides[get_db] = override_get_db
+
+    def test_GivenStreamWithALimitOrACursor_WhenGet_ThenItIsRejected(self):
+        # Arrange
+        cursor = self._Get(limit=2).headers[NEXT_CURSOR_HEADER]
+
+        # Act
+        responses = [
+            self._Get(stream=True, limit=2),
+            self._Get(stream=True, cursor=cursor),
+        ]
+
+        # Assert
+        for response in responses:
+            self.assertEqual(response.status_code, HTTP_UNPROCESSABLE_ENTITY_422)
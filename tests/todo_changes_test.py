@@ -0,0 +1,125 @@
+from datetime import timedelta
+from todo_test_case import TodoTestCase
+from models import *
+from routes import *
+from data import *
+
+
+class TodoChangesTest(TodoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.todo = self._AddTodo("first")
+
+    def _Changes(self, since: int = 0, user: int = 0) -> dict:
+        response = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODO_CHANGES_ROUTE}",
+            params={"since": since},
+            headers=self._Headers(user),
+        )
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        return response.json()
+
+    def test_GivenNoCursor_WhenGetChanges_ThenEverythingOfTheUserIsReturned(self):
+        # Arrange
+        planned_todo = self._AddPlannedTodo(self.today + timedelta(days=1))
+        self._AddTodo("other", user=1)
+
+        # Act
+        changes = self._Changes()
+
+        # Assert
+        self.assertGreater(changes["cursor"], 0)
+        self.assertEqual([todo["id"] for todo in changes["todos"]], [self.todo["id"]])
+        self.assertEqual(
+            [planned["id"] for planned in changes["plannedTodos"]],
+            [planned_todo["id"]],
+        )
+        self.assertEqual(changes["deleted"], [])
+
+    def test_GivenALastSync_WhenATodoIsCompleted_ThenOnlyItIsReturned(self):
+        # Arrange
+        second = self._AddTodo("second")
+        cursor = self._Changes()["cursor"]
+
+        # Act
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=second['id'])}",
+            headers=self._Headers(),
+        )
+        changes = self._Changes(cursor)
+
+        # Assert
+        self.assertGreater(changes["cursor"], cursor)
+        self.assertEqual(len(changes["todos"]), 1)
+        self.assertEqual(changes["todos"][0]["id"], second["id"])
+        self.assertTrue(changes["todos"][0]["completed"])
+
+    def test_GivenNothingChanged_WhenGetChanges_ThenTheCursorIsKept(self):
+        # Arrange
+        cursor = self._Changes()["cursor"]
+
+        # Act
+        changes = self._Changes(cursor)
+
+        # Assert
+        self.assertEqual(
+            changes,
+            {
+                "cursor": cursor,
+                "todos": [],
+                "plannedTodos": [],
+                "deleted": [],
+            },
+        )
+
+    def test_GivenDeletions_WhenGetChanges_ThenTombstonesAreReturned(self):
+        # Arrange
+        planned_todo = self._AddPlannedTodo(self.today + timedelta(days=1))
+        second = self._AddTodo("second")
+        cursor = self._Changes()["cursor"]
+
+        # Act
+        self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=self.todo['id'])}",
+            headers=self._Headers(),
+        )
+        self.client.delete(
+            f"{TODO_BASE_ROUTE}{CLEAN_TODOS_BY_DATE_ROUTE.format(date=self.today)}",
+            headers=self._Headers(),
+        )
+        self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_PLANNED_TODO_ROUTE.format(id=planned_todo['id'])}",
+            headers=self._Headers(),
+        )
+        changes = self._Changes(cursor)
+
+        # Assert
+        self.assertEqual(changes["todos"], [])
+        self.assertEqual(changes["plannedTodos"], [])
+        self.assertEqual(
+            changes["deleted"],
+            [
+                {"kind": "todo", "id": self.todo["id"]},
+                {"kind": "todo", "id": second["id"]},
+                {"kind": "plannedTodo", "id": planned_todo["id"]},
+            ],
+        )
+        self.assertEqual(self._Changes(cursor, user=1)["deleted"], [])
+
+    def test_GivenAnOrderUpdate_WhenGetChanges_ThenTheRanksAreReturned(self):
+        # Arrange
+        second = self._AddTodo("second")
+        cursor = self._Changes()["cursor"]
+
+        # Act
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_TODOS_ORDER_ROUTE.format(date=self.today)}",
+            json={"orders": [second["id"], self.todo["id"]]},
+            headers=self._Headers(),
+        )
+        changes = self._Changes(cursor)
+
+        # Assert
+        ranks = {todo["id"]: todo["rank"] for todo in changes["todos"]}
+        self.assertEqual(set(ranks), {second["id"], self.todo["id"]})
+        self.assertLess(ranks[second["id"]], ranks[self.todo["id"]])
@@ -0,0 +1,230 @@
+import datetime
+from datetime import timedelta
+from todo_test_case import TodoTestCase
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data import *
+
+
+class TodoRankingTest(TodoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.todos = [self._AddTodo(title) for title in ("a", "b", "c")]
+
+    def _Move(self, id: int, after: int = None, user: int = 0):
+        return self.client.put(
+            f"{TODO_BASE_ROUTE}{MOVE_TODO_ROUTE.format(id=id)}",
+            params={} if after is None else {"after": after},
+            headers=self._Headers(user),
+        )
+
+    def _Order(self, date: datetime.date = None) -> list:
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_ORDER_ROUTE_BY_DATE.format(date=date or self.today)}",
+            headers=self._Headers(),
+        ).json()["orders"]
+
+    def _VirtualTodos(self, date: datetime.date, numTodos: int) -> list:
+        self._AddPlannedTodo(date, numTodos)
+        return [
+            todo["id"]
+            for todo in self.client.get(
+                f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=date)}",
+                headers=self._Headers(),
+            ).json()
+            if todo["virtual"]
+        ]
+
+    def _Ranks(self) -> dict:
+        db = SessionLocal()
+        ranks = {todo.id: todo.rank for todo in db.query(Todo).all()}
+        db.close()
+        return ranks
+
+    def test_GivenNewTodos_WhenGetTheOrder_ThenTheyAreInCreationOrder(self):
+        # Act
+        orders = self._Order()
+
+        # Assert
+        self.assertEqual(orders, [todo["id"] for todo in self.todos])
+        self.assertEqual(
+            [todo["rank"] for todo in self.todos],
+            sorted(todo["rank"] for todo in self.todos),
+        )
+
+    def test_GivenATodo_WhenMoveItAfterAnother_ThenOnlyItIsWritten(self):
+        # Arrange
+        a, b, c = [todo["id"] for todo in self.todos]
+        before = self._Ranks()
+
+        # Act
+        response = self._Move(c, after=a)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._Order(), [a, c, b])
+
+        after = self._Ranks()
+        self.assertEqual(
+            {id for id in before if before[id] != after[id]},
+            {c},
+        )
+        self.assertEqual(response.json()["rank"], after[c])
+
+    def test_GivenATodo_WhenMoveItWithoutAfter_ThenItIsFirst(self):
+        # Arrange
+        a, b, c = [todo["id"] for todo in self.todos]
+
+        # Act
+        self._Move(b)
+
+        # Assert
+        self.assertEqual(self._Order(), [b, a, c])
+
+    def test_GivenNoRoomBetweenTwoTodos_WhenMoveBetweenThem_ThenTheDayIsRebalanced(
+        self,
+    ):
+        # Arrange
+        a, b, c = [todo["id"] for todo in self.todos]
+        db = SessionLocal()
+        for id, rank in ((a, 1), (b, 2), (c, 3)):
+            db.get(Todo, id).rank = rank
+        db.commit()
+        db.close()
+
+        # Act
+        response = self._Move(c, after=a)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._Order(), [a, c, b])
+
+        ranks = self._Ranks()
+        self.assertGreater(ranks[b] - ranks[c], 1)
+        self.assertGreater(ranks[c] - ranks[a], 1)
+        self.assertEqual(response.json()["rank"], ranks[c])
+
+    def test_GivenATodoOfAnotherDay_WhenMoveAfterIt_ThenBadRequest(self):
+        # Arrange
+        yesterday = self._AddTodo("yesterday", self.today - timedelta(days=1))
+
+        # Act
+        response = self._Move(self.todos[0]["id"], after=yesterday["id"])
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_BAD_REQUEST_400)
+        self.assertEqual(
+            self._Move(self.todos[0]["id"], after=self.todos[0]["id"]).status_code,
+            HTTP_BAD_REQUEST_400,
+        )
+
+    def test_GivenATodoOfAnotherUser_WhenMoveIt_ThenForbidden(self):
+        # Act
+        response = self._Move(self.todos[0]["id"], user=1)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_FORBIDDEN_403)
+
+    def test_GivenATodo_WhenItsDateIsUpdated_ThenItIsLastOfItsNewDay(self):
+        # Arrange
+        yesterday = self.today - timedelta(days=1)
+        other = self._AddTodo("other", yesterday)
+        todo = self.todos[0]
+
+        # Act
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_TODO_ROUTE.format(id=todo['id'])}",
+            json={**todo, "date": f"{yesterday}"},
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(self._Order(yesterday), [other["id"], todo["id"]])
+
+    def test_GivenMovedTodos_WhenGetTheDayOrdered_ThenTheyComeInTheOrderOfTheDay(
+        self,
+    ):
+        # Arrange
+        a, b, c = [todo["id"] for todo in self.todos]
+        self._Move(c)
+
+        # Act
+        response = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=self.today)}",
+            params={"ordered": True},
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual([todo["id"] for todo in response.json()], [c, a, b])
+
+    def test_GivenAFutureDay_WhenGetItOrdered_ThenTheProjectedTodosComeLast(self):
+        # Arrange
+        tomorrow = self.today + timedelta(days=1)
+        first = self._AddTodo("first", tomorrow)
+        second = self._AddTodo("second", tomorrow)
+        self._AddPlannedTodo(tomorrow, 2)
+        self._Move(second["id"])
+
+        # Act
+        todos = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=tomorrow)}",
+            params={"ordered": True},
+            headers=self._Headers(),
+        ).json()
+
+        # Assert
+        self.assertEqual(
+            [todo["id"] for todo in todos[:2]], [second["id"], first["id"]]
+        )
+        self.assertEqual([todo["virtual"] for todo in todos[2:]], [True, True])
+        self.assertGreater(todos[2]["id"], todos[3]["id"])
+
+    def test_GivenVirtualTodos_WhenMoveOneAfterTheOther_ThenBothAreStoredInThatOrder(
+        self,
+    ):
+        # Arrange
+        tomorrow = self.today + timedelta(days=1)
+        first = self._AddTodo("first", tomorrow)
+        v0, v1 = self._VirtualTodos(tomorrow, 2)
+
+        # Act
+        response = self._Move(v0, after=v1)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        moved = response.json()
+        self.assertGreater(moved["id"], 0)
+        self.assertFalse(moved["virtual"])
+
+        orders = self._Order(tomorrow)
+        self.assertEqual(len(orders), 3)
+        self.assertEqual(orders[0], first["id"])
+        self.assertEqual(orders[2], moved["id"])
+
+    def test_GivenNoRoomAfterATodo_WhenMoveAVirtualTodoThere_ThenTheDayIsRebalanced(
+        self,
+    ):
+        # Arrange
+        tomorrow = self.today + timedelta(days=1)
+        first = self._AddTodo("first", tomorrow)
+        second = self._AddTodo("second", tomorrow)
+        (virtualId,) = self._VirtualTodos(tomorrow, 1)
+        db = SessionLocal()
+        db.get(Todo, first["id"]).rank = 1
+        db.get(Todo, second["id"]).rank = 2
+        db.commit()
+        db.close()
+
+        # Act
+        response = self._Move(virtualId, after=first["id"])
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        moved = response.json()
+        self.assertEqual(
+            self._Order(tomorrow), [first["id"], moved["id"], second["id"]]
+        )
+        self.assertEqual(moved["rank"], self._Ranks()[moved["id"]])
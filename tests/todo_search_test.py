@@ -0,0 +1,162 @@
+from todo_test_case import TodoTestCase
+from models import *
+from routes import *
+from data import *
+
+
+class TodoSearchTest(TodoTestCase):
+    def _Search(self, q: str, user: int = 0, **params):
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{SEARCH_TODOS_ROUTE}",
+            params={"q": q, **params},
+            headers=self._Headers(user),
+        )
+
+    def test_GivenTodos_WhenSearchAWord_ThenTheMatchingTodosAreHighlighted(self):
+        # Arrange
+        todo = self._AddTodo("Groceries", description="buy milk and bread")
+        self._AddTodo("Laundry", description="wash the shirts")
+
+        # Act
+        response = self._Search("milk")
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        results = response.json()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["kind"], "todo")
+        self.assertEqual(results[0]["id"], todo["id"])
+        self.assertEqual(results[0]["title"], "Groceries")
+        self.assertIn("<mark>milk</mark>", results[0]["snippet"])
+
+    def test_GivenTodos_WhenSearchAPrefix_ThenTheWordsItStartsMatch(self):
+        # Arrange
+        self._AddTodo("Groceries", description="buy milk")
+        self._AddTodo("Dentist", description="call the dentist")
+
+        # Act
+        results = self._Search("gro*").json()
+
+        # Assert
+        self.assertEqual(
+            [result["title"] for result in results], ["<mark>Groceries</mark>"]
+        )
+
+    def test_GivenAWordInATitleAndADescription_WhenSearch_ThenTheTitleRanksFirst(
+        self,
+    ):
+        # Arrange
+        inDescription = self._AddTodo("Shopping", description="pick up the report")
+        inTitle = self._AddTodo("Report", description="finish it")
+
+        # Act
+        results = self._Search("report").json()
+
+        # Assert
+        self.assertEqual(
+            [result["id"] for result in results], [inTitle["id"], inDescription["id"]]
+        )
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_GivenMarkupInATodo_WhenSearch_ThenItIsEscaped(self):
+        # Arrange
+        self._AddTodo(
+            "<b>Groceries</b>", description="buy <script>alert(1)</script> milk"
+        )
+
+        # Act
+        (result,) = self._Search("milk").json()
+
+        # Assert
+        self.assertEqual(result["title"], "&lt;b&gt;Groceries&lt;/b&gt;")
+        self.assertNotIn("<script>", result["snippet"])
+        self.assertIn("&lt;script&gt;", result["snippet"])
+        self.assertIn("<mark>milk</mark>", result["snippet"])
+
+    def test_GivenTodosOfAnotherUser_WhenSearch_ThenTheyAreNotReturned(self):
+        # Arrange
+        self._AddTodo("Groceries", description="buy milk", user=1)
+
+        # Act
+        results = self._Search("milk").json()
+
+        # Assert
+        self.assertEqual(results, [])
+
+    def test_GivenAPlannedTodo_WhenSearch_ThenItIsReturned(self):
+        # Arrange
+        plannedTodo = self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "Gym",
+                "description": "leg day",
+                "weekdays": "Mon",
+                "numTodos": 1,
+            },
+            headers=self._Headers(),
+        ).json()
+
+        # Act
+        results = self._Search("leg").json()
+
+        # Assert
+        self.assertEqual(
+            [(result["kind"], result["id"]) for result in results],
+            [("plannedTodo", plannedTodo["id"])],
+        )
+
+    def test_GivenAnUpdatedTodo_WhenSearch_ThenOnlyItsNewTextMatches(self):
+        # Arrange
+        todo = self._AddTodo("Groceries", description="buy milk")
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_TODO_ROUTE.format(id=todo['id'])}",
+            json={**todo, "description": "buy coffee"},
+            headers=self._Headers(),
+        )
+
+        # Act
+        old = self._Search("milk").json()
+        new = self._Search("coffee").json()
+
+        # Assert
+        self.assertEqual(old, [])
+        self.assertEqual([result["id"] for result in new], [todo["id"]])
+
+    def test_GivenADeletedTodo_WhenSearch_ThenItIsNotReturned(self):
+        # Arrange
+        todo = self._AddTodo("Groceries", description="buy milk")
+        self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=todo['id'])}",
+            headers=self._Headers(),
+        )
+
+        # Act
+        results = self._Search("milk").json()
+
+        # Assert
+        self.assertEqual(results, [])
+
+    def test_GivenAQueryWithSearchSyntax_WhenSearch_ThenItIsSearchedAsWords(self):
+        # Arrange
+        self._AddTodo("Groceries", description="milk or bread")
+
+        # Act
+        response = self._Search('milk OR "(NEAR')
+        empty = self._Search("!!")
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(len(response.json()), 0)
+        self.assertEqual(empty.json(), [])
+
+    def test_GivenALimit_WhenSearch_ThenAtMostThatManyAreReturned(self):
+        # Arrange
+        for index in range(3):
+            self._AddTodo(f"Groceries {index}", description="buy milk")
+
+        # Act
+        results = self._Search("milk", limit=2).json()
+
+        # Assert
+        self.assertEqual(len(results), 2)
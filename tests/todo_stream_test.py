@@ -0,0 +1,64 @@
+from starlette.websockets import WebSocketDisconnect
+from todo_test_case import TodoTestCase
+from apis.v1.todos.change_hub import change_hub
+from models import *
+from routes import *
+from data import *
+
+
+class TodoStreamTest(TodoTestCase):
+    def _Cursor(self) -> int:
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODO_CHANGES_ROUTE}",
+            headers=self._Headers(),
+        ).json()["cursor"]
+
+    def test_GivenAConnectedStream_WhenTodosChange_ThenEventsArePushed(self):
+        # Arrange
+        with self.client.websocket_connect(
+            f"{TODO_BASE_ROUTE}{STREAM_TODO_CHANGES_ROUTE}?token={self.tokens[0]}"
+        ) as websocket:
+            # Act
+            todo = self._AddTodo("test")
+            added = websocket.receive_json()
+            self.client.put(
+                f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=todo['id'])}",
+                headers=self._Headers(),
+            )
+            completed = websocket.receive_json()
+
+        # Assert
+        self.assertEqual(added["event"], "changes")
+        self.assertGreater(completed["cursor"], added["cursor"])
+        self.assertEqual(completed["cursor"], self._Cursor())
+
+    def test_GivenAnAuthorizationHeader_WhenConnect_ThenTheStreamIsOpened(self):
+        with self.client.websocket_connect(
+            f"{TODO_BASE_ROUTE}{STREAM_TODO_CHANGES_ROUTE}",
+            headers=self._Headers(),
+        ) as websocket:
+            self._AddTodo("test")
+
+            self.assertEqual(websocket.receive_json()["cursor"], self._Cursor())
+
+    def test_GivenNoToken_WhenConnect_ThenTheStreamIsRejected(self):
+        with self.assertRaises(WebSocketDisconnect) as context:
+            with self.client.websocket_connect(
+                f"{TODO_BASE_ROUTE}{STREAM_TODO_CHANGES_ROUTE}"
+            ):
+                pass
+
+        self.assertEqual(context.exception.code, 1008)
+
+    def test_GivenAClosedStream_WhenTodosChange_ThenItIsUnsubscribed(self):
+        # Arrange
+        with self.client.websocket_connect(
+            f"{TODO_BASE_ROUTE}{STREAM_TODO_CHANGES_ROUTE}?token={self.tokens[0]}"
+        ):
+            connections = change_hub.Metrics()["connections"]
+
+        # Act
+        self._AddTodo("test")
+
+        # Assert
+        self.assertEqual(change_hub.Metrics()["connections"], connections - 1)
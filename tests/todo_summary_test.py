@@ -0,0 +1,155 @@
+import datetime
+from todo_test_case import TodoTestCase
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data import *
+
+
+class TodoSummaryTest(TodoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.month = f"{self.today:%Y-%m}"
+        self.first = self.today.replace(day=1)
+        self.second = self.today.replace(day=2)
+
+    def _Complete(self, todo: dict) -> None:
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=todo['id'])}",
+            headers=self._Headers(),
+        )
+
+    def _Summary(self, month: str = None, user: int = 0):
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_SUMMARY_ROUTE}",
+            params={"month": month or self.month},
+            headers=self._Headers(user),
+        )
+
+    def _Counts(self, user: int = 0) -> dict:
+        return {
+            day["date"]: (day["total"], day["completed"])
+            for day in self._Summary(user=user).json()
+        }
+
+    def test_GivenTodosOfTheMonth_WhenGetSummary_ThenEachDayIsCounted(self):
+        # Arrange
+        todos = [self._AddTodo(title, self.first) for title in ("a", "b", "c")]
+        self._AddTodo("d", self.second)
+        self._AddTodo("other month", self.first - datetime.timedelta(days=1))
+        self._AddTodo("other user", self.first, user=1)
+        self._Complete(todos[0])
+        self._Complete(todos[1])
+
+        # Act
+        response = self._Summary()
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(
+            response.json(),
+            [
+                {"date": f"{self.first}", "total": 3, "completed": 2},
+                {"date": f"{self.second}", "total": 1, "completed": 0},
+            ],
+        )
+
+    def test_GivenChangedTodos_WhenGetSummary_ThenTheCountsFollow(self):
+        # Arrange
+        moved, uncompleted, deleted = [
+            self._AddTodo(title, self.first) for title in ("a", "b", "c")
+        ]
+        self._Complete(moved)
+        self._Complete(uncompleted)
+
+        # Act
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_TODO_ROUTE.format(id=moved['id'])}",
+            json=self._Todo("a", self.second),
+            headers=self._Headers(),
+        )
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{UNCOMPLETE_TODO_ROUTE.format(id=uncompleted['id'])}",
+            headers=self._Headers(),
+        )
+        self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=deleted['id'])}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(
+            self._Counts(), {f"{self.first}": (1, 0), f"{self.second}": (1, 1)}
+        )
+
+    def test_GivenABatch_WhenGetSummary_ThenItsBulkChangesAreCounted(self):
+        # Arrange
+        toComplete = self._AddTodo("complete", self.first)
+        toDelete = self._AddTodo("delete", self.second)
+
+        # Act
+        self.client.post(
+            f"{TODO_BASE_ROUTE}{BATCH_TODOS_ROUTE}",
+            json={
+                "operations": [
+                    {"op": "create", "todo": self._Todo("created", self.first)},
+                    {"op": "complete", "id": toComplete["id"]},
+                    {"op": "delete", "id": toDelete["id"]},
+                ]
+            },
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(self._Counts(), {f"{self.first}": (2, 1)})
+
+    def test_GivenAPlannedTodoForToday_WhenGetSummary_ThenItsTodoIsCounted(self):
+        # Arrange
+        self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": self.today.strftime("%a"),
+                "numTodos": 2,
+            },
+            headers=self._Headers(),
+        )
+
+        # Act
+        counts = self._Counts()
+
+        # Assert
+        self.assertEqual(counts[f"{self.today}"], (2, 0))
+
+    def test_GivenAnInvalidMonth_WhenGetSummary_ThenReturnsBadRequest(self):
+        # Act
+        response = self._Summary("2024-13")
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_BAD_REQUEST_400)
+
+    def test_GivenADriftedSummary_WhenRecompute_ThenItMatchesTheTodos(self):
+        # Arrange
+        todo = self._AddTodo("a", self.first)
+        self._Complete(todo)
+        self._AddTodo("other user", self.first, user=1)
+
+        db = SessionLocal()
+        user = db.query(User).filter(User.username == "test").one()
+        db.query(DailySummary).update({"total": 7})
+        db.add(DailySummary(user_id=user.id, date=self.second, total=3))
+        db.commit()
+        db.close()
+
+        # Act
+        response = self.client.post(
+            f"{TODO_BASE_ROUTE}{RECOMPUTE_TODOS_SUMMARY_ROUTE}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(self._Counts(), {f"{self.first}": (1, 1)})
+        self.assertEqual(self._Counts(user=1), {f"{self.first}": (7, 0)})
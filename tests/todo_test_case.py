@@ -0,0 +1,93 @@
+import unittest
+import datetime
+from fastapi.testclient import TestClient
+from test_app import app
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data import *
+
+
+class TodoTestCase(unittest.TestCase):
+    """
+    Base of the todo route tests: two registered users, `test` and `test2`,
+        whose tokens are `tokens[0]` and `tokens[1]`, and the helpers to
+        add their todos. The tables of `TODO_MODELS` are emptied after
+        every test, a new table the todo routes write to goes there.
+    """
+
+    TODO_MODELS = (Todo, PlannedTodo, PlannedTodoCreated, Tombstone, DailySummary)
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(app, base_url=f"http://test")
+
+        cls.tokens = []
+        for username in ("test", "test2"):
+            userInfo = {"username": username, "password": username}
+            cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ROUTE}", json=userInfo)
+            cls.tokens.append(
+                cls.client.post(
+                    f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+                    json=userInfo,
+                ).json()["access_token"]
+            )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        db = SessionLocal()
+        db.query(User).delete()
+        db.query(Profile).delete()
+        db.commit()
+        db.close()
+
+    def setUp(self) -> None:
+        self.today = datetime.datetime.now().date()
+
+    def tearDown(self) -> None:
+        db = SessionLocal()
+        for model in self.TODO_MODELS:
+            db.query(model).delete()
+        db.commit()
+        db.close()
+
+    def _Headers(self, user: int = 0) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[user]}"}
+
+    def _Todo(
+        self, title: str, date: datetime.date = None, description: str = None
+    ) -> dict:
+        return {
+            "id": 0,
+            "title": title,
+            "description": title if description is None else description,
+            "date": f"{date or self.today}",
+        }
+
+    def _AddTodo(
+        self,
+        title: str,
+        date: datetime.date = None,
+        user: int = 0,
+        description: str = None,
+    ) -> dict:
+        return self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_TODO_ROUTE}",
+            json=self._Todo(title, date, description),
+            headers=self._Headers(user),
+        ).json()
+
+    def _AddPlannedTodo(
+        self, date: datetime.date, numTodos: int = 1, user: int = 0
+    ) -> dict:
+        return self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": date.strftime("%a"),
+                "numTodos": numTodos,
+            },
+            headers=self._Headers(user),
+        ).json()
@@ -0,0 +1,160 @@
+from datetime import timedelta
+from todo_test_case import TodoTestCase
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data import *
+
+
+class TodosBatchTest(TodoTestCase):
+    def _Batch(self, operations: list):
+        return self.client.post(
+            f"{TODO_BASE_ROUTE}{BATCH_TODOS_ROUTE}",
+            json={"operations": operations},
+            headers=self._Headers(),
+        )
+
+    def _Stored(self, id: int):
+        db = SessionLocal()
+        todo = db.get(Todo, id)
+        db.close()
+        return todo
+
+    def test_GivenEveryOperation_WhenBatch_ThenTheyAreAppliedInOneRequest(self):
+        # Arrange
+        toUpdate = self._AddTodo("update")
+        toComplete = self._AddTodo("complete")
+        toUncomplete = self._AddTodo("uncomplete")
+        toDelete = self._AddTodo("delete")
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=toUncomplete['id'])}",
+            headers=self._Headers(),
+        )
+
+        # Act
+        response = self._Batch(
+            [
+                {"op": "create", "todo": self._Todo("created")},
+                {"op": "update", "id": toUpdate["id"], "todo": self._Todo("updated")},
+                {"op": "complete", "id": toComplete["id"]},
+                {"op": "uncomplete", "id": toUncomplete["id"]},
+                {"op": "delete", "id": toDelete["id"]},
+            ]
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            [HTTP_CREATED_201] + [HTTP_OK_200] * 4,
+        )
+        self.assertEqual(self._Stored(results[0]["todo"]["id"]).title, "created")
+        self.assertEqual(self._Stored(toUpdate["id"]).title, "updated")
+        self.assertTrue(self._Stored(toComplete["id"]).completed)
+        self.assertFalse(self._Stored(toUncomplete["id"]).completed)
+        self.assertIsNone(self._Stored(toDelete["id"]))
+
+    def test_GivenInvalidItems_WhenBatch_ThenTheyFailAloneWithTheirStatus(self):
+        # Arrange
+        mine = self._AddTodo("mine")
+        others = self._AddTodo("others", user=1)
+
+        # Act
+        response = self._Batch(
+            [
+                {"op": "complete", "id": others["id"]},
+                {"op": "complete", "id": 123456},
+                {"op": "update", "id": mine["id"]},
+                {"op": "delete", "id": mine["id"]},
+                {"op": "complete", "id": mine["id"]},
+            ]
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]],
+            [
+                HTTP_FORBIDDEN_403,
+                HTTP_NOT_FOUND_404,
+                HTTP_BAD_REQUEST_400,
+                HTTP_OK_200,
+                HTTP_NOT_FOUND_404,
+            ],
+        )
+        self.assertFalse(self._Stored(others["id"]).completed)
+        self.assertIsNone(self._Stored(mine["id"]))
+
+    def test_GivenAVirtualTodo_WhenCompleteItInABatch_ThenItIsMaterialized(self):
+        # Arrange
+        tomorrow = self.today + timedelta(days=1)
+        self._AddPlannedTodo(tomorrow)
+        virtualId = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=tomorrow)}",
+            headers=self._Headers(),
+        ).json()[0]["id"]
+
+        # Act
+        response = self._Batch([{"op": "complete", "id": virtualId}])
+
+        # Assert
+        todo = response.json()["results"][0]["todo"]
+        self.assertGreater(todo["id"], 0)
+        self.assertTrue(self._Stored(todo["id"]).completed)
+
+    def test_GivenManyVirtualTodos_WhenBatchThem_ThenTheyAreMaterializedTogether(
+        self,
+    ):
+        # Arrange
+        tomorrow = self.today + timedelta(days=1)
+        self._AddPlannedTodo(tomorrow, 12)
+        self._AddPlannedTodo(tomorrow, user=1)
+        mine, others = [
+            [
+                todo["id"]
+                for todo in self.client.get(
+                    f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=tomorrow)}",
+                    headers=self._Headers(user),
+                ).json()
+            ]
+            for user in (0, 1)
+        ]
+
+        # Act
+        response = self._Batch(
+            [{"op": "complete", "id": id} for id in mine[:-1]]
+            + [
+                {"op": "delete", "id": mine[-1]},
+                {"op": "complete", "id": mine[-1]},
+                {"op": "complete", "id": others[0]},
+            ]
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            [HTTP_OK_200] * 12 + [HTTP_NOT_FOUND_404, HTTP_FORBIDDEN_403],
+        )
+        ids = [result["todo"]["id"] for result in results[:11]]
+        self.assertTrue(all(id > 0 for id in ids))
+        self.assertEqual(len(set(ids)), 11)
+        self.assertTrue(all(self._Stored(id).completed for id in ids))
+
+        db = SessionLocal()
+        claims = db.query(PlannedTodoCreated).all()
+        db.close()
+        self.assertEqual(len(claims), 12)
+        self.assertEqual(
+            sorted(claim.todo_id for claim in claims if claim.todo_id is not None),
+            sorted(ids),
+        )
+
+    def test_GivenTooManyOperations_WhenBatch_ThenBadRequest(self):
+        # Act
+        response = self._Batch([{"op": "complete", "id": 1}] * 101)
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_BAD_REQUEST_400)
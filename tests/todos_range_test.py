@@ -0,0 +1,114 @@
+import unittest
+import datetime
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from test_app import app
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data import *
+
+
+class TodosRangeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(app, base_url=f"http://test")
+        cls.userInfo = {"username": "test", "password": "test"}
+
+        cls.client.post(f"{USER_BASE_ROUTE}{REGISTER_ROUTE}", json=cls.userInfo)
+        cls.token = cls.client.post(
+            f"{USER_BASE_ROUTE}{LOGIN_ROUTE}",
+            json=cls.userInfo,
+        ).json()["access_token"]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        db = SessionLocal()
+        db.query(User).delete()
+        db.query(Profile).delete()
+        db.commit()
+        db.close()
+
+    def tearDown(self) -> None:
+        db = SessionLocal()
+        db.query(Todo).delete()
+        db.query(PlannedTodo).delete()
+        db.query(PlannedTodoCreated).delete()
+        db.commit()
+        db.close()
+
+    def _Headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def _GetRange(self, start: datetime.date, end: datetime.date):
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_RANGE_ROUTE}",
+            params={"start": f"{start}", "end": f"{end}"},
+            headers=self._Headers(),
+        )
+
+    def test_GivenTodosAndAPlannedTodo_WhenGetAWeek_ThenTheyAreGroupedByDate(self):
+        # Arrange
+        today = datetime.datetime.now().date()
+        self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": "Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+            },
+            headers=self._Headers(),
+        )
+        self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "test",
+                "description": "test",
+                "date": f"{today - timedelta(days=1)}",
+            },
+            headers=self._Headers(),
+        )
+
+        # Act
+        response = self._GetRange(today - timedelta(days=1), today + timedelta(days=5))
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        todosByDate = response.json()
+        self.assertEqual(
+            list(todosByDate.keys()),
+            [f"{today + timedelta(days=day)}" for day in range(-1, 6)],
+        )
+        self.assertEqual(
+            [todo["title"] for todo in todosByDate[f"{today - timedelta(days=1)}"]],
+            ["test"],
+        )
+        self.assertEqual(
+            [todo["virtual"] for todo in todosByDate[f"{today}"]],
+            [False],
+        )
+        for day in range(1, 6):
+            todos = todosByDate[f"{today + timedelta(days=day)}"]
+            self.assertEqual([todo["virtual"] for todo in todos], [True])
+
+    def test_GivenARangeEndingBeforeItsStart_WhenGetIt_ThenBadRequest(self):
+        # Arrange
+        today = datetime.datetime.now().date()
+
+        # Act
+        response = self._GetRange(today, today - timedelta(days=1))
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_BAD_REQUEST_400)
+
+    def test_GivenATooLongRange_WhenGetIt_ThenBadRequest(self):
+        # Arrange
+        today = datetime.datetime.now().date()
+
+        # Act
+        response = self._GetRange(today, today + timedelta(days=365))
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_BAD_REQUEST_400)
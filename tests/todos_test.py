@@ -103,7 +103,6 @@ class TodoTest(unittest.TestCase):
         db.query(Todo).delete()
         db.query(PlannedTodo).delete()
         db.query(PlannedTodoCreated).delete()
-        db.query(TodoOrder).delete()
         db.commit()
         db.close()
 
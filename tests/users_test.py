@@ -6,6 +6,9 @@ from test_app import app
 from data.response_constant import *
 from utils.database.t_database import TessingSessionLocal as SessionLocal
 from routes import *
+from datetime import timedelta
+import jwt
+from utils.authen.token_handler import create_access_token, SECRET_KEY, ALGORITHM
 
 
 class AuthenticateTest(unittest.TestCase):
@@ -128,3 +131,32 @@ class AuthenticateTest(unittest.TestCase):
 
         # Assert
         self.assertEqual(response.status_code, HTTP_UNAUTHORIZED_401)
+
+    def test_WhenLogin_ThenTheTokenCarriesTheUserId(self):
+        # Act
+        token = self.client.post(LOGIN_ROUTE, json=self.testUserJson).json()[
+            "access_token"
+        ]
+
+        # Assert
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        self.assertEqual(claims["sub"], str(self.registeredUser["id"]))
+        self.assertEqual(claims["username"], self.testUserJson["username"])
+
+    def test_GivenATokenWithoutUserId_WhenAccessAUserRoute_ThenTheUserIsFoundByName(
+        self,
+    ):
+        # Arrange
+        token = create_access_token(
+            data={"username": self.testUserJson["username"], "role": Role.user},
+            expires_delta=timedelta(minutes=5),
+        )
+
+        # Act
+        response = self.client.get(
+            f"http://test{PROFLIE_BASE_ROUTE}{GET_PROFILE_ROUTE}",
+            headers=self._GetAuthorizationHeader(token),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
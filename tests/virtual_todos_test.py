@@ -0,0 +1,221 @@
+from datetime import timedelta
+from todo_test_case import TodoTestCase
+from utils.database.t_database import TessingSessionLocal as SessionLocal
+from models import *
+from routes import *
+from data import *
+
+
+class VirtualTodosTest(TodoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tomorrow = self.today + timedelta(days=1)
+        self.client.post(
+            f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+            json={
+                "id": 0,
+                "title": "planned",
+                "description": "planned",
+                "weekdays": "Mon,Tue,Wed,Thu,Fri,Sat,Sun",
+                "gapWeek": 1,
+                "numTodos": 2,
+            },
+            headers=self._Headers(),
+        )
+
+    def _GetTomorrow(self) -> list:
+        return self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODOS_BY_DATE_ROUTE.format(date=self.tomorrow)}",
+            headers=self._Headers(),
+        ).json()
+
+    def _NumStoredTodos(self) -> int:
+        db = SessionLocal()
+        count = db.query(Todo).count()
+        db.close()
+        return count
+
+    def test_GivenAPlannedTodo_WhenGetAFutureDate_ThenVirtualTodosAreReturnedWithoutWrites(
+        self,
+    ):
+        # Act
+        todos = self._GetTomorrow()
+
+        # Assert
+        self.assertEqual(len(todos), 2)
+        self.assertTrue(all(todo["virtual"] for todo in todos))
+        self.assertTrue(all(todo["id"] < 0 for todo in todos))
+        self.assertEqual(len({todo["id"] for todo in todos}), 2)
+        self.assertEqual(self._NumStoredTodos(), 0)
+
+    def test_GivenAVirtualTodo_WhenGetItsInfo_ThenItIsProjected(self):
+        # Arrange
+        virtualId = self._GetTomorrow()[0]["id"]
+
+        # Act
+        response = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODO_INFO_ROUTE.format(id=virtualId)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertTrue(response.json()["virtual"])
+        self.assertEqual(self._NumStoredTodos(), 0)
+
+    def test_GivenAVirtualTodo_WhenCompleteIt_ThenItIsMaterialized(self):
+        # Arrange
+        virtualId = self._GetTomorrow()[0]["id"]
+
+        # Act
+        response = self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=virtualId)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertGreater(response.json()["id"], 0)
+        self.assertTrue(response.json()["completed"])
+        self.assertFalse(response.json()["virtual"])
+
+        todos = self._GetTomorrow()
+        self.assertEqual(len(todos), 2)
+        self.assertEqual([todo["virtual"] for todo in todos], [False, True])
+        self.assertEqual(self._NumStoredTodos(), 1)
+
+    def test_GivenAMaterializedVirtualTodo_WhenEditTheSameVirtualId_ThenNoDuplicateIsCreated(
+        self,
+    ):
+        # Arrange
+        todo = self._GetTomorrow()[0]
+        self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=todo['id'])}",
+            headers=self._Headers(),
+        )
+
+        # Act
+        response = self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_TODO_ROUTE.format(id=todo['id'])}",
+            json={**todo, "title": "edited"},
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(response.json()["title"], "edited")
+        self.assertEqual(self._NumStoredTodos(), 1)
+
+    def test_GivenAVirtualTodo_WhenDeleteIt_ThenItIsNotProjectedAnymore(self):
+        # Arrange
+        virtualId = self._GetTomorrow()[0]["id"]
+
+        # Act
+        response = self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=virtualId)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        todos = self._GetTomorrow()
+        self.assertEqual(len(todos), 1)
+        self.assertNotEqual(todos[0]["id"], virtualId)
+
+    def test_GivenADeletedVirtualTodo_WhenGetItsInfo_ThenNotFound(self):
+        # Arrange
+        virtualId = self._GetTomorrow()[0]["id"]
+        self.client.delete(
+            f"{TODO_BASE_ROUTE}{DELETE_TODO_ROUTE.format(id=virtualId)}",
+            headers=self._Headers(),
+        )
+
+        # Act
+        response = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODO_INFO_ROUTE.format(id=virtualId)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_NOT_FOUND_404)
+        self.assertEqual(
+            self.client.put(
+                f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=virtualId)}",
+                headers=self._Headers(),
+            ).status_code,
+            HTTP_NOT_FOUND_404,
+        )
+
+    def test_GivenAVirtualTodo_WhenEditItOntoAnotherDate_ThenItIsStoredThere(self):
+        # Arrange
+        todo = self._GetTomorrow()[0]
+        later = self.tomorrow + timedelta(days=2)
+
+        # Act
+        response = self.client.put(
+            f"{TODO_BASE_ROUTE}{UPDATE_TODO_ROUTE.format(id=todo['id'])}",
+            json={**todo, "title": "edited", "date": f"{later}"},
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_OK_200)
+        self.assertEqual(response.json()["date"], f"{later}")
+        self.assertFalse(response.json()["virtual"])
+        self.assertEqual(self._NumStoredTodos(), 1)
+
+        todos = self._GetTomorrow()
+        self.assertEqual(len(todos), 1)
+        self.assertNotEqual(todos[0]["id"], todo["id"])
+
+    def test_GivenAVirtualTodoOfAnotherUser_WhenCompleteIt_ThenForbidden(self):
+        # Arrange
+        virtualId = self._GetTomorrow()[0]["id"]
+
+        # Act
+        response = self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=virtualId)}",
+            headers=self._Headers(user=1),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_FORBIDDEN_403)
+        self.assertEqual(self._NumStoredTodos(), 0)
+
+    def test_GivenAnUnknownVirtualId_WhenCompleteIt_ThenNotFound(self):
+        # Act
+        response = self.client.put(
+            f"{TODO_BASE_ROUTE}{COMPLETE_TODO_ROUTE.format(id=-5)}",
+            headers=self._Headers(),
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, HTTP_NOT_FOUND_404)
+
+    def test_GivenTooManyTodosADay_WhenAddAPlannedTodo_ThenItIsRejected(self):
+        # Act
+        responses = [
+            self.client.post(
+                f"{TODO_BASE_ROUTE}{ADD_PLANNED_TODO_ROUTE}",
+                json={
+                    "id": 0,
+                    "title": "many",
+                    "description": "many",
+                    "weekdays": self.tomorrow.strftime("%a"),
+                    "numTodos": numTodos,
+                },
+                headers=self._Headers(),
+            )
+            for numTodos in (100, 99)
+        ]
+
+        # Assert
+        self.assertEqual(responses[0].status_code, HTTP_UNPROCESSABLE_ENTITY_422)
+        self.assertEqual(responses[1].status_code, HTTP_OK_200)
+
+        last = [todo for todo in self._GetTomorrow() if todo["title"] == "many"][-1]
+        info = self.client.get(
+            f"{TODO_BASE_ROUTE}{GET_TODO_INFO_ROUTE.format(id=last['id'])}",
+            headers=self._Headers(),
+        ).json()
+        self.assertEqual(info["date"], f"{self.tomorrow}")
@@ -0,0 +1,90 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class PasswordPoolFullError(Exception):
+    pass
+
+
+class PasswordPool:
+    """
+    Dedicated executor for the CPU-bound password hashing work.
+
+    bcrypt releases the GIL while hashing, so a small thread pool is enough
+        to keep that work off the request threadpool. At most `workers`
+        jobs run at a time and at most `queueSize` more wait for a worker,
+        anything beyond that is rejected with `PasswordPoolFullError`.
+    """
+
+    def __init__(self, workers: int, queueSize: int) -> None:
+        self.__workers: int = max(1, workers)
+        self.__capacity: int = self.__workers + max(0, queueSize)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.__workers,
+            thread_name_prefix="password",
+        )
+        self.__lock = threading.Lock()
+
+        self.__inFlight: int = 0
+        self.__running: int = 0
+        self.__completed: int = 0
+        self.__rejected: int = 0
+        self.__totalWaitSeconds: float = 0.0
+        self.__totalHashSeconds: float = 0.0
+        self.__maxHashSeconds: float = 0.0
+
+    async def Run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self.__lock:
+            if self.__inFlight >= self.__capacity:
+                self.__rejected += 1
+                raise PasswordPoolFullError("Password hashing queue is full")
+            self.__inFlight += 1
+
+        future = self.__executor.submit(self.__Execute, time.perf_counter(), fn, args)
+        future.add_done_callback(self.__Release)
+        return await asyncio.wrap_future(future)
+
+    def Metrics(self) -> Dict[str, Any]:
+        with self.__lock:
+            return {
+                "workers": self.__workers,
+                "capacity": self.__capacity,
+                "running": self.__running,
+                "queueDepth": self.__inFlight - self.__running,
+                "completed": self.__completed,
+                "rejected": self.__rejected,
+                "avgWaitMs": self.__Average(self.__totalWaitSeconds),
+                "avgHashMs": self.__Average(self.__totalHashSeconds),
+                "maxHashMs": self.__maxHashSeconds * 1000,
+            }
+
+    def __Execute(self, submittedAt: float, fn: Callable[..., Any], args: tuple):
+        startedAt = time.perf_counter()
+        with self.__lock:
+            self.__running += 1
+            self.__totalWaitSeconds += startedAt - submittedAt
+
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - startedAt
+            with self.__lock:
+                self.__running -= 1
+                self.__completed += 1
+                self.__totalHashSeconds += elapsed
+                self.__maxHashSeconds = max(self.__maxHashSeconds, elapsed)
+
+    def __Release(self, future: Future) -> None:
+        with self.__lock:
+            self.__inFlight -= 1
+
+    def __Average(self, totalSeconds: float) -> float:
+        if self.__completed == 0:
+            return 0.0
+        return totalSeconds / self.__completed * 1000
+
+    def __repr__(self) -> str:
+        return f"<PasswordPool workers={self.__workers} capacity={self.__capacity} />"
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import unittest
+from utils.authen.password_pool import PasswordPool, PasswordPoolFullError
+
+
+class PasswordPoolTest(unittest.TestCase):
+    def test_GivenAPool_WhenRunAJob_ThenReturnsItsResultAndCountsIt(self):
+        # Arrange
+        pool = PasswordPool(workers=1, queueSize=0)
+
+        # Act
+        result = asyncio.run(pool.Run(lambda x: x * 2, 21))
+
+        # Assert
+        self.assertEqual(result, 42)
+        metrics = pool.Metrics()
+        self.assertEqual(metrics["completed"], 1)
+        self.assertEqual(metrics["queueDepth"], 0)
+        self.assertEqual(metrics["running"], 0)
+
+    def test_GivenAFullPool_WhenRunAnotherJob_ThenItIsRejected(self):
+        # Arrange
+        pool = PasswordPool(workers=1, queueSize=1)
+        release = threading.Event()
+
+        async def Scenario():
+            blocked = [asyncio.ensure_future(pool.Run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+
+            with self.assertRaises(PasswordPoolFullError):
+                await pool.Run(release.wait)
+
+            self.assertEqual(pool.Metrics()["queueDepth"], 1)
+            release.set()
+            await asyncio.gather(*blocked)
+
+        # Act
+        asyncio.run(Scenario())
+
+        # Assert
+        metrics = pool.Metrics()
+        self.assertEqual(metrics["rejected"], 1)
+        self.assertEqual(metrics["completed"], 2)
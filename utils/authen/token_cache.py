@@ -0,0 +1,103 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+
+class TokenCacheEntry(NamedTuple):
+    claims: Dict[str, Any]
+    user: Any
+    expiresAt: float
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of already verified bearer tokens.
+
+    The key is the raw token string, so a hit means the exact same bytes
+        have been verified before and the signature check can be skipped.
+        Entries expire at the `exp` claim of their token and can be dropped
+        per user when that user changes, the entries without a user are
+        found by the `sub` claim.
+    """
+
+    def __init__(self, maxSize: int = 1024) -> None:
+        self.__maxSize: int = maxSize
+        self.__entries: "OrderedDict[str, TokenCacheEntry]" = OrderedDict()
+        self.__tokensByUser: Dict[int, Set[str]] = {}
+        self.__lock = threading.Lock()
+
+    def Get(self, token: str) -> Optional[TokenCacheEntry]:
+        with self.__lock:
+            entry = self.__entries.get(token)
+
+            if entry is None:
+                return None
+
+            if entry.expiresAt <= time.time():
+                self.__Remove(token)
+                return None
+
+            self.__entries.move_to_end(token)
+            return entry
+
+    def Put(self, token: str, claims: Dict[str, Any], user: Any = None) -> None:
+        if self.__maxSize <= 0:
+            return
+
+        expiresAt = float(claims.get("exp", 0))
+        if expiresAt <= time.time():
+            return
+
+        with self.__lock:
+            if token in self.__entries:
+                self.__Remove(token)
+
+            self.__entries[token] = TokenCacheEntry(claims, user, expiresAt)
+
+            userId = self.__UserId(claims, user)
+            if userId is not None:
+                self.__tokensByUser.setdefault(userId, set()).add(token)
+
+            while len(self.__entries) > self.__maxSize:
+                self.__Remove(next(iter(self.__entries)))
+
+    def InvalidateUser(self, userId: int) -> None:
+        with self.__lock:
+            for token in list(self.__tokensByUser.get(userId, ())):
+                self.__Remove(token)
+
+    def Clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__tokensByUser.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __Remove(self, token: str) -> None:
+        entry = self.__entries.pop(token, None)
+        if entry is None:
+            return
+
+        userId = self.__UserId(entry.claims, entry.user)
+        if userId is None:
+            return
+
+        tokens = self.__tokensByUser.get(userId)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.__tokensByUser[userId]
+
+    @staticmethod
+    def __UserId(claims: Dict[str, Any], user: Any) -> Optional[int]:
+        if user is not None:
+            return getattr(user, "id", None)
+
+        # tokens issued before the id was added to the claims have no sub
+        sub = claims.get("sub")
+        return int(sub) if sub is not None else None
+
+    def __repr__(self) -> str:
+        return f"<TokenCache size={len(self.__entries)} maxSize={self.__maxSize} />"
@@ -0,0 +1,85 @@
+import time
+import unittest
+from utils.authen.token_cache import TokenCache
+
+
+class FakeUser:
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+
+class TokenCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = TokenCache(maxSize=2)
+        self.claims = {"username": "test", "exp": time.time() + 60}
+
+    def test_GivenAnEmptyCache_WhenGetAToken_ThenReturnsNone(self):
+        # Act
+        entry = self.cache.Get("token")
+
+        # Assert
+        self.assertIsNone(entry)
+
+    def test_GivenACachedToken_WhenGetThatToken_ThenReturnsTheClaimsAndUser(self):
+        # Arrange
+        user = FakeUser(1)
+        self.cache.Put("token", self.claims, user)
+
+        # Act
+        entry = self.cache.Get("token")
+
+        # Assert
+        self.assertEqual(entry.claims, self.claims)
+        self.assertIs(entry.user, user)
+
+    def test_GivenAnExpiredToken_WhenPutThatToken_ThenItIsNotCached(self):
+        # Act
+        self.cache.Put("token", {"exp": time.time() - 1}, FakeUser(1))
+
+        # Assert
+        self.assertIsNone(self.cache.Get("token"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_GivenAFullCache_WhenPutANewToken_ThenTheLeastRecentlyUsedIsEvicted(
+        self,
+    ):
+        # Arrange
+        self.cache.Put("first", self.claims, FakeUser(1))
+        self.cache.Put("second", self.claims, FakeUser(2))
+        self.cache.Get("first")
+
+        # Act
+        self.cache.Put("third", self.claims, FakeUser(3))
+
+        # Assert
+        self.assertIsNotNone(self.cache.Get("first"))
+        self.assertIsNone(self.cache.Get("second"))
+        self.assertIsNotNone(self.cache.Get("third"))
+
+    def test_GivenCachedTokensOfAUser_WhenInvalidateThatUser_ThenOnlyItsTokensAreDropped(
+        self,
+    ):
+        # Arrange
+        self.cache.Put("first", self.claims, FakeUser(1))
+        self.cache.Put("second", self.claims, FakeUser(2))
+
+        # Act
+        self.cache.InvalidateUser(1)
+
+        # Assert
+        self.assertIsNone(self.cache.Get("first"))
+        self.assertIsNotNone(self.cache.Get("second"))
+
+    def test_GivenCachedClaimsOfAUser_WhenInvalidateThatUser_ThenTheyAreDropped(
+        self,
+    ):
+        # Arrange
+        self.cache.Put("first", {**self.claims, "sub": "1"})
+        self.cache.Put("second", {**self.claims, "sub": "2"})
+
+        # Act
+        self.cache.InvalidateUser(1)
+
+        # Assert
+        self.assertIsNone(self.cache.Get("first"))
+        self.assertIsNotNone(self.cache.Get("second"))
@@ -1,20 +1,55 @@
+import os
 import jwt
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from datetime import timedelta, datetime, timezone
 from models import User
 from fastapi import Depends, HTTPException
 from data.response_constant import *
-from sqlalchemy.orm import Session
-from utils.database.database import get_db
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.database.database import DbSession, get_db, run_db
+from utils.authen.token_cache import TokenCache
+from utils.authen.password_pool import PasswordPool, PasswordPoolFullError
+from config import get_config
+from apis.v1.users.token_schema import Role, TokenDataSchema
+
+config = get_config()
 
 SECRET_KEY = "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_password_context(schemes: List[str], bcryptRounds: int) -> CryptContext:
+    """
+    Hashes are created with the first scheme of `schemes`, the others are
+        only accepted for verification. `bcryptRounds` is used as both the
+        default and the minimum cost, so older hashes with a lower cost are
+        reported by `needs_update` and upgraded on the next login.
+    """
+    settings = {}
+
+    if "bcrypt" in schemes:
+        settings["bcrypt__rounds"] = bcryptRounds
+        settings["bcrypt__min_rounds"] = bcryptRounds
+
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+pwd_context = build_password_context(
+    config.Get("passwordSchemes", ["bcrypt"]),
+    config.Get("bcryptRounds", 12),
+)
+
 oath2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+token_cache = TokenCache(config.Get("tokenCacheSize", 1024))
+password_pool = PasswordPool(
+    workers=config.Get("passwordWorkers", os.cpu_count() or 1),
+    queueSize=config.Get("passwordQueueSize", 64),
+)
 
 
 def verify_password(plain_password, hashed_password):
@@ -25,6 +60,42 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(
+    plain_password, hashed_password
+) -> Tuple[bool, Optional[str]]:
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+
+    return True, None
+
+
+async def _run_in_password_pool(fn, *args):
+    try:
+        return await password_pool.Run(fn, *args)
+    except PasswordPoolFullError as e:
+        raise HTTPException(
+            status_code=HTTP_SERVICE_UNAVAILABLE_503,
+            detail={"message": str(e)},
+        )
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password, hashed_password):
+    return await _run_in_password_pool(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password):
+    return await _run_in_password_pool(get_password_hash, password)
+
+
 def get_user(db, username: str):
     return db.query(User).filter(User.username == username).first()
 
@@ -50,9 +121,20 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None]):
     return encoded_jwt
 
 
-async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oath2_scheme)
-):
+def _snapshot_user(user: User) -> User:
+    """
+    Copy the column values of the user into a detached instance, which can
+        be shared between requests and merged into each request session
+        without being bound to the session that loaded it.
+    """
+    snapshot = User(
+        **{attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+    )
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: Optional[str] = payload.get("username")
@@ -71,15 +153,81 @@ async def get_current_user(
 
     except Exception as e:
         raise HTTPException(status_code=HTTP_UNAUTHORIZED_401, detail=f"Error: {e}")
-    user = get_user(db, username)
+
+    return payload
+
+
+def _load_user(db: Session, claims: dict) -> Optional[User]:
+    user_id = claims.get("sub")
+
+    # tokens issued before the id was added to the claims only have the username
+    if user_id is None:
+        user = get_user(db, claims["username"])
+    else:
+        user = db.get(User, int(user_id))
+
+    # give the connection back to the pool, the route may wait for a worker
+    # thread before it runs and must not hold a connection meanwhile
+    db.commit()
+    return user
+
+
+async def get_current_claims(token: str = Depends(oath2_scheme)) -> TokenDataSchema:
+    """
+    Verified claims of the bearer token without touching the database,
+        enough for checks which only need the username or the role.
+    """
+    cached = token_cache.Get(token)
+
+    if cached is not None:
+        claims = cached.claims
+    else:
+        claims = _decode_token(token)
+        token_cache.Put(token, claims)
+
+    return TokenDataSchema(
+        username=claims["username"],
+        role=claims.get("role", Role.user.value),
+    )
+
+
+async def get_current_user(
+    db: DbSession = Depends(get_db), token: str = Depends(oath2_scheme)
+):
+    cached = token_cache.Get(token)
+    if cached is not None and cached.user is not None:
+        # merging with load=False never emits SQL, so it can stay on the loop
+        session = db.sync_session if isinstance(db, AsyncSession) else db
+        return session.merge(cached.user, load=False)
+
+    claims = cached.claims if cached is not None else _decode_token(token)
+    user = await run_db(db, _load_user, claims)
     if user is None:
         raise HTTPException(
             status_code=HTTP_UNAUTHORIZED_401,
             detail="User not found",
         )
+
+    token_cache.Put(token, claims, _snapshot_user(user))
     return user
 
 
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    token_cache.InvalidateUser(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_cached_users_on_bulk(orm_execute_state) -> None:
+    # bulk query(User).update()/delete() bypass the per-instance events above
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    if any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+        token_cache.Clear()
+
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if current_user.disabled:
         raise HTTPException(status_code=400, detail="Inactive user")
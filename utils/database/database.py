@@ -1,21 +1,174 @@
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import create_engine
+from typing import Any, Callable, Optional, TypeVar, Union
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
 from config import get_config
 
 config = get_config()
 
+T = TypeVar("T")
+DbSession = Union[Session, AsyncSession]
+
+# foreign_keys stays off: no key declares an ON DELETE action (sqlite cannot
+# add them to existing tables) and the routes delete users and todos which
+# are still referenced, they clean up explicitly
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -16000,
+    "mmap_size": 134217728,
+    "temp_store": "MEMORY",
+    "foreign_keys": "OFF",
+}
+
+# the backends whose insert has ON CONFLICT DO NOTHING, see `insert_ignore`
+INSERT_IGNORE_DIALECTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+POOL_OPTIONS = {
+    "poolSize": "pool_size",
+    "maxOverflow": "max_overflow",
+    "poolTimeout": "pool_timeout",
+    "poolRecycle": "pool_recycle",
+    "poolPrePing": "pool_pre_ping",
+}
+
+
+def engine_options(dbURL: str) -> dict:
+    """
+    Keyword arguments for `create_engine` from the pool settings of the
+        config, only the ones which are set are passed, the pool of a
+        sqlite memory database does not accept sizes.
+    """
+    options = {}
+
+    for key, option in POOL_OPTIONS.items():
+        if config.Contains(key):
+            options[option] = config[key]
+
+    if make_url(dbURL).get_backend_name() == "sqlite" and ":memory:" in dbURL:
+        options.pop("pool_size", None)
+        options.pop("max_overflow", None)
+        options.pop("pool_timeout", None)
+
+    return options
+
+
+def set_sqlite_pragmas(engine: Engine) -> None:
+    """
+    Apply `DEFAULT_SQLITE_PRAGMAS`, overridden by the `sqlitePragmas` of
+        the config, to every new connection of the pool of the engine.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = {**DEFAULT_SQLITE_PRAGMAS, **config.Get("sqlitePragmas", {})}
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def check_dialect(engine: Engine) -> None:
+    """
+    Refuse a database which `insert_ignore` cannot run on when the engine
+        is created, rather than on the first materialization.
+    """
+    if engine.dialect.name not in INSERT_IGNORE_DIALECTS:
+        raise RuntimeError(
+            f"The {engine.dialect.name} database is not supported, dbURL "
+            f"must point to one of {', '.join(INSERT_IGNORE_DIALECTS)}"
+        )
+
+
 engine = create_engine(
     config.Get("dbURL", "db.db"),
+    **engine_options(config.Get("dbURL", "db.db")),
 )
+check_dialect(engine)
+set_sqlite_pragmas(engine)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+SessionLocal = sessionmaker(
+    bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-async def get_db():
+def insert_ignore(bind: Engine, model: Any, index_elements: list):
+    """
+    `INSERT ... ON CONFLICT DO NOTHING` on the unique index over
+        `index_elements`, rows which would violate it are skipped. The
+        engines are restricted to these backends by `check_dialect`.
+    """
+    insert = INSERT_IGNORE_DIALECTS[bind.dialect.name]
+
+    return insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def to_async_url(dbURL: str) -> Optional[str]:
+    """
+    The same database behind an async driver, `None` when no async driver
+        is known for the backend (set `asyncDbURL` in the config instead).
+    """
+    url = make_url(dbURL)
+    if url.get_backend_name() != "sqlite":
+        return None
+
+    return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+
+
+asyncDbURL = config.Get("asyncDbURL", to_async_url(config.Get("dbURL", "db.db")))
+async_engine = None
+
+if asyncDbURL is not None:
+    async_engine = create_async_engine(asyncDbURL, **engine_options(asyncDbURL))
+    check_dialect(async_engine.sync_engine)
+    set_sqlite_pragmas(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    if async_engine is None:
+        raise RuntimeError("No async driver is configured for the database")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# routes only depend on get_db, the switch is read once at startup
+get_db = get_async_db if config.Get("asyncDatabase", False) else get_sync_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run `fn(session, *args, **kwargs)` where `session` is a sync Session.
+
+    With an AsyncSession the function runs through `run_sync`, so every
+        statement awaits the async driver and lazy loads keep working.
+        With a sync Session it runs in the threadpool as the sync routes did.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+from sqlalchemy import create_mock_engine, text
+from utils.database.t_database import engine, async_engine
+from utils.database.database import DEFAULT_SQLITE_PRAGMAS, check_dialect
+
+
+class DatabaseTest(unittest.TestCase):
+    def _Pragma(self, connection, name: str):
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_GivenTheSyncEngine_WhenConnect_ThenThePragmasAreApplied(self):
+        # Act
+        with engine.connect() as connection:
+            journalMode = self._Pragma(connection, "journal_mode")
+            busyTimeout = self._Pragma(connection, "busy_timeout")
+            cacheSize = self._Pragma(connection, "cache_size")
+            tempStore = self._Pragma(connection, "temp_store")
+
+        # Assert
+        self.assertEqual(journalMode, "wal")
+        self.assertEqual(busyTimeout, DEFAULT_SQLITE_PRAGMAS["busy_timeout"])
+        self.assertEqual(cacheSize, DEFAULT_SQLITE_PRAGMAS["cache_size"])
+        self.assertEqual(tempStore, 2)
+
+    def test_GivenTheAsyncEngine_WhenConnect_ThenThePragmasAreApplied(self):
+        # Arrange
+        async def Read():
+            async with async_engine.connect() as connection:
+                return await connection.run_sync(
+                    lambda sync: (
+                        self._Pragma(sync, "journal_mode"),
+                        self._Pragma(sync, "synchronous"),
+                    )
+                )
+
+        # Act
+        journalMode, synchronous = asyncio.run(Read())
+
+        # Assert
+        self.assertEqual(journalMode, "wal")
+        self.assertEqual(synchronous, 1)
+
+    def test_GivenABackendWithoutInsertIgnore_WhenCheckItsEngine_ThenItIsRefused(
+        self,
+    ):
+        # Arrange
+        mysql = create_mock_engine("mysql://", None)
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            check_dialect(mysql)
+
+        # Assert
+        self.assertIn("mysql", str(context.exception))
+        check_dialect(engine)
+        check_dialect(async_engine.sync_engine)
@@ -0,0 +1,164 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from utils.database.database import Base
+from utils.date.recurrence import parse_weekdays
+from apis.v1.todos.planned_todo_schema import VIRTUAL_ID_DATE_FACTOR
+from apis.v1.todos.ranking import RANK_GAP
+from apis.v1.todos.search import create_search_index
+from apis.v1.todos.summary import create_summary_triggers
+
+import models
+
+
+def _has_column(connection: Connection, table: str, column: str) -> bool:
+    columns = inspect(connection).get_columns(table)
+    return any(existing["name"] == column for existing in columns)
+
+
+def _add_planned_todo_created_slot(connection: Connection) -> None:
+    # the n-th todo created from a planned todo at a date gets slot n - 1,
+    # the unique (planned_todo_id, date, slot) index makes it race-free
+    if _has_column(connection, "plannedTodo_created", "slot"):
+        return
+
+    connection.execute(
+        text(
+            "ALTER TABLE plannedTodo_created "
+            "ADD COLUMN slot INTEGER NOT NULL DEFAULT 0"
+        )
+    )
+    connection.execute(
+        text(
+            "UPDATE plannedTodo_created SET slot = ("
+            "SELECT COUNT(*) FROM plannedTodo_created AS earlier "
+            "WHERE earlier.planned_todo_id = plannedTodo_created.planned_todo_id "
+            "AND earlier.date = plannedTodo_created.date "
+            "AND earlier.id < plannedTodo_created.id)"
+        )
+    )
+    connection.execute(
+        text("DROP INDEX IF EXISTS ix_plannedTodo_created_planned_todo_id_date")
+    )
+
+
+def _add_planned_todo_weekday_mask(connection: Connection) -> None:
+    # the bitmask of the weekdays string, indexed to select the planned
+    # todos due on given weekdays
+    if _has_column(connection, "plannedTodos", "weekdayMask"):
+        return
+
+    connection.execute(
+        text(
+            'ALTER TABLE "plannedTodos" '
+            'ADD COLUMN "weekdayMask" INTEGER NOT NULL DEFAULT 0'
+        )
+    )
+
+    rows = connection.execute(text('SELECT id, weekdays FROM "plannedTodos"')).all()
+    if rows:
+        connection.execute(
+            text('UPDATE "plannedTodos" SET "weekdayMask" = :mask WHERE id = :id'),
+            [{"id": id, "mask": parse_weekdays(weekdays)} for id, weekdays in rows],
+        )
+
+
+def _bound_planned_todo_num_todos(connection: Connection) -> None:
+    # numTodos was unbounded, a slot of 100 or more overflows into the date
+    # of the virtual todo ids, and the planned todos are read back through
+    # the bounded schema
+    if not _has_column(connection, "plannedTodos", "numTodos"):
+        return
+
+    connection.execute(
+        text(
+            'UPDATE "plannedTodos" SET "numTodos" = CASE '
+            'WHEN "numTodos" IS NULL OR "numTodos" < 1 THEN 1 '
+            f"ELSE {VIRTUAL_ID_DATE_FACTOR - 1} END "
+            'WHERE "numTodos" IS NULL OR "numTodos" < 1 '
+            f'OR "numTodos" >= {VIRTUAL_ID_DATE_FACTOR}'
+        )
+    )
+
+
+def _add_change_seqs(connection: Connection) -> None:
+    # the synced rows which exist before the change sequences get the first
+    # one, so that the first sync of a client (since 0) returns them
+    for table in ("users", "todos", "plannedTodos"):
+        if _has_column(connection, table, "change_seq"):
+            continue
+
+        connection.execute(
+            text(
+                f'ALTER TABLE "{table}" '
+                "ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+        connection.execute(text(f'UPDATE "{table}" SET change_seq = 1'))
+
+
+def _add_todo_rank(connection: Connection) -> None:
+    # the comma joined orders of todo_orders become the ranks of the todos,
+    # the todos missing from an order follow in id order, then the table
+    # goes away
+    if _has_column(connection, "todos", "rank"):
+        return
+
+    connection.execute(
+        text("ALTER TABLE todos ADD COLUMN rank INTEGER NOT NULL DEFAULT 0")
+    )
+
+    orders = {}
+    if inspect(connection).has_table("todo_orders"):
+        # when a day has several orders the routes read the lowest id one
+        # (.first() without ORDER BY), the later duplicates are stale
+        for user_id, date, order in connection.execute(
+            text('SELECT user_id, date, "order" FROM todo_orders ORDER BY id')
+        ):
+            orders.setdefault(
+                (user_id, date), [int(id) for id in order.split(",") if id]
+            )
+
+    days = {}
+    for id, user_id, date in connection.execute(
+        text("SELECT id, user_id, date FROM todos ORDER BY id")
+    ):
+        days.setdefault((user_id, date), []).append(id)
+
+    ranks = []
+    for day, ids in days.items():
+        owned = set(ids)
+        listed = [id for id in dict.fromkeys(orders.get(day, [])) if id in owned]
+        unlisted = owned.difference(listed)
+        ordered = listed + [id for id in ids if id in unlisted]
+        ranks += [
+            {"id": id, "rank": (index + 1) * RANK_GAP}
+            for index, id in enumerate(ordered)
+        ]
+
+    if ranks:
+        connection.execute(text("UPDATE todos SET rank = :rank WHERE id = :id"), ranks)
+
+    connection.execute(text("DROP TABLE IF EXISTS todo_orders"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_todos_user_id_date"))
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Bring an existing database up to the models without rebuilding it:
+        missing tables are created and missing indexes are added to the
+        tables which already exist.
+    """
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as connection:
+        _add_planned_todo_created_slot(connection)
+        _add_planned_todo_weekday_mask(connection)
+        _bound_planned_todo_num_todos(connection)
+        _add_change_seqs(connection)
+        _add_todo_rank(connection)
+        create_search_index(connection)
+        create_summary_triggers(connection)
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
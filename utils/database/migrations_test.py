@@ -0,0 +1,257 @@
+import unittest
+from sqlalchemy import create_engine, inspect, text
+from utils.database.migrations import upgrade_schema
+
+
+class MigrationsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+
+    def test_GivenPlannedTodoCreatedWithoutSlots_WhenUpgrade_ThenSlotsAreBackfilled(
+        self,
+    ):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    'CREATE TABLE "plannedTodo_created" (id INTEGER PRIMARY KEY, '
+                    "todo_id INTEGER, planned_todo_id INTEGER, date DATE)"
+                )
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO "plannedTodo_created" VALUES '
+                    "(1, 1, 1, '2024-01-01'), (2, 2, 1, '2024-01-01'), "
+                    "(3, 3, 1, '2024-01-02'), (4, 4, 2, '2024-01-01')"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+
+        # Assert
+        with self.engine.connect() as connection:
+            slots = connection.execute(
+                text('SELECT id, slot FROM "plannedTodo_created" ORDER BY id')
+            ).all()
+        indexes = [
+            index["name"]
+            for index in inspect(self.engine).get_indexes("plannedTodo_created")
+        ]
+
+        self.assertEqual(slots, [(1, 0), (2, 1), (3, 0), (4, 0)])
+        self.assertIn("ux_plannedTodo_created_planned_todo_id_date_slot", indexes)
+
+    def test_GivenPlannedTodosWithoutWeekdayMask_WhenUpgrade_ThenMasksAreBackfilled(
+        self,
+    ):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    'CREATE TABLE "plannedTodos" (id INTEGER PRIMARY KEY, '
+                    "user_id INTEGER, title VARCHAR(100), weekdays VARCHAR(100), "
+                    "description VARCHAR(1000))"
+                )
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO "plannedTodos" (id, user_id, title, weekdays) '
+                    "VALUES "
+                    "(1, 1, 'a', 'Mon,Wed,Fri'), (2, 1, 'b', 'Sun'), (3, 1, 'c', NULL)"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+
+        # Assert
+        with self.engine.connect() as connection:
+            masks = connection.execute(
+                text('SELECT id, "weekdayMask" FROM "plannedTodos" ORDER BY id')
+            ).all()
+
+        self.assertEqual(masks, [(1, 0b0010101), (2, 0b1000000), (3, 0)])
+
+    def test_GivenAnUpgradedDatabase_WhenUpgradeAgain_ThenNothingChanges(self):
+        # Arrange
+        upgrade_schema(self.engine)
+
+        # Act / Assert
+        upgrade_schema(self.engine)
+
+    def test_GivenTodosWithoutChangeSeqs_WhenUpgrade_ThenTheyGetTheFirstSeq(self):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE todos (id INTEGER PRIMARY KEY, "
+                    "user_id INTEGER, title VARCHAR(100), date DATE, "
+                    "completed BOOLEAN, description VARCHAR(1000))"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO todos (id, user_id, title, date, completed) "
+                    "VALUES (1, 1, 'a', '2024-01-01', 0)"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+
+        # Assert
+        with self.engine.connect() as connection:
+            seqs = connection.execute(text("SELECT id, change_seq FROM todos")).all()
+        indexes = [index["name"] for index in inspect(self.engine).get_indexes("todos")]
+
+        self.assertEqual(seqs, [(1, 1)])
+        self.assertIn("ix_todos_user_id_change_seq", indexes)
+
+    def test_GivenTodoOrders_WhenUpgrade_ThenTheyBecomeRanks(self):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE todos (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                    "title VARCHAR(100), date DATE, completed BOOLEAN, "
+                    "description VARCHAR(1000))"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE TABLE todo_orders (id INTEGER PRIMARY KEY, "
+                    'user_id INTEGER, date DATE, "order" VARCHAR(1000))'
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO todos (id, user_id, title, date, completed) VALUES "
+                    "(1, 1, 'a', '2024-01-01', 0), "
+                    "(2, 1, 'b', '2024-01-01', 0), (3, 1, 'c', '2024-01-01', 0), "
+                    "(4, 1, 'd', '2024-01-02', 0), (5, 1, 'e', '2024-01-02', 0)"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO todo_orders VALUES (1, 1, '2024-01-01', '3,9,1'), "
+                    "(2, 1, '2024-01-01', '2,1')"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+
+        # Assert
+        with self.engine.connect() as connection:
+            days = connection.execute(
+                text("SELECT date, id FROM todos ORDER BY date, rank, id")
+            ).all()
+
+        self.assertEqual(
+            days,
+            [
+                ("2024-01-01", 3),
+                ("2024-01-01", 1),
+                ("2024-01-01", 2),
+                ("2024-01-02", 4),
+                ("2024-01-02", 5),
+            ],
+        )
+        self.assertFalse(inspect(self.engine).has_table("todo_orders"))
+
+    def test_GivenTodosWithoutSearchIndex_WhenUpgrade_ThenTheyAreSearchable(self):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE todos (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                    "title VARCHAR(100), date DATE, completed BOOLEAN, "
+                    "description VARCHAR(1000))"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO todos VALUES "
+                    "(1, 1, 'a', '2024-01-01', 0, 'buy milk'), "
+                    "(2, 2, 'b', '2024-01-01', 0, 'buy bread')"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+        upgrade_schema(self.engine)
+
+        # Assert
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text("SELECT rowid FROM todo_search WHERE todo_search MATCH 'buy'")
+            ).all()
+
+        self.assertEqual(sorted(rows), [(2,), (4,)])
+
+    def test_GivenTodosWithoutDailySummary_WhenUpgrade_ThenTheyAreCounted(self):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE todos (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                    "title VARCHAR(100), date DATE, completed BOOLEAN, "
+                    "description VARCHAR(1000))"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO todos VALUES (1, 1, 'a', '2024-01-01', 1, 'a'), "
+                    "(2, 1, 'b', '2024-01-01', 0, 'b'), "
+                    "(3, 2, 'c', '2024-01-02', 0, 'c')"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+        upgrade_schema(self.engine)
+        with self.engine.begin() as connection:
+            connection.execute(text("UPDATE todos SET completed = 1 WHERE id = 2"))
+            connection.execute(text("DELETE FROM todos WHERE id = 3"))
+
+        # Assert
+        with self.engine.connect() as connection:
+            days = connection.execute(
+                text("SELECT user_id, date, total, completed FROM daily_summary")
+            ).all()
+
+        self.assertEqual(days, [(1, "2024-01-01", 2, 2)])
+
+    def test_GivenPlannedTodosWithUnboundedNumTodos_WhenUpgrade_ThenTheyAreBounded(
+        self,
+    ):
+        # Arrange
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    'CREATE TABLE "plannedTodos" (id INTEGER PRIMARY KEY, '
+                    'user_id INTEGER, title VARCHAR(100), "numTodos" INTEGER, '
+                    "weekdays VARCHAR(100), description VARCHAR(1000))"
+                )
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO "plannedTodos" (id, user_id, title, "numTodos") '
+                    "VALUES (1, 1, 'a', 0), (2, 1, 'b', 3), (3, 1, 'c', 250)"
+                )
+            )
+
+        # Act
+        upgrade_schema(self.engine)
+
+        # Assert
+        with self.engine.connect() as connection:
+            numTodos = connection.execute(
+                text('SELECT id, "numTodos" FROM "plannedTodos" ORDER BY id')
+            ).all()
+
+        self.assertEqual(numTodos, [(1, 1), (2, 3), (3, 99)])
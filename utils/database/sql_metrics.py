@@ -0,0 +1,190 @@
+import time
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import get_config
+
+config = get_config()
+
+
+class QueryBudgetExceededError(AssertionError):
+    pass
+
+
+class RequestSqlStats:
+    """
+    Statements issued while serving one request, collected by the engine
+        events below through a context variable, so both the threadpool
+        and the async session paths report into the same object.
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.seconds: float = 0.0
+        self.budget: Optional[int] = None
+        self.statements: Counter = Counter()
+
+    def Record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def MostRepeated(self) -> tuple:
+        if not self.statements:
+            return ("", 0)
+        return self.statements.most_common(1)[0]
+
+    def ServerTiming(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+class SqlMetrics:
+    """
+    Per route aggregation of the request stats.
+
+    A request which repeats the same statement `nPlusOneThreshold` times or
+        more is counted as a suspected N+1 and the statement is kept as a
+        sample. With `enforceBudgets` (the test app) a request issuing more
+        statements than its route's `query_budget` raises after the
+        response, which fails the test which made it.
+    """
+
+    def __init__(self, nPlusOneThreshold: int = 5) -> None:
+        self.nPlusOneThreshold: int = nPlusOneThreshold
+        self.enforceBudgets: bool = False
+        self.__routes: Dict[str, Dict[str, Any]] = {}
+        self.__lock = threading.Lock()
+
+    def Record(self, route: str, stats: RequestSqlStats) -> None:
+        statement, repeated = stats.MostRepeated()
+        overBudget = stats.budget is not None and stats.count > stats.budget
+
+        with self.__lock:
+            metrics = self.__routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "dbMs": 0.0,
+                    "maxQueries": 0,
+                    "budget": None,
+                    "overBudget": 0,
+                    "suspectedNPlusOne": 0,
+                    "nPlusOneSample": None,
+                },
+            )
+            metrics["requests"] += 1
+            metrics["queries"] += stats.count
+            metrics["dbMs"] += stats.seconds * 1000
+            metrics["maxQueries"] = max(metrics["maxQueries"], stats.count)
+            metrics["budget"] = stats.budget
+
+            if overBudget:
+                metrics["overBudget"] += 1
+
+            if repeated >= self.nPlusOneThreshold:
+                metrics["suspectedNPlusOne"] += 1
+                metrics["nPlusOneSample"] = statement
+
+        if overBudget and self.enforceBudgets:
+            raise QueryBudgetExceededError(
+                f"{route} issued {stats.count} queries, its budget is {stats.budget}"
+            )
+
+    def Snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self.__lock:
+            return {
+                route: {
+                    **metrics,
+                    "avgQueries": metrics["queries"] / metrics["requests"],
+                    "avgDbMs": metrics["dbMs"] / metrics["requests"],
+                }
+                for route, metrics in self.__routes.items()
+            }
+
+    def Reset(self) -> None:
+        with self.__lock:
+            self.__routes.clear()
+
+
+_current_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar(
+    "current_sql_stats", default=None
+)
+sql_metrics = SqlMetrics(config.Get("nPlusOneThreshold", 5))
+
+
+def current_sql_stats() -> Optional[RequestSqlStats]:
+    return _current_stats.get()
+
+
+def query_budget(limit: int):
+    """
+    Route dependency declaring how many statements the route may issue,
+        authentication included, e.g. `dependencies=[query_budget(3)]`.
+    """
+
+    def declare() -> None:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return Depends(declare)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_metrics_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    startedAt = conn.info["sql_metrics_started_at"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.Record(statement, time.perf_counter() - startedAt)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    if context.connection is not None:
+        startedAt = context.connection.info.get("sql_metrics_started_at")
+        if startedAt:
+            startedAt.pop()
+
+
+class SqlMetricsMiddleware:
+    """
+    Collect the statements of every HTTP request, report them in the
+        `Server-Timing` header and aggregate them per route.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.ServerTiming().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+
+        route = scope.get("route")
+        if route is not None:
+            sql_metrics.Record(f"{scope['method']} {route.path}", stats)
@@ -0,0 +1,64 @@
+import unittest
+from utils.database.sql_metrics import (
+    QueryBudgetExceededError,
+    RequestSqlStats,
+    SqlMetrics,
+)
+
+
+class SqlMetricsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = SqlMetrics(nPlusOneThreshold=3)
+
+    def _Stats(self, statements, budget=None) -> RequestSqlStats:
+        stats = RequestSqlStats()
+        stats.budget = budget
+        for statement in statements:
+            stats.Record(statement, 0.001)
+        return stats
+
+    def test_GivenRequests_WhenRecord_ThenTheyAreAggregatedPerRoute(self):
+        # Act
+        self.metrics.Record("GET /todos", self._Stats(["a", "b"]))
+        self.metrics.Record("GET /todos", self._Stats(["a", "b", "c", "d"]))
+
+        # Assert
+        route = self.metrics.Snapshot()["GET /todos"]
+        self.assertEqual(route["requests"], 2)
+        self.assertEqual(route["queries"], 6)
+        self.assertEqual(route["maxQueries"], 4)
+        self.assertEqual(route["avgQueries"], 3)
+        self.assertEqual(route["suspectedNPlusOne"], 0)
+
+    def test_GivenARepeatedStatement_WhenRecord_ThenItIsReportedAsNPlusOne(self):
+        # Act
+        self.metrics.Record("GET /todos", self._Stats(["a", "b", "b", "b"]))
+
+        # Assert
+        route = self.metrics.Snapshot()["GET /todos"]
+        self.assertEqual(route["suspectedNPlusOne"], 1)
+        self.assertEqual(route["nPlusOneSample"], "b")
+
+    def test_GivenARequestOverBudget_WhenRecord_ThenItIsCounted(self):
+        # Act
+        self.metrics.Record("GET /todos", self._Stats(["a", "b", "c"], budget=2))
+
+        # Assert
+        self.assertEqual(self.metrics.Snapshot()["GET /todos"]["overBudget"], 1)
+
+    def test_GivenEnforcedBudgets_WhenARequestIsOverBudget_ThenRaises(self):
+        # Arrange
+        self.metrics.enforceBudgets = True
+
+        # Act & Assert
+        with self.assertRaises(QueryBudgetExceededError):
+            self.metrics.Record("GET /todos", self._Stats(["a", "b", "c"], budget=2))
+
+        self.metrics.Record("GET /todos", self._Stats(["a", "b"], budget=2))
+
+    def test_GivenStats_WhenServerTiming_ThenReportsTheDurationAndCount(self):
+        # Act
+        timing = self._Stats(["a", "b"]).ServerTiming()
+
+        # Assert
+        self.assertEqual(timing, 'db;dur=2.00;desc="2 queries"')
@@ -1,18 +1,37 @@
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from config import get_config, initialize_config
 
 
 initialize_config()
 config = get_config()
 
+from utils.database.database import set_sqlite_pragmas, to_async_url
+
 
 engine = create_engine(
     config.Get("testDbURL", "sqlite:///./test-db.db"),
     connect_args={"check_same_thread": False},
 )
+set_sqlite_pragmas(engine)
 
-TessingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TessingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# the test client runs every request on a fresh event loop, so connections
+# of the async driver cannot be pooled between requests
+async_engine = create_async_engine(
+    to_async_url(config.Get("testDbURL", "sqlite:///./test-db.db")),
+    poolclass=NullPool,
+)
+set_sqlite_pragmas(async_engine.sync_engine)
+
+TessingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 def override_get_db():
@@ -21,3 +40,8 @@ def override_get_db():
         yield db
     finally:
         db.close()
+
+
+async def override_get_async_db():
+    async with TessingAsyncSessionLocal() as db:
+        yield db
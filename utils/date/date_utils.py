@@ -1,4 +1,5 @@
 from datetime import date, timedelta
+from typing import Tuple
 
 
 def CheckNumberGapWeek(
@@ -20,7 +21,7 @@ def CheckNumberGapWeek(
             from the start_date.
 
     Returns:
-        `1` if the checked_date < start_date
+        `-1` if the checked_date < start_date
         `0` if the checked_date is in the same week as the start_date
             (but later than the start_date)
         `n` if the checked_date is n weeks after the start
@@ -41,17 +42,28 @@ def CheckNumberGapWeek(
         start = 5, checked = 16, gap = 2
         start = 5, checked = 29, gap = 4
     """
-    # get nearest monday (not include today)
-    nextMon = start_date
-
-    while nextMon.strftime("%a") != "Mon" or nextMon == start_date:
-        nextMon += timedelta(days=1)
-
     if checked_date < start_date:
         return -1
 
-    delta = checked_date - nextMon
-    if delta.days < 0:
-        return 0
+    startMon = start_date - timedelta(days=start_date.weekday())
+
+    return (checked_date - startMon).days // 7
+
+
+def MonthRange(month: str) -> Tuple[date, date]:
+    """
+    First and last day of a month.
+
+    Args:
+        month: The month as "YYYY-MM".
+
+    Returns:
+        `(first, last)`, both included.
+
+    Raises:
+        ValueError: when `month` is not a valid "YYYY-MM".
+    """
+    first = date.fromisoformat(f"{month}-01")
+    nextMonth = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
 
-    return delta.days // 7 + 1
+    return first, nextMonth - timedelta(days=1)
@@ -20,3 +20,11 @@ class DateUtilsTest(unittest.TestCase):
         assert CheckNumberGapWeek(today, yesterday) == -1
 
         assert CheckNumberGapWeek(today, today) == 0
+
+    def test_MonthRange(self):
+        assert MonthRange("2024-02") == (date(2024, 2, 1), date(2024, 2, 29))
+        assert MonthRange("2023-12") == (date(2023, 12, 1), date(2023, 12, 31))
+
+        for month in ("2024-13", "2024", "february"):
+            with self.assertRaises(ValueError):
+                MonthRange(month)
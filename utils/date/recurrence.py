@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def parse_weekdays(weekdays: Optional[str]) -> int:
+    """
+    Convert the comma separated weekdays of a planned todo into a bitmask,
+        bit `i` is set when the weekday `i` (`0` is Monday) is part of it.
+
+    Example:
+        "Mon" -> 0b0000001
+        "Mon,Wed,Fri" -> 0b0010101
+        "Sat,Sun" -> 0b1100000
+    """
+    mask = 0
+
+    for name in (weekdays or "").split(","):
+        name = name.strip()[:3].capitalize()
+        if name in WEEKDAY_NAMES:
+            mask |= 1 << WEEKDAY_NAMES.index(name)
+
+    return mask
+
+
+def masks_with_weekdays(weekdayMask: int) -> List[int]:
+    """
+    Every weekday bitmask sharing at least one weekday with `weekdayMask`,
+        `column IN (...)` over them is an index friendly `column & mask != 0`.
+
+    Example:
+        0b0000010 (Tue) -> [0b0000010, 0b0000011, 0b0000110, ...] (64 masks)
+    """
+    return [mask for mask in range(1, 1 << len(WEEKDAY_NAMES)) if mask & weekdayMask]
+
+
+def weekdays_between(first: date, last: date) -> int:
+    """
+    Bitmask of the weekdays in [first, last].
+    """
+    if (last - first).days >= 6:
+        return (1 << len(WEEKDAY_NAMES)) - 1
+
+    mask = 0
+    for day in range((last - first).days + 1):
+        mask |= 1 << (first + timedelta(days=day)).weekday()
+
+    return mask
+
+
+class RecurrenceRule:
+    """
+    Compiled schedule of a planned todo: it fires on the weekdays of
+        `weekdayMask` in every `gapWeek`-th week, counted from the week of
+        `start`, and never before `start`.
+
+    Weeks are counted from the Monday of the week of `start` (the anchor),
+        so every question is answered with date arithmetic instead of
+        walking the calendar day by day.
+    """
+
+    def __init__(self, start: date, weekdayMask: int, gapWeek: int = 1) -> None:
+        self.start: date = start
+        self.weekdayMask: int = weekdayMask
+        self.gapWeek: int = max(1, gapWeek or 1)
+        self.anchor: date = start - timedelta(days=start.weekday())
+
+    @staticmethod
+    def Parse(start: date, weekdays: Optional[str], gapWeek: int = 1):
+        return RecurrenceRule(start, parse_weekdays(weekdays), gapWeek)
+
+    def GapWeek(self, checked: date) -> int:
+        """
+        Number of weeks between the week of `start` and the week of
+            `checked`, `-1` if `checked` is before `start`
+            (see `CheckNumberGapWeek`).
+        """
+        if checked < self.start:
+            return -1
+
+        return (checked - self.anchor).days // 7
+
+    def FiresOn(self, checked: date) -> bool:
+        gap = self.GapWeek(checked)
+
+        if gap < 0 or gap % self.gapWeek != 0:
+            return False
+
+        return bool(self.weekdayMask >> checked.weekday() & 1)
+
+    def Occurrences(self, first: date, last: date) -> Iterator[date]:
+        """
+        Dates in [first, last] at which the rule fires, in order. Only the
+            active weeks are visited.
+        """
+        if not self.weekdayMask:
+            return
+
+        first = max(first, self.start)
+        weekdays = [day for day in range(7) if self.weekdayMask >> day & 1]
+
+        week = (first - self.anchor).days // 7
+        week += -week % self.gapWeek
+        weekStart = self.anchor + timedelta(weeks=week)
+
+        while weekStart <= last:
+            for day in weekdays:
+                checked = weekStart + timedelta(days=day)
+                if checked > last:
+                    return
+                if checked >= first:
+                    yield checked
+
+            weekStart += timedelta(weeks=self.gapWeek)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RecurrenceRule) and (
+            self.start,
+            self.weekdayMask,
+            self.gapWeek,
+        ) == (other.start, other.weekdayMask, other.gapWeek)
+
+    def __repr__(self) -> str:
+        weekdays = ",".join(
+            name
+            for day, name in enumerate(WEEKDAY_NAMES)
+            if self.weekdayMask >> day & 1
+        )
+        return f"<RecurrenceRule {weekdays} every {self.gapWeek} week(s) from {self.start} />"
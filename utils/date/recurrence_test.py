@@ -0,0 +1,116 @@
+import unittest
+from datetime import date, timedelta
+from .recurrence import *
+
+# 2024-01-01 is a Monday, the month of the `CheckNumberGapWeek` docstring
+MONTH_START = date(2024, 1, 1)
+
+
+def day(number: int) -> date:
+    return MONTH_START + timedelta(days=number - 1)
+
+
+def legacy_gap_week(start_date: date, checked_date: date) -> int:
+    nextMon = start_date
+
+    while nextMon.strftime("%a") != "Mon" or nextMon == start_date:
+        nextMon += timedelta(days=1)
+
+    if checked_date < start_date:
+        return -1
+
+    delta = checked_date - nextMon
+    if delta.days < 0:
+        return 0
+
+    return delta.days // 7 + 1
+
+
+class RecurrenceRuleTest(unittest.TestCase):
+    def test_GivenTheDocstringExamples_WhenGapWeek_ThenMatchesTheExpectedGaps(self):
+        # Arrange
+        rule = RecurrenceRule.Parse(day(5), "Mon", 1)
+        examples = [(2, -1), (5, 0), (6, 0), (12, 1), (15, 2), (16, 2), (29, 4)]
+
+        for checked, gap in examples:
+            # Act
+            result = rule.GapWeek(day(checked))
+
+            # Assert
+            self.assertEqual(result, gap, f"checked = {checked}")
+
+    def test_GivenAnyStartAndCheckedDate_WhenGapWeek_ThenMatchesTheDayLoop(self):
+        for start in range(0, 14):
+            rule = RecurrenceRule.Parse(MONTH_START + timedelta(days=start), "Mon")
+
+            for checked in range(-7, 60):
+                checkedDate = MONTH_START + timedelta(days=checked)
+
+                # Act / Assert
+                self.assertEqual(
+                    rule.GapWeek(checkedDate),
+                    legacy_gap_week(rule.start, checkedDate),
+                    f"start = {rule.start}, checked = {checkedDate}",
+                )
+
+    def test_GivenWeekdays_WhenParse_ThenReturnsTheBitmask(self):
+        self.assertEqual(parse_weekdays("Mon"), 0b0000001)
+        self.assertEqual(parse_weekdays("Mon,Wed,Fri"), 0b0010101)
+        self.assertEqual(parse_weekdays("Sat, Sun"), 0b1100000)
+        self.assertEqual(parse_weekdays(""), 0)
+        self.assertEqual(parse_weekdays(None), 0)
+
+    def test_GivenAnEveryTwoWeeksRule_WhenFiresOn_ThenOnlyTheActiveWeeksFire(self):
+        # Arrange
+        rule = RecurrenceRule.Parse(day(3), "Mon,Wed", 2)
+
+        # Act / Assert
+        self.assertFalse(rule.FiresOn(day(1)))  # before the start
+        self.assertTrue(rule.FiresOn(day(3)))
+        self.assertFalse(rule.FiresOn(day(4)))  # Thursday
+        self.assertFalse(rule.FiresOn(day(8)))  # odd week
+        self.assertTrue(rule.FiresOn(day(15)))
+        self.assertTrue(rule.FiresOn(day(17)))
+
+    def test_GivenAnyRule_WhenOccurrences_ThenMatchesFiresOnDayByDay(self):
+        for weekdays, gapWeek in [("Mon", 1), ("Tue,Sun", 2), ("Mon,Thu,Sat", 3)]:
+            for start in range(0, 10):
+                rule = RecurrenceRule.Parse(
+                    MONTH_START + timedelta(days=start), weekdays, gapWeek
+                )
+                first, last = day(4), day(80)
+
+                # Act
+                occurrences = list(rule.Occurrences(first, last))
+
+                # Assert
+                expected = [
+                    first + timedelta(days=offset)
+                    for offset in range((last - first).days + 1)
+                    if rule.FiresOn(first + timedelta(days=offset))
+                ]
+                self.assertEqual(occurrences, expected, repr(rule))
+
+    def test_GivenAnEmptyRule_WhenOccurrences_ThenReturnsNothing(self):
+        # Arrange
+        rule = RecurrenceRule.Parse(day(1), "", 1)
+
+        # Act / Assert
+        self.assertEqual(list(rule.Occurrences(day(1), day(30))), [])
+
+    def test_GivenAWeekday_WhenMasksWithWeekdays_ThenReturnsEveryMaskContainingIt(
+        self,
+    ):
+        # Act
+        masks = masks_with_weekdays(0b0000010)
+
+        # Assert
+        self.assertEqual(len(masks), 64)
+        self.assertTrue(all(mask & 0b0000010 for mask in masks))
+        self.assertIn(0b1111111, masks)
+        self.assertNotIn(0b0000001, masks)
+
+    def test_GivenARange_WhenWeekdaysBetween_ThenReturnsItsWeekdays(self):
+        self.assertEqual(weekdays_between(day(1), day(1)), 0b0000001)
+        self.assertEqual(weekdays_between(day(6), day(8)), 0b1100001)
+        self.assertEqual(weekdays_between(day(3), day(30)), 0b1111111)
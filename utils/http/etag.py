@@ -0,0 +1,33 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+
+NOT_MODIFIED_304 = 304
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak entity tag over the `repr` of the parts, e.g. the row count and
+        the latest `last_updated` of the listed rows.
+    """
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Whether the `If-None-Match` header of the request matches the tag,
+        compared weakly as RFC 9110 asks for GET.
+    """
+    header: Optional[str] = request.headers.get("if-none-match")
+    if header is None:
+        return False
+
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [
+        tag.removeprefix("W/") for tag in tags
+    ]
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=NOT_MODIFIED_304, headers={"ETag": etag})
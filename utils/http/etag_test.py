@@ -0,0 +1,30 @@
+import unittest
+from starlette.requests import Request
+from .etag import *
+
+
+def request_with(ifNoneMatch: str = None) -> Request:
+    headers = []
+    if ifNoneMatch is not None:
+        headers.append((b"if-none-match", ifNoneMatch.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+class EtagTest(unittest.TestCase):
+    def test_GivenTheSameParts_WhenMakeEtag_ThenTheTagsAreEqual(self):
+        self.assertEqual(make_etag("date", (1, "x")), make_etag("date", (1, "x")))
+        self.assertNotEqual(make_etag("date", (1, "x")), make_etag("date", (2, "x")))
+        self.assertTrue(make_etag("date").startswith('W/"'))
+
+    def test_GivenIfNoneMatchHeaders_WhenIsNotModified_ThenTheyAreComparedWeakly(
+        self,
+    ):
+        etag = make_etag("date", 1)
+        strong = etag.removeprefix("W/")
+
+        self.assertFalse(is_not_modified(request_with(), etag))
+        self.assertTrue(is_not_modified(request_with(etag), etag))
+        self.assertTrue(is_not_modified(request_with(strong), etag))
+        self.assertTrue(is_not_modified(request_with(f'"other", {etag}'), etag))
+        self.assertTrue(is_not_modified(request_with("*"), etag))
+        self.assertFalse(is_not_modified(request_with('"other"'), etag))